@@ -0,0 +1,278 @@
+"""
+Availability: parsing "13-15, 18:30-19" style input, the interactive
+prompts, and AvailabilityCalendar, which keeps each day's free time as a
+bitmap (bit i = the i-th `granularity`-minute unit after midnight is
+free). Unions, subtractions and first-fit or best-fit booking are a few
+integer bit operations per day instead of loops over time steps.
+"""
+
+from datetime import date, timedelta
+from functools import lru_cache
+
+WORK_START, WORK_END = 9, 22
+MINUTES_PER_DAY = 24 * 60
+
+
+def parse_time(text):
+    """ "13" -> 13, "13:30" -> 13.5 (hours); ValueError if malformed."""
+    hours, sep, minutes = text.strip().partition(":")
+    if not sep:
+        return int(hours)
+    if len(minutes) != 2 or not 0 <= int(minutes) < 60:
+        raise ValueError(text)
+    return int(hours) + int(minutes) / 60 if int(minutes) else int(hours)
+
+
+def parse_unavailable(raw, work_start=WORK_START, work_end=WORK_END, on_invalid=None):
+    """
+    "9-12, 15:30-20" -> [(9, 12), (15.5, 20)], clipped to the working day
+    and sorted. Parts that are not "start-end" times (H or H:MM) are
+    skipped and passed to on_invalid(part).
+    """
+    unavailable = []
+    for part in [p.strip() for p in (raw or "").split(",") if p.strip()]:
+        try:
+            a, b = part.split("-", 1)
+            start = max(work_start, parse_time(a))
+            end = min(work_end, parse_time(b))
+        except ValueError:
+            if on_invalid:
+                on_invalid(part)
+            continue
+        if start < end:
+            unavailable.append((start, end))
+    unavailable.sort()
+    return unavailable
+
+
+def free_intervals(unavailable, work_start=WORK_START, work_end=WORK_END):
+    """The parts of the working day not covered by the sorted unavailable list."""
+    available = []
+    current = work_start
+    for start, end in unavailable:
+        if current < start:
+            available.append((current, start))
+        current = max(current, end)
+
+    if current < work_end:
+        available.append((current, work_end))
+
+    return available
+
+
+def parse_availability(raw):
+    """Available hours for a day given its unavailable text (no prompting)."""
+    return free_intervals(parse_unavailable(raw))
+
+
+def _report_invalid(part):
+    print(f" Invalid slot '{part}' (use 9-12 or 9:30-12)")
+
+
+def _prompt_available(prompt):
+    raw = input(prompt).strip()
+    return free_intervals(parse_unavailable(raw, on_invalid=_report_invalid))
+
+
+def get_daily_availability():
+    return _prompt_available("Unavailable (e.g. 9-12, 15:30-20): ")
+
+
+def get_weekly_availability():
+    today = date.today()
+
+    print("\n📅 Weekly Availability (09:00–22:00 fixed)")
+    print("Enter unavailable hours like: 13-15, 18-19 (Enter = free all day)\n")
+
+    weekly = {}
+
+    for i in range(7):
+        day_date = today + timedelta(days=i)
+        day_key = day_date.isoformat()
+        day_name = day_date.strftime("%A")
+
+        weekly[day_key] = _prompt_available(f"{day_name} ({day_key}) unavailable: ")
+
+    return weekly
+
+
+def _runs(mask):
+    """(first bit, length) of each run of set bits in mask, lowest first."""
+    while mask:
+        low = (mask & -mask).bit_length() - 1
+        shifted = mask >> low
+        # shifted ^ (shifted + 1) is all ones up to and including the run's end.
+        length = (shifted ^ (shifted + 1)).bit_length() - 1
+        yield low, length
+        mask = (shifted >> length) << (low + length)
+
+
+def _fit_starts(mask, units):
+    """Bits i of mask where units consecutive set bits start."""
+    fit, covered = mask, 1
+    while covered < units and fit:
+        step = min(covered, units - covered)
+        fit &= fit >> step
+        covered += step
+    return fit
+
+
+def _first_fit(mask, units):
+    """Lowest bit where units consecutive set bits of mask start, or None."""
+    starts = _fit_starts(mask, units)
+    if not starts:
+        return None
+    return (starts & -starts).bit_length() - 1
+
+
+def _block(low, units):
+    return ((1 << units) - 1) << low
+
+
+@lru_cache(maxsize=1024)
+def _mask_slots(mask, granularity, minutes):
+    """(start, end) hours of repeated first-fit bookings of minutes in mask."""
+    units = minutes // granularity
+    slots = []
+    low = _first_fit(mask, units)
+    while low is not None:
+        mask &= ~_block(low, units)
+        start = low * granularity
+        slots.append((start / 60, (start + minutes) / 60))
+        low = _first_fit(mask, units)
+    return tuple(slots)
+
+
+class AvailabilityCalendar:
+    """
+    Free time per day as integer bitmaps at granularity minutes (which must
+    divide a day). Days come from a recurring weekly template, compiled to
+    one bitmap per weekday up front, unless a day has been given its own
+    free time; so a long horizon costs nothing until a day is asked for.
+
+    Times are hours after midnight as elsewhere ((9, 12.5) is 09:00-12:30),
+    rounded inwards to the granularity. Day keys are ISO dates.
+    """
+
+    def __init__(self, granularity=5, weekly=None):
+        if granularity <= 0 or MINUTES_PER_DAY % granularity:
+            raise ValueError("granularity must be a whole number of minutes that divides a day")
+        self.granularity = granularity
+        self.units = MINUTES_PER_DAY // granularity
+        # weekly: {weekday (Monday = 0): available hours}, missing days busy.
+        self.template = [self.mask((weekly or {}).get(day, [])) for day in range(7)]
+        self.overrides = {}
+
+    @classmethod
+    def from_days(cls, days_available, granularity=5):
+        """Calendar for {day_key: available hours}; other days are busy."""
+        calendar = cls(granularity)
+        for day_key, hours in days_available.items():
+            calendar.set_day(day_key, hours)
+        return calendar
+
+    @classmethod
+    def every_day(cls, hours, granularity=5):
+        """The same available hours every day."""
+        return cls(granularity, {day: hours for day in range(7)})
+
+    def copy(self):
+        calendar = AvailabilityCalendar(self.granularity)
+        calendar.template = list(self.template)
+        calendar.overrides = dict(self.overrides)
+        return calendar
+
+    def mask(self, hours):
+        """Bitmap of a list of (start, end) hour ranges."""
+        mask = 0
+        for start, end in hours:
+            mask |= self._range_mask(start, end)
+        return mask
+
+    def _range_mask(self, start, end):
+        g = self.granularity
+        first = max(0, -(-round(start * 60) // g))
+        last = min(self.units, round(end * 60) // g)
+        if first >= last:
+            return 0
+        return _block(first, last - first)
+
+    def day(self, day_key):
+        """Bitmap of day_key's free time."""
+        mask = self.overrides.get(day_key)
+        if mask is None:
+            mask = self.template[date.fromisoformat(day_key).weekday()]
+        return mask
+
+    def set_day(self, day_key, hours):
+        self.overrides[day_key] = self.mask(hours)
+
+    def add(self, day_key, start, end):
+        """Mark start..end of day_key free."""
+        self.overrides[day_key] = self.day(day_key) | self._range_mask(start, end)
+
+    def subtract(self, day_key, start, end):
+        """Mark start..end of day_key busy (any unit it touches)."""
+        g = self.granularity
+        first = max(0, round(start * 60) // g)
+        last = min(self.units, -(-round(end * 60) // g))
+        busy = _block(first, last - first) if first < last else 0
+        self.overrides[day_key] = self.day(day_key) & ~busy
+
+    def _combine(self, other, op):
+        if other.granularity != self.granularity:
+            raise ValueError("calendars have different granularities")
+        result = AvailabilityCalendar(self.granularity)
+        result.template = [op(a, b) for a, b in zip(self.template, other.template)]
+        for day_key in set(self.overrides) | set(other.overrides):
+            result.overrides[day_key] = op(self.day(day_key), other.day(day_key))
+        return result
+
+    def __or__(self, other):
+        """Free in either calendar."""
+        return self._combine(other, lambda a, b: a | b)
+
+    def __sub__(self, other):
+        """Free here and not free in other (e.g. availability - meetings)."""
+        return self._combine(other, lambda a, b: a & ~b)
+
+    def allocate(self, day_key, minutes, best_fit=False):
+        """
+        Book a free block of minutes on day_key and return its (start, end)
+        hours, or None if nothing fits: the earliest block (first fit), or
+        with best_fit the start of the smallest free stretch it fits in
+        (earliest on ties), which keeps long stretches for long blocks.
+        """
+        units = -(-minutes // self.granularity)
+        mask = self.day(day_key)
+        if best_fit:
+            fits = [(length, low) for low, length in _runs(mask) if length >= units]
+            low = min(fits)[1] if fits else None
+        else:
+            low = _first_fit(mask, units)
+        if low is None:
+            return None
+        self.overrides[day_key] = mask & ~_block(low, units)
+        start = low * self.granularity
+        return start / 60, (start + units * self.granularity) / 60
+
+    def slots(self, day_key, minutes=30):
+        """
+        The (start, end) hours that booking blocks of minutes first-fit
+        would hand out on day_key, until none fits, without booking them:
+        the schedulers' slots. Days with the same bitmap share one cached
+        tuple.
+        """
+        if minutes % self.granularity:
+            raise ValueError("slot length must be a multiple of the granularity")
+        return _mask_slots(self.day(day_key), self.granularity, minutes)
+
+    def days(self, start, count, minutes=30):
+        """(day_key, slots) for count days from the date start, as the schedulers take them."""
+        for i in range(count):
+            day_key = (start + timedelta(days=i)).isoformat()
+            yield day_key, self.slots(day_key, minutes)
+
+    def key(self, start, count):
+        """Hashable identity of count days from start (for schedule caching)."""
+        return (self.granularity,) + tuple(self.day((start + timedelta(days=i)).isoformat()) for i in range(count))
@@ -0,0 +1,300 @@
+"""
+Benchmark suite for storage, scheduling and analytics.
+
+Each scale runs against synthetic data in its own temporary data root, so
+the real tasks.csv / count_pomodoro.csv are never touched.
+
+    python benchmark.py --tasks 1000 10000 --log-rows 100000 --output bench.json
+    python benchmark.py --baseline bench.json          # compare, exit 1 on regression
+    python benchmark.py --optimizer 0.1 0.5 2          # greedy vs optimized lateness
+"""
+
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+CATEGORIES = ["study", "exam", "assignment", "reading", "other"]
+
+
+def generate_tasks(path, count, dependency_ratio=0.2, max_dependencies=3, seed=0):
+    """
+    Write count synthetic tasks to path in the tasks.csv format. Tasks only
+    depend on earlier tasks, so the dependency graph is always a DAG.
+    """
+    rng = random.Random(seed)
+    today = date.today()
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow([
+            "task_name", "category", "estimated_pomodoros", "completed_pomodoros",
+            "status", "start_date", "due_date", "end_date", "dependencies",
+        ])
+        for i in range(count):
+            estimated = rng.randint(1, 8)
+            completed = rng.randint(0, estimated)
+            if completed >= estimated:
+                status = "completed"
+            elif completed:
+                status = "in progress"
+            else:
+                status = "not started"
+
+            dependencies = ""
+            if i and rng.random() < dependency_ratio:
+                picks = {f"Task {rng.randrange(i)}" for _ in range(rng.randint(1, max_dependencies))}
+                dependencies = ",".join(sorted(picks))
+
+            writer.writerow([
+                f"Task {i}",
+                rng.choice(CATEGORIES),
+                estimated,
+                completed,
+                status,
+                (today - timedelta(days=rng.randint(0, 30))).isoformat(),
+                (today + timedelta(days=rng.randint(0, 60))).isoformat(),
+                today.isoformat() if status == "completed" else "",
+                dependencies,
+            ])
+
+
+def generate_log(path, rows, days=3 * 365, seed=0):
+    """Write rows synthetic pomodoro log rows, spread evenly over days ending today."""
+    rng = random.Random(seed)
+    first = date.today() - timedelta(days=days - 1)
+    with open(path, "w", newline="") as file:
+        file.write("date,category,pomodoros\n")
+        written = 0
+        for day in range(days):
+            chunk = (day + 1) * rows // days - written
+            day_str = (first + timedelta(days=day)).isoformat()
+            file.write("".join(f"{day_str},{rng.choice(CATEGORIES)},{rng.randint(1, 3)}\n" for _ in range(chunk)))
+            written += chunk
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {"min": min(samples), "median": statistics.median(samples)}
+
+
+def run_scale(task_count, log_rows, backend, repeat, log_calls):
+    from task import TaskManager
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="pomodoro-bench-") as workdir:
+        generate_tasks(os.path.join(workdir, TaskManager.TASK_FILE), task_count)
+        generate_log(os.path.join(workdir, TaskManager.POMODORO_FILE), log_rows)
+
+        # The first load also builds sidecars (rollup, SQLite seed, ...).
+        start = time.perf_counter()
+        manager = TaskManager(backend=backend, data_root=workdir)
+        results["first_load"] = {"min": time.perf_counter() - start}
+        manager.close()
+
+        def load():
+            TaskManager(backend=backend, data_root=workdir).close()
+
+        results["load"] = timed(load, repeat)
+
+        manager = TaskManager(backend=backend, data_root=workdir)
+        results["save_tasks"] = timed(manager.save_tasks, repeat)
+
+        names = [task.name for task in manager.query_tasks(not_status="completed")[:log_calls]]
+
+        def log_many():
+            for name in names:
+                manager.log_pomodoro(name)
+
+        sample = timed(log_many, 1)
+        results["log_pomodoro"] = {k: v / max(1, len(names)) for k, v in sample.items()}
+
+        results["calculate_priorities"] = timed(manager.calculate_priorities, repeat)
+
+        day_hours = [(9, 22)]
+        today = date.today()
+        week = {(today + timedelta(days=i)).isoformat(): day_hours for i in range(7)}
+
+        def uncached(fn):
+            def run():
+                manager.clear_schedule_cache()
+                fn()
+            return run
+
+        daily = lambda: manager.generate_daily_schedule(day_hours)
+        weekly = lambda: manager.generate_weekly_schedule(week)
+        results["generate_daily_schedule"] = timed(uncached(daily), repeat)
+        results["generate_weekly_schedule"] = timed(uncached(weekly), repeat)
+        # Repeats with no task changes in between are served from the cache.
+        results["generate_daily_schedule_cached"] = timed(daily, max(repeat, 100))
+        results["generate_weekly_schedule_cached"] = timed(weekly, max(repeat, 100))
+
+        # Streamed long horizons: time should grow linearly with the days.
+        for horizon in (30, 120):
+            def stream():
+                for _ in manager.iter_schedule(day_hours, horizon, decay_per_day=0.01):
+                    pass
+            results[f"iter_schedule_{horizon}_days"] = timed(stream, repeat)
+
+        # Patch a weekly plan after logging a pomodoro for a task booked on
+        # the last day, so only that day is re-planned.
+        plan = manager.plan_weekly_schedule(week)
+        last_day = plan.schedule()[-1][1]
+        if last_day:
+            name = last_day[-1]["task"]
+
+            def reschedule():
+                manager.log_pomodoro(name)
+                start = time.perf_counter()
+                manager.reschedule(plan, ("pomodoro", name))
+                return time.perf_counter() - start
+
+            samples = [reschedule() for _ in range(repeat)]
+            results["reschedule_after_pomodoro"] = {"min": min(samples), "median": statistics.median(samples)}
+
+        results["weekly_summary"] = timed(manager.weekly_summary, repeat)
+        manager.close()
+    return results
+
+
+def run_optimizer(task_count, budgets):
+    """Weighted lateness and solve time of the optimizer against the greedy week."""
+    from task import TaskManager
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="pomodoro-bench-") as workdir:
+        generate_tasks(os.path.join(workdir, TaskManager.TASK_FILE), task_count)
+        manager = TaskManager(data_root=workdir)
+        today = date.today()
+        week = {(today + timedelta(days=i)).isoformat(): [(9, 17)] for i in range(7)}
+
+        start = time.perf_counter()
+        manager.clear_schedule_cache()
+        manager.generate_weekly_schedule(week)
+        greedy_seconds = time.perf_counter() - start
+
+        for budget in budgets:
+            manager.clear_schedule_cache()
+            _, stats = manager.optimize_weekly_schedule(week, time_budget=budget)
+            results[f"budget={budget:g}"] = {
+                "min": stats["seconds"],
+                "greedy_seconds": greedy_seconds,
+                "greedy_lateness": stats["greedy_lateness"],
+                "lateness": stats["lateness"],
+                "reduction": round(1 - stats["lateness"] / stats["greedy_lateness"], 3) if stats["greedy_lateness"] else 0.0,
+                "evaluations": stats["evaluations"],
+                "converged": stats["converged"],
+            }
+        manager.close()
+    return results
+
+
+def run_cold_start(task_count, log_rows, repeat, commands=("summary", "list")):
+    """Wall time of fresh `python main.py <command>` processes (start-up + work)."""
+    main_py = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="pomodoro-bench-") as workdir:
+        generate_tasks(os.path.join(workdir, "tasks.csv"), task_count)
+        generate_log(os.path.join(workdir, "count_pomodoro.csv"), log_rows)
+        # Warm-up run builds the sidecar files and .pyc caches.
+        subprocess.run([sys.executable, main_py, "summary"], cwd=workdir, stdout=subprocess.DEVNULL, check=True)
+
+        def interpreter():
+            subprocess.run([sys.executable, "-c", "pass"], check=True)
+
+        results["python_startup"] = timed(interpreter, repeat)
+        for command in commands:
+            def run():
+                subprocess.run([sys.executable, main_py, command], cwd=workdir, stdout=subprocess.DEVNULL, check=True)
+
+            results[f"main.py {command}"] = timed(run, repeat)
+    return results
+
+
+def compare(report, baseline, threshold):
+    """Lines describing operations slower than baseline * threshold."""
+    regressions = []
+    for scale, ops in report["results"].items():
+        for op, timing in ops.items():
+            old = baseline.get("results", {}).get(scale, {}).get(op)
+            if not old or not old.get("min"):
+                continue
+            ratio = timing["min"] / old["min"]
+            if ratio > threshold:
+                regressions.append(f"{scale} {op}: {old['min'] * 1000:.2f}ms -> {timing['min'] * 1000:.2f}ms ({ratio:.2f}x)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pomodoro Task Manager benchmarks")
+    parser.add_argument("--tasks", type=int, nargs="+", default=[1000, 10000], help="task counts to run (e.g. 1000 100000 1000000)")
+    parser.add_argument("--log-rows", type=int, default=100000, help="rows in the synthetic pomodoro log")
+    parser.add_argument("--backend", default="csv", choices=["csv", "sqlite", "binary"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--log-calls", type=int, default=50, help="log_pomodoro calls to average over")
+    parser.add_argument("--cold-start", action="store_true", help="also time fresh CLI processes (python main.py summary/list)")
+    parser.add_argument("--optimizer", type=float, nargs="+", metavar="SECONDS", help="also run the lateness optimizer with these time budgets")
+    parser.add_argument("--output", help="write the JSON report here (default: stdout)")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown ratio that counts as a regression")
+    args = parser.parse_args(argv)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "backend": args.backend,
+            "log_rows": args.log_rows,
+            "repeat": args.repeat,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": {},
+    }
+
+    for count in args.tasks:
+        print(f"Running {count} tasks / {args.log_rows} log rows ({args.backend})...", file=sys.stderr)
+        report["results"][f"tasks={count}"] = run_scale(count, args.log_rows, args.backend, args.repeat, args.log_calls)
+
+    if args.cold_start:
+        print("Timing CLI cold start...", file=sys.stderr)
+        report["results"]["cold_start"] = run_cold_start(min(args.tasks), args.log_rows, max(args.repeat, 5))
+
+    if args.optimizer:
+        for count in args.tasks:
+            print(f"Optimizing {count} tasks...", file=sys.stderr)
+            report["results"][f"optimizer tasks={count}"] = run_optimizer(count, args.optimizer)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if baseline.get("meta", {}).get("backend") != args.backend:
+            print("Warning: baseline was recorded with a different backend.", file=sys.stderr)
+        regressions = compare(report, baseline, args.threshold)
+        for line in regressions:
+            print("REGRESSION " + line, file=sys.stderr)
+        if regressions:
+            return 1
+        print("No regressions against baseline.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+import csv
+import json
+import mmap
+import os
+import struct
+import sys
+from datetime import date
+
+from scoring import load_numpy
+
+MAGIC = b"POMOLOG1"
+HEADER_SIZE = 4096
+RECORD = struct.Struct("<IHI")
+# Logs shorter than this are aggregated in pure Python (no numpy import).
+NUMPY_MIN_RECORDS = 20000
+
+
+def record_dtype(np):
+    return np.dtype([("day", "<u4"), ("category", "<u2"), ("count", "<u4")])
+
+
+class BinaryPomodoroLog:
+    """
+    Fixed-width binary pomodoro log.
+
+    Layout: a 4096-byte header (magic + JSON list of category names, zero
+    padded) followed by 10-byte records <day ordinal u32, category code u16,
+    count u32>. Records start page-aligned, so records() can hand out a
+    NumPy structured array that views the memory map without copying, and
+    aggregations run directly over that buffer. Without NumPy the same
+    data is read with struct.iter_unpack.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.categories = []
+        self._codes = {}
+        self._mm = None
+        self._file = None
+        if os.path.exists(path):
+            self._read_header()
+        else:
+            self._write_header()
+
+    def _read_header(self):
+        with open(self.path, "rb") as file:
+            header = file.read(HEADER_SIZE)
+        if len(header) != HEADER_SIZE or not header.startswith(MAGIC):
+            raise ValueError(f"{self.path} is not a binary pomodoro log.")
+        self.categories = json.loads(header[len(MAGIC):].rstrip(b"\0").decode("utf-8"))
+        self._codes = {name: code for code, name in enumerate(self.categories)}
+
+    def _write_header(self):
+        payload = MAGIC + json.dumps(self.categories, separators=(",", ":")).encode("utf-8")
+        if len(payload) > HEADER_SIZE:
+            raise ValueError("Too many categories for the binary log header.")
+        mode = "r+b" if os.path.exists(self.path) else "wb"
+        with open(self.path, mode) as file:
+            file.write(payload.ljust(HEADER_SIZE, b"\0"))
+
+    def _code(self, category):
+        code = self._codes.get(category)
+        if code is None:
+            code = self._codes[category] = len(self.categories)
+            self.categories.append(category)
+            self._write_header()
+        return code
+
+    def __len__(self):
+        return (os.path.getsize(self.path) - HEADER_SIZE) // RECORD.size
+
+    def append(self, day, category, count=1):
+        self.append_many([(day, category, count)])
+
+    def append_many(self, rows):
+        """
+        Append (day, category, count) rows; day is a date or ISO string.
+        Call with the storage lock held: the header is re-read first since
+        another process may have added categories, and a partial record left
+        by a crash mid-append is cut off.
+        """
+        self._read_header()
+        torn = (os.path.getsize(self.path) - HEADER_SIZE) % RECORD.size
+        if torn:
+            self.close()
+            with open(self.path, "r+b") as file:
+                file.truncate(os.path.getsize(self.path) - torn)
+        packed = bytearray()
+        for day, category, count in rows:
+            if not isinstance(day, date):
+                day = date.fromisoformat(day)
+            packed += RECORD.pack(day.toordinal(), self._code(category.strip().lower()), int(count))
+        if packed:
+            with open(self.path, "ab") as file:
+                file.write(packed)
+
+    def _map(self):
+        size = os.path.getsize(self.path)
+        if self._mm is not None and len(self._mm) == size:
+            return self._mm
+        self.close()
+        if size <= HEADER_SIZE:
+            return None
+        # The file grew, possibly with categories added by another process.
+        self._read_header()
+        self._file = open(self.path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mm
+
+    def records(self):
+        """
+        All records as a NumPy structured array (fields day, category,
+        count) viewing the mapped file; needs NumPy. The view stays valid
+        until close() or the next call after the file has grown.
+        """
+        np = load_numpy()
+        if np is None:
+            raise RuntimeError("records() needs NumPy; use iter_records() instead.")
+        mm = self._map()
+        if mm is None:
+            return np.empty(0, dtype=record_dtype(np))
+        return np.frombuffer(mm, dtype=record_dtype(np), count=len(self), offset=HEADER_SIZE)
+
+    def iter_records(self):
+        """(day_ordinal, category_code, count) tuples in file order."""
+        mm = self._map()
+        if mm is None:
+            return iter(())
+        end = HEADER_SIZE + len(self) * RECORD.size
+        return RECORD.iter_unpack(mm[HEADER_SIZE:end])
+
+    def iter_rows(self):
+        """Records as CSV-style {"date", "category", "pomodoros"} dicts."""
+        for ordinal, code, count in self.iter_records():
+            yield {
+                "date": date.fromordinal(ordinal).isoformat(),
+                "category": self.categories[code],
+                "pomodoros": count,
+            }
+
+    def day_totals(self, start, end):
+        """{iso_day: {category: pomodoros}} for start..end inclusive."""
+        lo, hi = start.toordinal(), end.toordinal()
+        totals = {}
+
+        np = load_numpy() if len(self) >= NUMPY_MIN_RECORDS else None
+        if np is not None:
+            records = self.records()
+            selected = records[(records["day"] >= lo) & (records["day"] <= hi)]
+            if len(selected):
+                width = len(self.categories)
+                keys = (selected["day"].astype(np.int64) - lo) * width + selected["category"]
+                sums = np.bincount(keys, weights=selected["count"], minlength=(hi - lo + 1) * width)
+                for key in np.flatnonzero(sums):
+                    offset, code = divmod(int(key), width)
+                    day = date.fromordinal(lo + offset).isoformat()
+                    totals.setdefault(day, {})[self.categories[code]] = int(sums[key])
+            return totals
+
+        for ordinal, code, count in self.iter_records():
+            if lo <= ordinal <= hi:
+                by_category = totals.setdefault(date.fromordinal(ordinal).isoformat(), {})
+                category = self.categories[code]
+                by_category[category] = by_category.get(category, 0) + count
+        return totals
+
+    def iter_range(self, start, end):
+        """Rows dated start..end, oldest first (file order within a day)."""
+        lo, hi = start.toordinal(), end.toordinal()
+        rows = [r for r in self.iter_records() if lo <= r[0] <= hi]
+        rows.sort(key=lambda r: r[0])
+        for ordinal, code, count in rows:
+            yield {"date": date.fromordinal(ordinal).isoformat(), "category": self.categories[code], "pomodoros": count}
+
+    def close(self):
+        if self._mm is not None:
+            try:
+                self._mm.close()
+            except BufferError:
+                # A NumPy view from records() is still alive; let GC unmap it.
+                pass
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def csv_to_binary(csv_path, bin_path):
+    """
+    Copy count_pomodoro.csv rows into a new binary log. Rows without a valid
+    date or whole-number count are skipped. Returns (copied, skipped).
+    """
+    if os.path.exists(bin_path):
+        raise ValueError(f"{bin_path} already exists.")
+
+    log = BinaryPomodoroLog(bin_path)
+    rows, skipped = [], 0
+    with open(csv_path, newline="") as file:
+        for row in csv.DictReader(file):
+            try:
+                day = date.fromisoformat((row.get("date") or "").strip())
+                count = int(row.get("pomodoros", 0))
+                if not 0 <= count < 2 ** 32:
+                    raise ValueError
+            except (TypeError, ValueError):
+                skipped += 1
+                continue
+            rows.append((day, row.get("category") or "other", count))
+            if len(rows) >= 100000:
+                log.append_many(rows)
+                rows = []
+    log.append_many(rows)
+    copied = len(log)
+    log.close()
+    return copied, skipped
+
+
+def binary_to_csv(bin_path, csv_path):
+    """Write every binary record back out in the count_pomodoro.csv format."""
+    log = BinaryPomodoroLog(bin_path)
+    count = 0
+    with open(csv_path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=["date", "category", "pomodoros"])
+        writer.writeheader()
+        for row in log.iter_rows():
+            writer.writerow(row)
+            count += 1
+    log.close()
+    return count
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4 or sys.argv[1] not in ("import", "export"):
+        print("Usage: python binlog.py import LOG.csv LOG.bin | export LOG.bin LOG.csv")
+        sys.exit(1)
+
+    if sys.argv[1] == "import":
+        copied, skipped = csv_to_binary(sys.argv[2], sys.argv[3])
+        print(f"Wrote {copied} records to {sys.argv[3]} ({skipped} invalid rows skipped).")
+    else:
+        count = binary_to_csv(sys.argv[2], sys.argv[3])
+        print(f"Wrote {count} rows to {sys.argv[3]}.")
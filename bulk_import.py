@@ -0,0 +1,51 @@
+import csv
+import json
+import sys
+
+from task import TaskManager
+
+
+def read_rows(path):
+    """
+    Stream dict rows from a .csv file (header row required) or a JSON Lines
+    file (.jsonl / .ndjson, one object per line). Lines that are not valid
+    JSON come through as None so the caller can report them by row number.
+    """
+    if path.endswith((".jsonl", ".ndjson")):
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    yield None
+    else:
+        with open(path, newline="", encoding="utf-8") as file:
+            yield from csv.DictReader(file)
+
+
+def main(argv):
+    if len(argv) != 2 or argv[0] not in ("tasks", "pomodoros"):
+        print("Usage: python bulk_import.py tasks|pomodoros FILE.csv|FILE.jsonl")
+        return 1
+
+    kind, path = argv
+    manager = TaskManager()
+
+    if kind == "tasks":
+        count, errors = manager.add_tasks(read_rows(path))
+        print(f"Added {count} tasks.")
+    else:
+        count, errors = manager.log_pomodoros(read_rows(path))
+        print(f"Logged {count} pomodoro rows.")
+
+    for number, message in errors:
+        print(f"  row {number}: {message}")
+
+    manager.close()
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,188 @@
+"""
+Non-interactive subcommands with JSON output, for scripts and cron jobs:
+
+    python main.py add "Essay" --category assignment --estimate 4 --due 2026-05-01
+    python main.py log "Essay"
+    python main.py list --status "in progress"
+    python main.py summary
+    python main.py schedule --weekly --unavailable 13-15
+    python main.py schedule --days 120 > semester.jsonl
+    python main.py render reports/ --format svg
+
+Only task storage is imported; matplotlib, pandas and numpy are not loaded
+(numpy only for task lists large enough to need vectorized scoring).
+"""
+
+import argparse
+import json
+import sys
+from datetime import date, timedelta
+
+import instrumentation
+from availability import parse_availability
+from task import TaskManager, split_dependencies
+
+CATEGORIES = ["study", "exam", "assignment", "reading", "other"]
+
+
+def _result(success, message, **extra):
+    return dict({"ok": success, "message": message}, **extra), 0 if success else 1
+
+
+def _count(text):
+    try:
+        count = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError("must be a whole number")
+    if count < 1:
+        raise argparse.ArgumentTypeError("must be 1 or more")
+    return count
+
+
+def cmd_add(manager, args):
+    success, message = manager.add_task(
+        args.name, args.category, args.estimate, args.due, dependencies=split_dependencies(args.depends)
+    )
+    return _result(success, message)
+
+
+def _log_count(manager, name, count):
+    """Record count pomodoros for name with one write, as a _result."""
+    logged, errors = manager.log_pomodoros([{"task_name": name, "pomodoros": count}])
+    if errors:
+        return _result(False, errors[0][1], logged=0)
+    task = manager.get_task_by_name(name)
+    return _result(True, "Pomodoro recorded successfully.", logged=count, task=task.to_dict())
+
+
+def cmd_log(manager, args):
+    return _log_count(manager, args.name, args.count)
+
+
+def cmd_delete(manager, args):
+    return _result(*manager.delete_task(args.name))
+
+
+def cmd_list(manager, args):
+    if args.due_within is not None:
+        tasks = manager.tasks_due_within(args.due_within)
+    else:
+        filters = {k: v for k, v in (("category", args.category), ("status", args.status)) if v}
+        if args.pending:
+            filters["not_status"] = "completed"
+        tasks = manager.query_tasks(**filters) if filters else manager.get_all_tasks()
+    return {"tasks": [task.to_dict() for task in tasks]}, 0
+
+
+def cmd_summary(manager, args):
+    summary = manager.weekly_summary()
+    summary["today"] = manager.get_todays_pomodoro_count()
+    return summary, 0
+
+
+def cmd_schedule(manager, args):
+    hours = parse_availability(args.unavailable)
+    if args.days is not None:
+        return stream_schedule(manager, hours, args), 0
+    if not args.weekly:
+        if args.optimize is not None:
+            schedule, stats = manager.optimize_daily_schedule(hours, time_budget=args.optimize)
+            return {"date": date.today().isoformat(), "schedule": schedule, "optimizer": stats}, 0
+        return {"date": date.today().isoformat(), "schedule": manager.generate_daily_schedule(hours)}, 0
+
+    today = date.today()
+    week = {(today + timedelta(days=i)).isoformat(): hours for i in range(7)}
+    if args.optimize is not None:
+        schedule, stats = manager.optimize_weekly_schedule(week, decay_per_day=args.decay, time_budget=args.optimize)
+        return {"schedule": schedule, "optimizer": stats}, 0
+    return {"schedule": manager.generate_weekly_schedule(week, decay_per_day=args.decay)}, 0
+
+
+def stream_schedule(manager, hours, args):
+    """Write one {"date", "schedule"} JSON line per day as it is planned."""
+    for day_key, entries in manager.iter_schedule(hours, args.days, args.decay):
+        sys.stdout.write(json.dumps({"date": day_key, "schedule": entries}) + "\n")
+    return None
+
+
+def cmd_render(manager, args):
+    # matplotlib is only imported here (and in the render workers).
+    import render
+
+    jobs = render.manager_report_jobs(manager, args.out_dir, args.format, parse_availability(args.unavailable), args.decay)
+    rendered, reused = render.render_charts(jobs, args.workers)
+    return {"rendered": rendered, "reused": reused}, 0
+
+
+def build_parser():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--backend", choices=["csv", "sqlite", "binary"], help="storage backend (default: $POMODORO_BACKEND or csv)")
+    common.add_argument("--data-root", help="directory holding the data files (default: current directory)")
+    common.add_argument("--indent", type=int, help="pretty-print the JSON output")
+
+    parser = argparse.ArgumentParser(prog="main.py", description="Pomodoro Task Manager (run without arguments for the menu)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="add a task", parents=[common])
+    add.add_argument("name")
+    add.add_argument("--category", choices=CATEGORIES, default="other")
+    add.add_argument("--estimate", type=int, required=True, help="estimated pomodoros")
+    add.add_argument("--due", required=True, help="due date, YYYY-MM-DD")
+    add.add_argument("--depends", default="", help="comma-separated task names")
+    add.set_defaults(handler=cmd_add)
+
+    log = commands.add_parser("log", help="record completed pomodoros for a task", parents=[common])
+    log.add_argument("name")
+    log.add_argument("--count", type=_count, default=1)
+    log.set_defaults(handler=cmd_log)
+
+    delete = commands.add_parser("delete", help="delete a task", parents=[common])
+    delete.add_argument("name")
+    delete.set_defaults(handler=cmd_delete)
+
+    listing = commands.add_parser("list", help="list tasks", parents=[common])
+    listing.add_argument("--category", choices=CATEGORIES)
+    listing.add_argument("--status", choices=["not started", "in progress", "completed"])
+    listing.add_argument("--pending", action="store_true", help="only tasks that are not completed")
+    listing.add_argument("--due-within", type=int, metavar="DAYS", help="pending tasks due in the next DAYS days")
+    listing.set_defaults(handler=cmd_list)
+
+    summary = commands.add_parser("summary", help="today's count and the 7-day summary", parents=[common])
+    summary.set_defaults(handler=cmd_summary)
+
+    schedule = commands.add_parser("schedule", help="daily (or --weekly) schedule", parents=[common])
+    schedule.add_argument("--weekly", action="store_true")
+    schedule.add_argument("--unavailable", default="", help='busy hours, e.g. "13-15,18-19" (every day for --weekly)')
+    schedule.add_argument("--decay", type=float, default=0.1, help="weekly priority decay per day")
+    schedule.add_argument("--days", type=int, metavar="N", help="plan N days from today, one JSON line per day as it is planned")
+    schedule.add_argument("--optimize", type=float, metavar="SECONDS", help="minimize weighted lateness, searching for up to SECONDS")
+    schedule.set_defaults(handler=cmd_schedule)
+
+    charts = commands.add_parser("render", help="write dashboard and timetable charts to files", parents=[common])
+    charts.add_argument("out_dir")
+    charts.add_argument("--format", choices=["png", "svg"], default="png")
+    charts.add_argument("--workers", type=int, help="render processes (default: one per CPU)")
+    charts.add_argument("--unavailable", default="", help="busy hours for the timetables")
+    charts.add_argument("--decay", type=float, default=0.1)
+    charts.set_defaults(handler=cmd_render)
+
+    return parser
+
+
+def main(argv):
+    args = build_parser().parse_args(argv)
+    instrumentation.enable_from_env()
+    manager = TaskManager(backend=args.backend, data_root=args.data_root)
+    try:
+        output, status = args.handler(manager, args)
+    finally:
+        manager.close()
+    # One write: json.dump would issue a write per token. None: the
+    # command streamed its own output.
+    if output is not None:
+        sys.stdout.write(json.dumps(output, indent=args.indent) + "\n")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,186 @@
+from task_store import name_key
+
+
+class DependencyGraph:
+    """
+    Task dependency DAG with per-task counts of unmet prerequisites.
+
+    A prerequisite is unmet while it is missing or not completed. Tasks
+    whose count is zero and that are not completed themselves form the
+    ready set, which the schedulers draw from. Counts change only along the
+    edges of the task that was added, removed or completed.
+    """
+
+    def __init__(self):
+        self._tasks = {}
+        self._deps = {}
+        self._dependents = {}
+        self._unmet = {}
+        self._completed = set()
+        self._ready = {}
+
+    def add(self, task):
+        key = name_key(task.name)
+        deps = {name_key(d) for d in task.dependencies}
+        deps.discard(key)
+
+        self._tasks[key] = task
+        self._deps[key] = deps
+        for dep in deps:
+            self._dependents.setdefault(dep, set()).add(key)
+
+        self._unmet[key] = sum(1 for dep in deps if dep not in self._completed)
+        if task.is_completed():
+            self._completed.add(key)
+            self._release(key)
+        self._update_ready(key)
+
+    def remove(self, name):
+        key = name_key(name)
+        if key not in self._tasks:
+            return
+
+        if key in self._completed:
+            self._completed.discard(key)
+            for dependent in self._dependents.get(key, ()):
+                self._unmet[dependent] += 1
+                self._update_ready(dependent)
+
+        for dep in self._deps.pop(key):
+            dependents = self._dependents.get(dep)
+            if dependents is not None:
+                dependents.discard(key)
+                if not dependents:
+                    del self._dependents[dep]
+
+        del self._tasks[key]
+        del self._unmet[key]
+        self._ready.pop(key, None)
+
+    def mark_completed(self, name):
+        """Call when a task's status has just become "completed"."""
+        key = name_key(name)
+        if key not in self._tasks or key in self._completed:
+            return
+        self._completed.add(key)
+        self._ready.pop(key, None)
+        self._release(key)
+
+    def _release(self, key):
+        for dependent in self._dependents.get(key, ()):
+            if dependent in self._tasks:
+                self._unmet[dependent] -= 1
+                self._update_ready(dependent)
+
+    def _update_ready(self, key):
+        if key in self._tasks and self._unmet[key] == 0 and key not in self._completed:
+            self._ready[key] = self._tasks[key]
+        else:
+            self._ready.pop(key, None)
+
+    def is_ready(self, name):
+        return name_key(name) in self._ready
+
+    def unmet_count(self, name):
+        return self._unmet.get(name_key(name), 0)
+
+    def ready_tasks(self):
+        return list(self._ready.values())
+
+    def dependents(self, name):
+        """Tasks that list name as a prerequisite."""
+        return [self._tasks[k] for k in self._dependents.get(name_key(name), ()) if k in self._tasks]
+
+    def validate(self, name, dependencies):
+        """
+        Check the edges a new task would add. Returns an error message, or
+        None when every dependency exists and no cycle would be created.
+        """
+        key = name_key(name)
+        for dep in dependencies:
+            dep_key = name_key(dep)
+            if dep_key == key:
+                return f"Task '{name}' cannot depend on itself."
+            if dep_key not in self._tasks:
+                return f"Dependency '{dep}' does not exist."
+
+        path = self._path_to(key, [name_key(d) for d in dependencies])
+        if path:
+            names = [name] + [self._tasks[k].name for k in path] + [name]
+            return "Dependency cycle: " + " -> ".join(names)
+        return None
+
+    def _path_to(self, target, starts):
+        """Dependency path from one of starts to target, or None."""
+        parent = {}
+        stack = []
+        for start in starts:
+            if start not in parent:
+                parent[start] = None
+                stack.append(start)
+
+        while stack:
+            key = stack.pop()
+            for dep in self._deps.get(key, ()):
+                if dep == target:
+                    path = [key]
+                    while parent[path[-1]] is not None:
+                        path.append(parent[path[-1]])
+                    return list(reversed(path))
+                if dep not in parent:
+                    parent[dep] = key
+                    stack.append(dep)
+        return None
+
+    def cycles(self):
+        """Groups of task names that depend on each other in a loop."""
+        index = {}
+        low = {}
+        on_stack = set()
+        stack = []
+        groups = []
+        counter = 0
+
+        for root in self._tasks:
+            if root in index:
+                continue
+            work = [(root, iter(self._deps[root]))]
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+
+            while work:
+                key, children = work[-1]
+                advanced = False
+                for dep in children:
+                    if dep not in self._tasks:
+                        continue
+                    if dep not in index:
+                        index[dep] = low[dep] = counter
+                        counter += 1
+                        stack.append(dep)
+                        on_stack.add(dep)
+                        work.append((dep, iter(self._deps[dep])))
+                        advanced = True
+                        break
+                    if dep in on_stack:
+                        low[key] = min(low[key], index[dep])
+                if advanced:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[key])
+                if low[key] == index[key]:
+                    group = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        group.append(self._tasks[member].name)
+                        if member == key:
+                            break
+                    if len(group) > 1:
+                        groups.append(group)
+        return groups
@@ -0,0 +1,192 @@
+import os
+import threading
+import zlib
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """
+    Advisory exclusive lock on path, shared by threads and processes.
+
+    Re-entrant within a thread. Other threads of the same process wait on
+    an RLock; other processes wait on flock() (POSIX) or msvcrt.locking()
+    (Windows) of the lock file, which is created next to the data files.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+
+    def acquire(self):
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                self._file = open(self.path, "a+b")
+                if fcntl is not None:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+                else:
+                    self._file.seek(0)
+                    while True:
+                        try:
+                            # LK_LOCK gives up after ~10 s; keep waiting.
+                            msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                            break
+                        except OSError:
+                            continue
+            except BaseException:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            self._file.close()
+            self._file = None
+        self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class GroupCommit:
+    """
+    Makes appends to a set of files durable with shared fsyncs.
+
+    Writers append (and flush) while holding the storage lock, call
+    written(), release the lock and then commit(). The first committer
+    fsyncs every file on behalf of all writes made so far; writers arriving
+    while that fsync runs wait and are covered by the next one. Sharing is
+    between threads of one process, and only happens when fsyncs are slow
+    enough for writes to queue up behind one (see stress_test.py
+    --fsync-delay); other processes sync their own writes.
+    """
+
+    def __init__(self, paths):
+        self.paths = list(paths)
+        self._cond = threading.Condition()
+        self._written = 0
+        self._synced = 0
+        self._syncing = False
+        self.fsyncs = 0
+
+    def written(self):
+        with self._cond:
+            self._written += 1
+
+    def commit(self):
+        with self._cond:
+            target = self._written
+            while self._synced < target:
+                if self._syncing:
+                    self._cond.wait()
+                    continue
+                self._syncing = True
+                batch = self._written
+                self._cond.release()
+                try:
+                    self._fsync_all()
+                finally:
+                    self._cond.acquire()
+                    self._syncing = False
+                    self._cond.notify_all()
+                self._synced = max(self._synced, batch)
+
+    def _fsync_all(self):
+        for path in self.paths:
+            try:
+                # No O_CREAT: a file removed by a checkpoint has nothing to sync.
+                fd = os.open(path, os.O_WRONLY | getattr(os, "O_BINARY", 0))
+            except FileNotFoundError:
+                continue
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        self.fsyncs += 1
+
+
+def file_id(path):
+    """(inode, size, mtime_ns) of path, or None if it is missing; changes
+    whenever path is replaced, truncated or written to."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [st.st_ino, st.st_size, st.st_mtime_ns]
+
+
+def tail_crc(path, offset, length=4096):
+    """CRC32 of the (up to) length bytes of path just before offset."""
+    start = max(0, offset - length)
+    try:
+        with open(path, "rb") as file:
+            file.seek(start)
+            return zlib.crc32(file.read(offset - start))
+    except OSError:
+        return None
+
+
+def fsync_dir(path):
+    """Persist a rename inside path's directory (no-op where unsupported)."""
+    if os.name != "posix":
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def repair_torn_tail(path, keep_partial=False):
+    """
+    Make path end on a line boundary before appending to it, so a partial
+    last line (a crash mid-append) is not glued to the next record. The
+    partial line is cut off, or with keep_partial terminated and kept (for
+    hand-edited CSV files whose last row may simply lack a newline). Call
+    with the storage lock held.
+    """
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return
+    if not size:
+        return
+    with open(path, "r+b") as file:
+        file.seek(size - 1)
+        if file.read(1) == b"\n":
+            return
+        if keep_partial:
+            file.seek(size)
+            file.write(b"\n")
+            return
+        # Find the last newline without reading the whole file.
+        pos = size
+        while pos > 0:
+            step = min(65536, pos)
+            pos -= step
+            file.seek(pos)
+            cut = file.read(step).rfind(b"\n")
+            if cut >= 0:
+                file.truncate(pos + cut + 1)
+                return
+        file.truncate(0)
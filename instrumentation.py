@@ -0,0 +1,338 @@
+"""
+Opt-in latency / I/O instrumentation for TaskManager and PomodoroTimer.
+
+Nothing is patched until enable() runs (main.py calls enable_from_env(),
+which does so when POMODORO_PROFILE is set), so the disabled cost is zero.
+Once enabled, every public TaskManager and PomodoroTimer method records
+its call count, latency samples, bytes read/written by the process while
+it ran and the log/task rows it scanned. Figures are inclusive: a method
+calling another public method counts the inner work too.
+"""
+
+import atexit
+import functools
+import json
+import os
+import random
+import threading
+import time
+
+# inspect, cProfile and pstats are imported on use: this module is loaded by
+# every main.py run, including the fast-start CLI subcommands.
+
+PROFILE_ENV = "POMODORO_PROFILE"
+OUTPUT_ENV = "POMODORO_PROFILE_FILE"
+ACTION_ENV = "POMODORO_PROFILE_ACTION"
+DEFAULT_OUTPUT = "pomodoro_profile.json"
+MAX_SAMPLES = 10000
+
+_lock = threading.Lock()
+_local = threading.local()
+_stats = {}
+_originals = []
+_enabled = False
+_io_overhead = (0, 0)
+
+
+class _OpStats:
+    __slots__ = ("calls", "total", "max", "samples", "bytes_read", "bytes_written", "rows")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = []
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.rows = 0
+
+    def record(self, elapsed, bytes_read, bytes_written, rows):
+        self.calls += 1
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+        self.bytes_read += bytes_read
+        self.bytes_written += bytes_written
+        self.rows += rows
+        # Reservoir sampling keeps percentiles representative with bounded memory.
+        if len(self.samples) < MAX_SAMPLES:
+            self.samples.append(elapsed)
+        else:
+            slot = random.randrange(self.calls)
+            if slot < MAX_SAMPLES:
+                self.samples[slot] = elapsed
+
+    def summary(self):
+        ordered = sorted(self.samples)
+
+        def percentile(p):
+            if not ordered:
+                return 0.0
+            return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+        return {
+            "calls": self.calls,
+            "total_s": self.total,
+            "mean_s": self.total / self.calls if self.calls else 0.0,
+            "p50_s": percentile(50),
+            "p90_s": percentile(90),
+            "p99_s": percentile(99),
+            "max_s": self.max,
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            "rows_scanned": self.rows,
+        }
+
+
+def _read_io_counters():
+    """(bytes read, bytes written) by this process so far, or None if unknown."""
+    try:
+        with open("/proc/self/io", "rb") as file:
+            fields = dict(line.split(b":", 1) for line in file.read().splitlines())
+        return int(fields[b"rchar"]), int(fields[b"wchar"])
+    except (OSError, KeyError, ValueError):
+        pass
+    try:
+        import psutil
+        counters = psutil.Process().io_counters()
+        return counters.read_chars if hasattr(counters, "read_chars") else counters.read_bytes, counters.write_bytes
+    except Exception:
+        return None
+
+
+def _frames():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def add_rows(count):
+    """Attribute count scanned rows to the instrumented call in progress."""
+    stack = getattr(_local, "stack", None)
+    if stack:
+        stack[-1][0] += count
+
+
+def _begin():
+    # frame = [rows scanned, counter reads made by nested instrumented calls]
+    frame = [0, 0]
+    _frames().append(frame)
+    return frame, _read_io_counters(), time.perf_counter()
+
+
+def _finish(frame, io_before, start):
+    """Pop frame and return [elapsed, bytes read, bytes written, rows]."""
+    elapsed = time.perf_counter() - start
+    io_after = _read_io_counters()
+    stack = _frames()
+    stack.pop()
+    rows, nested_reads = frame
+    if stack:
+        stack[-1][0] += rows
+        stack[-1][1] += nested_reads + 2
+
+    bytes_read = bytes_written = 0
+    if io_before and io_after:
+        reads = 1 + nested_reads
+        bytes_read = max(0, io_after[0] - io_before[0] - reads * _io_overhead[0])
+        bytes_written = max(0, io_after[1] - io_before[1] - reads * _io_overhead[1])
+    return [elapsed, bytes_read, bytes_written, rows]
+
+
+def _record(name, elapsed, bytes_read, bytes_written, rows):
+    with _lock:
+        op = _stats.get(name)
+        if op is None:
+            op = _stats[name] = _OpStats()
+        op.record(elapsed, bytes_read, bytes_written, rows)
+
+
+def _timed_steps(name, iterator, totals):
+    """
+    Re-yield iterator, measuring only the time spent producing items (not
+    the consumer's work between them), and record one call when it ends.
+    """
+    try:
+        while True:
+            state = _begin()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                for i, value in enumerate(_finish(*state)):
+                    totals[i] += value
+            yield item
+    finally:
+        _record(name, *totals)
+
+
+def _timed(name, fn):
+    import inspect
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            state = _begin()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                _record(name, *_finish(*state))
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        state = _begin()
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException:
+            _record(name, *_finish(*state))
+            raise
+        totals = _finish(*state)
+        # Lazy results (pomodoro_history, ...) are measured while they are consumed.
+        if inspect.isgenerator(result):
+            return _timed_steps(name, result, totals)
+        _record(name, *totals)
+        return result
+    return wrapper
+
+
+def _patch(owner, attr, replacement):
+    _originals.append((owner, attr, owner.__dict__[attr] if isinstance(owner, type) else getattr(owner, attr)))
+    setattr(owner, attr, replacement)
+
+
+def _patch_public_methods(cls):
+    import inspect
+
+    for attr, value in list(vars(cls).items()):
+        if (attr.startswith("_") and attr != "__init__") or not inspect.isfunction(value):
+            continue
+        _patch(cls, attr, _timed(f"{cls.__name__}.{attr}", value))
+
+
+def _counting(fn, count):
+    """Wrap fn so count(args, result) rows are attributed to the current call."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        result = fn(*args, **kwargs)
+        add_rows(count(args, result))
+        return result
+    return wrapper
+
+
+def _counting_iter(fn):
+    """Wrap a generator function so each yielded item counts as one row."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        for item in fn(*args, **kwargs):
+            add_rows(1)
+            yield item
+    return wrapper
+
+
+def enable():
+    """Install the instrumentation wrappers (idempotent)."""
+    global _enabled, _io_overhead
+    if _enabled:
+        return
+    _enabled = True
+
+    # Reading the counters is itself I/O; measure it once so it can be subtracted.
+    first, second = _read_io_counters(), _read_io_counters()
+    if first and second:
+        _io_overhead = (second[0] - first[0], second[1] - first[1])
+
+    import task
+    import timer
+    from binlog import BinaryPomodoroLog
+    from rollup import PomodoroRollup
+    from storage import BinaryLogStorage, CsvStorage, SqliteStorage
+
+    _patch_public_methods(task.TaskManager)
+    _patch_public_methods(timer.PomodoroTimer)
+
+    # Row counters on the scan points underneath the public methods.
+    for cls in (CsvStorage, SqliteStorage):
+        _patch(cls, "load_tasks", _counting(vars(cls)["load_tasks"], lambda args, rows: len(rows)))
+    for cls in (CsvStorage, BinaryLogStorage, SqliteStorage):
+        _patch(cls, "iter_log_range", _counting_iter(vars(cls)["iter_log_range"]))
+        _patch(cls, "iter_log_rows", _counting_iter(vars(cls)["iter_log_rows"]))
+    _patch(BinaryPomodoroLog, "day_totals", _counting(vars(BinaryPomodoroLog)["day_totals"], lambda args, result: len(args[0])))
+    _patch(PomodoroRollup, "add", _counting(vars(PomodoroRollup)["add"], lambda args, result: 1))
+    _patch(task, "score_columns", _counting(task.score_columns, lambda args, result: len(args[0].keys)))
+    _patch(task, "schedule_days", _counting(task.schedule_days, lambda args, result: len(args[0])))
+
+
+def disable():
+    """Remove the wrappers; collected stats are kept."""
+    global _enabled
+    while _originals:
+        owner, attr, original = _originals.pop()
+        setattr(owner, attr, original)
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def stats():
+    """{"Class.method": {calls, total_s, mean_s, p50_s, p90_s, p99_s, max_s, bytes_read, bytes_written, rows_scanned}}"""
+    with _lock:
+        return {name: op.summary() for name, op in sorted(_stats.items())}
+
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+
+def dump(path=None):
+    """
+    Write stats() as JSON to path. The default, $POMODORO_PROFILE_FILE or
+    pomodoro_profile.json, gets the process id before its extension so
+    that each run (CLI commands included) keeps its own file.
+    """
+    if path is None:
+        root, ext = os.path.splitext(os.environ.get(OUTPUT_ENV) or DEFAULT_OUTPUT)
+        path = f"{root}.{os.getpid()}{ext}"
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(stats(), file, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def enable_from_env():
+    """Enable instrumentation and dump it at exit when POMODORO_PROFILE is set."""
+    if os.environ.get(PROFILE_ENV) and not _enabled:
+        enable()
+        atexit.register(dump)
+
+
+def start_action_profile(action):
+    """
+    Start cProfile if action is the menu choice named in
+    POMODORO_PROFILE_ACTION; returns the profiler or None.
+    """
+    if not action or os.environ.get(ACTION_ENV) != action:
+        return None
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+
+def stop_action_profile(profiler, action, top=20):
+    """Stop a profiler from start_action_profile, save it and print the hot spots."""
+    if profiler is None:
+        return
+    import pstats
+
+    profiler.disable()
+    path = f"pomodoro_action_{action}.prof"
+    profiler.dump_stats(path)
+    print(f"\nProfile for option {action} saved to {path}")
+    pstats.Stats(profiler).sort_stats("cumulative").print_stats(top)
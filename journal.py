@@ -0,0 +1,93 @@
+import json
+import os
+import time
+
+from fileio import repair_torn_tail
+
+
+class TaskJournal:
+    """
+    Append-only write-ahead log of task mutations.
+
+    Each mutation is one JSON line: {"op": ..., "ts": ..., ...}. TaskManager
+    replays the journal on top of the last tasks.csv checkpoint and folds it
+    back into the CSV once it grows past max_entries or its oldest entry is
+    older than max_age seconds. Records carry absolute values (e.g. the new
+    pomodoro count) so replaying an entry twice is harmless.
+    """
+
+    def __init__(self, path, max_entries=1000, max_age=24 * 60 * 60, sync=True):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.sync = sync
+        self.entries = 0
+        self.first_ts = None
+
+    def append(self, op, **fields):
+        self.append_many([dict(op=op, **fields)])
+
+    def append_many(self, records):
+        """Write several records with a single open/flush/fsync."""
+        now = time.time()
+        lines = []
+        for record in records:
+            record.setdefault("ts", now)
+            lines.append(json.dumps(record, separators=(",", ":")) + "\n")
+        if not lines:
+            return
+
+        # A torn line from a crashed writer would swallow this record.
+        repair_torn_tail(self.path)
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write("".join(lines))
+            file.flush()
+            if self.sync:
+                os.fsync(file.fileno())
+
+        if self.first_ts is None:
+            self.first_ts = now
+        self.entries += len(lines)
+
+    def replay(self):
+        """
+        Yield every complete record in order.
+
+        A torn final line (crash mid-append) is cut off so later appends
+        start on a clean line.
+        """
+        self.entries = 0
+        self.first_ts = None
+        if not os.path.exists(self.path):
+            return
+
+        valid_end = 0
+        with open(self.path, "rb") as file:
+            for raw in file:
+                if not raw.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(raw)
+                except ValueError:
+                    break
+                valid_end += len(raw)
+                self.entries += 1
+                if self.first_ts is None:
+                    self.first_ts = record.get("ts")
+                yield record
+
+        if valid_end < os.path.getsize(self.path):
+            with open(self.path, "r+b") as file:
+                file.truncate(valid_end)
+
+    def needs_compaction(self):
+        if self.entries >= self.max_entries:
+            return True
+        return self.first_ts is not None and time.time() - self.first_ts >= self.max_age
+
+    def reset(self):
+        """Drop all entries once they are safely part of a checkpoint."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.entries = 0
+        self.first_ts = None
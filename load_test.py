@@ -0,0 +1,182 @@
+"""
+Load test for server.py: many concurrent keep-alive clients send a mix of
+reads, schedule requests and pomodoro logs; throughput and latency
+percentiles are reported per endpoint as JSON.
+
+    python load_test.py --clients 50 --seconds 10            # own server, synthetic data
+    python load_test.py --url http://127.0.0.1:8765 --clients 20
+
+Without --url a server is started on a free port against a temporary data
+root seeded with --tasks synthetic tasks.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from urllib.parse import quote, urlsplit
+
+from benchmark import generate_tasks
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# (weight, method, path, body); "{task}" is replaced with a random task name.
+MIX = [
+    (40, "GET", "/tasks?pending=1", None),
+    (15, "GET", "/tasks/{task}", None),
+    (15, "GET", "/summary", None),
+    (10, "GET", "/schedule/daily?unavailable=13-14", None),
+    (5, "GET", "/schedule/weekly", None),
+    (15, "POST", "/tasks/{task}/pomodoros", {"count": 1}),
+]
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+async def request(reader, writer, method, path, body):
+    data = json.dumps(body).encode("utf-8") if body is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(data)}\r\n\r\n".encode("latin-1") + data
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def client(host, port, deadline, tasks, seed, latencies, errors):
+    rng = random.Random(seed)
+    weights = [w for w, *_ in MIX]
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            _, method, path, body = rng.choices(MIX, weights)[0]
+            label = f"{method} {path.split('?')[0]}"
+            path = path.replace("{task}", quote(rng.choice(tasks), safe=""))
+            start = time.perf_counter()
+            status = await request(reader, writer, method, path, body)
+            latencies.setdefault(label, []).append(time.perf_counter() - start)
+            if status >= 400:
+                errors[label] = errors.get(label, 0) + 1
+    finally:
+        writer.close()
+
+
+async def run(host, port, clients, seconds, tasks):
+    latencies, errors = {}, {}
+    deadline = time.perf_counter() + seconds
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, deadline, tasks, i, latencies, errors) for i in range(clients)))
+    return time.perf_counter() - start, latencies, errors
+
+
+def report(elapsed, latencies, errors, clients):
+    def stats(values):
+        values = sorted(values)
+        return {
+            "requests": len(values),
+            "mean_ms": round(statistics.fmean(values) * 1000, 2),
+            "p50_ms": round(percentile(values, 0.50) * 1000, 2),
+            "p99_ms": round(percentile(values, 0.99) * 1000, 2),
+            "max_ms": round(values[-1] * 1000, 2),
+        }
+
+    everything = [v for values in latencies.values() for v in values]
+    return {
+        "clients": clients,
+        "seconds": round(elapsed, 2),
+        "throughput_rps": round(len(everything) / elapsed, 1),
+        "overall": stats(everything) if everything else {},
+        "endpoints": {label: stats(values) for label, values in sorted(latencies.items())},
+        "errors": errors,
+    }
+
+
+def start_server(data_root, backend):
+    command = [sys.executable, os.path.join(HERE, "server.py"), "--port", "0", "--data-root", data_root]
+    if backend:
+        command += ["--backend", backend]
+    proc = subprocess.Popen(command, stderr=subprocess.PIPE, text=True)
+    line = proc.stderr.readline()
+    match = re.search(r":(\d+)$", line.strip())
+    if not match:
+        proc.kill()
+        raise RuntimeError(f"Server did not start: {line.strip()}")
+    return proc, int(match.group(1))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent-client load test for server.py")
+    parser.add_argument("--url", help="existing server (default: start one on synthetic data)")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--tasks", type=int, default=1000, help="synthetic tasks for the started server")
+    parser.add_argument("--backend", choices=["csv", "sqlite", "binary"])
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        proc = None
+        if args.url:
+            url = urlsplit(args.url)
+            host, port = url.hostname, url.port or 80
+        else:
+            generate_tasks(os.path.join(tmp, "tasks.csv"), args.tasks)
+            host, (proc, port) = "127.0.0.1", start_server(tmp, args.backend)
+
+        try:
+            names = asyncio.run(_task_names(host, port))
+            if not names:
+                # An empty server: give the clients something to log against.
+                due = (date.today() + timedelta(days=30)).isoformat()
+                asyncio.run(_add_task(host, port, {"name": "Load test", "estimate": 10 ** 6, "due": due}))
+                names = ["Load test"]
+            elapsed, latencies, errors = asyncio.run(run(host, port, args.clients, args.seconds, names))
+        finally:
+            if proc is not None:
+                proc.terminate()
+                proc.wait()
+
+    print(json.dumps(report(elapsed, latencies, errors, args.clients), indent=2))
+    return 0
+
+
+async def _task_names(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b"GET /tasks?pending=1 HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n")
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    return [task["task_name"] for task in json.loads(raw.split(b"\r\n\r\n", 1)[1])["tasks"]]
+
+
+async def _add_task(host, port, body):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        return await request(reader, writer, "POST", "/tasks", body)
+    finally:
+        writer.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
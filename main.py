@@ -1,10 +1,12 @@
 from datetime import datetime, date, timedelta
-from timer import PomodoroTimer
+import queue
+import sys
+import instrumentation
 from task import TaskManager
-from visualization import get_daily_availability, get_weekly_availability
+from availability import get_daily_availability, get_weekly_availability
 
-def select_task_ui(manager):
-    tasks = manager.get_all_tasks()
+def select_task_ui(manager, **filters):
+    tasks = manager.query_tasks(**filters) if filters else manager.get_all_tasks()
     if not tasks:
         print("No tasks available.")
         return None
@@ -19,14 +21,17 @@ def select_task_ui(manager):
             return tasks[int(choice) - 1].name
         print("Invalid choice. Please enter a valid task number.")
 
-def show_tasks_ui(manager):
-    tasks = manager.get_all_tasks()
+def show_tasks_ui(manager, **filters):
+    tasks = manager.query_tasks(**filters) if filters else manager.get_all_tasks()
     if not tasks:
         print("No tasks available.")
         return
 
     print("\n Current Tasks")
 
+    for group in manager.dependency_cycles():
+        print(f"Warning: dependency cycle {' -> '.join(group)}; these tasks can never be scheduled.")
+
     for task in tasks:
         if task.completed_pomodoros == 0:
             status = "Not Started"
@@ -54,11 +59,31 @@ CATEGORIES = {
     "5": "other"
 }
 
+def record_finished_pomodoros(manager, timer, finished):
+    """Log sessions the background timer finished since the last menu action."""
+    while not finished.empty():
+        task_name = finished.get()
+        success, message = manager.log_pomodoro(task_name)
+        if success:
+            print(f"Pomodoro for '{task_name}' completed and recorded")
+            timer.complete()
+        else:
+            print(message)
+
+
 def main():
+    # The timer pulls in asyncio; only the interactive menu needs it, so the
+    # CLI subcommands below never pay for that import.
+    from timer import PomodoroTimer
+
+    instrumentation.enable_from_env()
     timer = PomodoroTimer()
     manager = TaskManager()
+    finished = queue.Queue()
 
     while True:
+        record_finished_pomodoros(manager, timer, finished)
+
         print("\n--- Pomodoro Task Manager ---")
         print("1. Add new task")
         print("2. Start Pomodoro")
@@ -70,8 +95,14 @@ def main():
         print("8. Generate daily schedule")
         print("9. Generate weekly schedule")
         print("10. Exit")
+        print("11. Pause / resume timer")
+        print("12. Timer status")
 
         choice = input("Choose an option: ")
+        # Tasks may have been changed by the CLI or another menu meanwhile.
+        manager.refresh()
+        record_finished_pomodoros(manager, timer, finished)
+        profiler = instrumentation.start_action_profile(choice)
 
         if choice == "1":
             name = input("Task name: ")
@@ -120,25 +151,14 @@ def main():
             timer.start()
 
         elif choice == "3":
-            task_name = select_task_ui(manager)
+            task_name = select_task_ui(manager, not_status="completed")
 
             if task_name:
-                while True:
-                    task = manager.get_task_by_name(task_name)
-                    if task.is_completed():
-                        print(f"Task '{task_name}' is already completed.")
-                        break
-
-                    timer.start()
-                    timer.complete()
-                    manager.log_pomodoro(task_name)
-                    print(f"Pomodoro for '{task_name}' completed and recorded")
-
-                    study_again = input(
-                        "Start another Pomodoro for this task? (y/n): "
-                    ).lower()
-                    if study_again != "y":
-                        break
+                if timer.is_active():
+                    print("A session is already running.")
+                else:
+                    timer.start(on_complete=lambda name=task_name: finished.put(name))
+                    print(f"Working on '{task_name}'. It will be recorded when the session ends.")
 
         elif choice == "4":
             show_tasks_ui(manager)
@@ -224,12 +244,31 @@ def main():
                 print("Weekly schedule chart error:", e)
 
         elif choice == "10":
+            if timer.is_active():
+                timer.reset()
             print("Goodbye!")
+            instrumentation.stop_action_profile(profiler, choice)
             break
+
+        elif choice == "11":
+            if not timer.is_active():
+                print("No session running.")
+            elif timer.paused:
+                timer.resume()
+            else:
+                timer.pause()
+
+        elif choice == "12":
+            print(timer.status())
         
         else:
             print("Invalid choice, try again")
 
+        instrumentation.stop_action_profile(profiler, choice)
+
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        import cli
+        sys.exit(cli.main(sys.argv[1:]))
     main()
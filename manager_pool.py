@@ -0,0 +1,128 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from task import TaskManager
+
+# Rough resident cost of a loaded manager, measured with tracemalloc on
+# synthetic data; estimate_bytes() only needs to be proportional.
+BASE_BYTES = 16 * 1024
+TASK_BYTES = 950
+ROLLUP_DAY_BYTES = 300
+INDEX_DAY_BYTES = 250
+
+USER_ID = re.compile(r"[A-Za-z0-9_-][A-Za-z0-9_.-]*")
+
+
+def estimate_bytes(manager):
+    """Approximate memory held by a loaded TaskManager (O(1))."""
+    size = BASE_BYTES + TASK_BYTES * len(manager.store)
+    rollup = getattr(manager.storage, "rollup", None)
+    if rollup is not None:
+        size += ROLLUP_DAY_BYTES * rollup.cached_days()
+    log_reader = getattr(manager.storage, "log_reader", None)
+    if log_reader is not None:
+        size += INDEX_DAY_BYTES * len(log_reader.dates)
+    return size
+
+
+class TaskManagerPool:
+    """
+    Loaded TaskManagers for many users, one data directory per user under
+    root. Managers stay in memory between requests and are evicted least
+    recently used first once there are more than max_managers of them or
+    their estimated size passes memory_budget bytes. An evicted manager is
+    flushed (journal folded into its checkpoint) and closed; the next get()
+    for that user loads it again from disk.
+
+    get() and eviction are thread-safe; serializing calls on one manager is
+    up to the caller.
+    """
+
+    def __init__(self, root, max_managers=None, memory_budget=None, backend=None):
+        self.root = root
+        self.max_managers = max_managers
+        self.memory_budget = memory_budget
+        self.backend = backend
+        self._managers = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+
+    def data_root(self, user_id):
+        if not USER_ID.fullmatch(user_id or ""):
+            raise ValueError(f"Invalid user id '{user_id}'.")
+        return os.path.join(self.root, user_id)
+
+    def get(self, user_id):
+        """The user's TaskManager, loading it (and evicting cold ones) if needed."""
+        with self._lock:
+            manager = self._managers.get(user_id)
+            if manager is not None:
+                self._managers.move_to_end(user_id)
+                self.hits += 1
+            else:
+                manager = TaskManager(backend=self.backend, data_root=self.data_root(user_id))
+                self._managers[user_id] = manager
+                self.loads += 1
+
+            # Sizes change as tasks are added; refresh on every access.
+            self._sizes[user_id] = estimate_bytes(manager)
+            self._evict(keep=user_id)
+            return manager
+
+    def memory_used(self):
+        return sum(self._sizes.values())
+
+    def _over_budget(self):
+        if self.max_managers is not None and len(self._managers) > self.max_managers:
+            return True
+        return self.memory_budget is not None and self.memory_used() > self.memory_budget
+
+    def _evict(self, keep):
+        while self._over_budget() and len(self._managers) > 1:
+            user_id = next(iter(self._managers))
+            if user_id == keep:
+                break
+            self._release(user_id)
+            self.evictions += 1
+
+    def _release(self, user_id):
+        manager = self._managers.pop(user_id)
+        self._sizes.pop(user_id, None)
+        manager.flush()
+        manager.close()
+
+    def evict(self, user_id):
+        """Flush and drop one user's manager (no-op if not loaded)."""
+        with self._lock:
+            if user_id in self._managers:
+                self._release(user_id)
+
+    def flush_all(self):
+        with self._lock:
+            for manager in self._managers.values():
+                manager.flush()
+
+    def close(self):
+        with self._lock:
+            for user_id in list(self._managers):
+                self._release(user_id)
+
+    def __contains__(self, user_id):
+        return user_id in self._managers
+
+    def __len__(self):
+        return len(self._managers)
+
+    def stats(self):
+        return {
+            "loaded": len(self._managers),
+            "memory_estimate": self.memory_used(),
+            "hits": self.hits,
+            "loads": self.loads,
+            "evictions": self.evictions,
+        }
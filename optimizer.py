@@ -0,0 +1,277 @@
+"""
+Deadline-aware schedule optimizer.
+
+The greedy planner (scheduler.schedule_days) books the highest-scored task
+first and never checks whether a task finishes before its due date. This
+module searches for a plan with lower total weighted lateness
+
+    sum over tasks of weight * max(0, finish_day - due_day)
+
+where weight is the category importance used by priority scoring and
+finish_day is the day of a task's last booked pomodoro (work left after the
+horizon is assumed to continue at the horizon's average daily capacity).
+
+A plan is an order of the tasks; it is decoded by booking each task, in
+order, into the earliest free slots after its prerequisites are fully
+booked, as the greedy planner releases dependents. The search starts from
+the greedy plan's order and moves late tasks earlier (and swaps them with
+earlier tasks) while that lowers the cost, until no move helps or the time
+budget runs out. The best plan found so far is returned, and never one
+worse than the greedy plan.
+"""
+
+import math
+import time
+
+from scheduler import priority_label, schedule_days
+from scoring import DEFAULT_IMPORTANCE, IMPORTANCE
+from task_store import name_key
+
+
+class _Problem:
+    """Slots, tasks and dependency edges in index form for fast decoding."""
+
+    def __init__(self, tasks, days, graph, today_ordinal):
+        self.day_keys = [day_key for day_key, _ in days]
+        self.slots = []
+        self.slot_day = []
+        for idx, (_, slots) in enumerate(days):
+            for slot in slots:
+                self.slots.append(slot)
+                self.slot_day.append(idx)
+        horizon = max(1, len(days))
+        self.horizon = horizon
+        self.daily = max(1.0, len(self.slots) / horizon)
+
+        self.tasks = []
+        index = {}
+        for task in tasks:
+            left = task.estimated_pomodoros - task.completed_pomodoros
+            if left > 0:
+                index[name_key(task.name)] = len(self.tasks)
+                self.tasks.append(task)
+        self.index = index
+        self.left = [t.estimated_pomodoros - t.completed_pomodoros for t in self.tasks]
+        self.weight = [IMPORTANCE.get(t.category.lower(), DEFAULT_IMPORTANCE) for t in self.tasks]
+        self.due = [
+            t.due_ordinal - today_ordinal if t.due_ordinal is not None else None
+            for t in self.tasks
+        ]
+
+        # Prerequisites among the candidates; a task waiting on anything
+        # else (missing, or not being planned) can never be booked.
+        self.prereqs = [[] for _ in self.tasks]
+        self.dependents = [[] for _ in self.tasks]
+        self.blocked = [False] * len(self.tasks)
+        for i, task in enumerate(self.tasks):
+            if graph.unmet_count(task.name) == 0:
+                continue
+            for dep in {name_key(d) for d in task.dependencies}:
+                j = index.get(dep)
+                if j is not None:
+                    self.prereqs[i].append(j)
+                    self.dependents[j].append(i)
+            unmet_candidates = len(self.prereqs[i])
+            if graph.unmet_count(task.name) > unmet_candidates:
+                self.blocked[i] = True
+
+    def finish_day(self, i, booked, last_day):
+        """Finish day of task i given its booked count and last booked day."""
+        unbooked = self.left[i] - booked
+        if unbooked <= 0:
+            return last_day
+        return self.horizon - 1 + math.ceil(unbooked / self.daily)
+
+    def task_cost(self, i, booked, last_day):
+        if self.due[i] is None:
+            return 0
+        return self.weight[i] * max(0, self.finish_day(i, booked, last_day) - self.due[i])
+
+    def decode(self, order):
+        """
+        Book tasks in order. Returns (cost, owner) where owner[s] is the
+        task index booked into slot s or None.
+        """
+        size = len(self.slots)
+        owner = [None] * size
+        # nxt[s]: first free slot >= s (union-find with path halving).
+        nxt = list(range(size + 1))
+        finish = [None] * len(self.tasks)
+        blocked = [self.blocked[i] for i in range(len(self.tasks))]
+        cost = 0
+
+        for i in order:
+            release = 0
+            if not blocked[i]:
+                for j in self.prereqs[i]:
+                    if finish[j] is None:
+                        blocked[i] = True
+                        break
+                    release = max(release, finish[j] + 1)
+
+            booked = 0
+            last = None
+            if not blocked[i]:
+                s = release
+                while booked < self.left[i]:
+                    while nxt[s] != s:
+                        nxt[s] = nxt[nxt[s]]
+                        s = nxt[s]
+                    if s >= size:
+                        break
+                    owner[s] = i
+                    nxt[s] = s + 1
+                    booked += 1
+                    last = s
+                if booked == self.left[i]:
+                    finish[i] = last
+            cost += self.task_cost(i, booked, self.slot_day[last] if last is not None else None)
+        return cost, owner
+
+    def cost_of_schedule(self, schedule):
+        """Weighted lateness of a {day_key: entries} schedule."""
+        booked = [0] * len(self.tasks)
+        last_day = [None] * len(self.tasks)
+        for idx, day_key in enumerate(self.day_keys):
+            for entry in schedule.get(day_key, []):
+                i = self.index.get(name_key(entry["task"]))
+                if i is not None:
+                    booked[i] += 1
+                    last_day[i] = idx
+        return sum(self.task_cost(i, booked[i], last_day[i]) for i in range(len(self.tasks)))
+
+    def initial_order(self, schedule):
+        """Tasks by first booking in schedule, then by score; dependencies first."""
+        first = {}
+        position = 0
+        for day_key in self.day_keys:
+            for entry in schedule.get(day_key, []):
+                i = self.index.get(name_key(entry["task"]))
+                if i is not None and i not in first:
+                    first[i] = position
+                position += 1
+        rank = sorted(
+            range(len(self.tasks)),
+            key=lambda i: (first.get(i, position), -self.tasks[i].priority_score, i),
+        )
+        # Stable topological sort: a task never precedes its prerequisites.
+        placed = set()
+        order = []
+
+        def place(i):
+            if i in placed:
+                return
+            placed.add(i)
+            for j in self.prereqs[i]:
+                place(j)
+            order.append(i)
+
+        for i in rank:
+            place(i)
+        return order
+
+    def to_schedule(self, owner, decay_per_day):
+        schedule = {day_key: [] for day_key in self.day_keys}
+        for s, i in enumerate(owner):
+            if i is None:
+                continue
+            task = self.tasks[i]
+            idx = self.slot_day[s]
+            start, end = self.slots[s]
+            factor = 1 - decay_per_day * idx
+            schedule[self.day_keys[idx]].append({
+                "task": task.name,
+                "start": start,
+                "end": end,
+                "priority": priority_label(max(0, task.priority_score * factor)),
+                "category": task.category.lower()
+            })
+        return schedule
+
+
+def _moves(problem, order, owner):
+    """
+    Candidate orders, most promising first: each late task (highest
+    weighted lateness first) moved in front of, or swapped with, each
+    earlier task that holds slots, nearest first.
+    """
+    position = {i: p for p, i in enumerate(order)}
+    booked = [0] * len(problem.tasks)
+    last_day = [None] * len(problem.tasks)
+    holds_slots = set()
+    for s, i in enumerate(owner):
+        if i is not None:
+            booked[i] += 1
+            last_day[i] = problem.slot_day[s]
+            holds_slots.add(i)
+
+    late = [
+        (problem.task_cost(i, booked[i], last_day[i]), i)
+        for i in range(len(problem.tasks))
+        if problem.task_cost(i, booked[i], last_day[i]) > 0 and not problem.blocked[i]
+    ]
+    late.sort(key=lambda item: (-item[0], position[item[1]]))
+
+    for _, t in late:
+        p_t = position[t]
+        lo = max((position[j] + 1 for j in problem.prereqs[t]), default=0)
+        for p in range(p_t - 1, lo - 1, -1):
+            u = order[p]
+            if u not in holds_slots:
+                continue
+            # Move t in front of u.
+            yield order[:p] + [t] + order[p:p_t] + order[p_t + 1:]
+            # Swap t and u, if u's dependents all come after t's old place.
+            if all(position[d] > p_t for d in problem.dependents[u]):
+                swapped = list(order)
+                swapped[p], swapped[p_t] = t, u
+                yield swapped
+
+
+def optimize_schedule(tasks, days, graph, today_ordinal, decay_per_day=0.0, time_budget=0.5, greedy=None):
+    """
+    Plan tasks over days ((day_key, slots) as for schedule_days, with task
+    priority scores set) minimizing weighted lateness within time_budget
+    seconds. greedy is the greedy schedule for the same input (computed
+    when not given). Returns (schedule, stats) with schedule as
+    {day_key: entries}.
+    """
+    started = time.perf_counter()
+    deadline = started + time_budget
+    days = [(day_key, list(slots)) for day_key, slots in days]
+    if greedy is None:
+        greedy = dict(schedule_days(tasks, days, graph, decay_per_day))
+
+    problem = _Problem(tasks, days, graph, today_ordinal)
+    greedy_cost = problem.cost_of_schedule(greedy)
+
+    order = problem.initial_order(greedy)
+    cost, owner = problem.decode(order)
+    evaluations = 1
+    improved = True
+    timed_out = False
+    while improved and cost > 0:
+        improved = False
+        for candidate in _moves(problem, order, owner):
+            if time.perf_counter() >= deadline:
+                timed_out = True
+                break
+            new_cost, new_owner = problem.decode(candidate)
+            evaluations += 1
+            if new_cost < cost:
+                order, cost, owner = candidate, new_cost, new_owner
+                improved = True
+                break
+
+    if cost < greedy_cost:
+        schedule = problem.to_schedule(owner, decay_per_day)
+    else:
+        schedule, cost = greedy, greedy_cost
+
+    return schedule, {
+        "greedy_lateness": greedy_cost,
+        "lateness": cost,
+        "evaluations": evaluations,
+        "seconds": round(time.perf_counter() - started, 4),
+        "converged": not timed_out,
+    }
@@ -0,0 +1,180 @@
+import bisect
+import csv
+import json
+import mmap
+import os
+from datetime import date
+
+from fileio import file_id, tail_crc
+
+
+class PomodoroLogReader:
+    """
+    Date-range reads over count_pomodoro.csv without parsing the whole file.
+
+    A sidecar index maps each date to the byte ranges ("runs") of
+    consecutive rows carrying that date, plus the sorted list of dates.
+    log_pomodoro appends in date order, so normally every date is one run;
+    rows appended out of order (backfills, hand edits) simply start extra
+    runs, so the index stays exact instead of assuming the file is sorted.
+    A range query bisects the date list and reads only the matching runs
+    through mmap, so its cost follows the rows returned, not the file size.
+    Only the bytes appended since the last call are indexed; the index is
+    rebuilt if the log was replaced, shrank, was rewritten in place (same
+    size, new mtime) or its indexed part no longer ends the same way (CRC
+    of the bytes before the indexed size).
+    """
+
+    def __init__(self, log_path, index_path):
+        self.log_path = log_path
+        self.index_path = index_path
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_path, encoding="utf-8") as file:
+                data = json.load(file)
+            self.size = int(data["size"])
+            self.fields = data["fields"]
+            self.runs = {d: [list(r) for r in runs] for d, runs in data["runs"].items()}
+            self.tail = data.get("tail")
+            self.stamp = data["stamp"]
+            self.check = data["check"]
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            self._clear()
+        self.dates = sorted(self.runs)
+
+    def _clear(self):
+        self.size = 0
+        self.fields = None
+        self.runs = {}
+        self.dates = []
+        self.tail = None
+        self.stamp = None
+        self.check = None
+
+    def save(self):
+        # Unique per process: several processes may refresh the same sidecar.
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(
+                {"size": self.size, "fields": self.fields, "tail": self.tail, "stamp": self.stamp, "check": self.check, "runs": self.runs},
+                file,
+                separators=(",", ":"),
+            )
+        os.replace(tmp_path, self.index_path)
+
+    def refresh(self):
+        """Index rows appended since the last refresh (or rebuild if the log changed otherwise)."""
+        stamp = file_id(self.log_path)
+        if stamp == self.stamp:
+            return
+        size = stamp[1] if stamp else 0
+        if self.size and (
+            self.stamp is None
+            or stamp is None
+            or stamp[0] != self.stamp[0]
+            or size <= self.size
+            or tail_crc(self.log_path, self.size) != self.check
+        ):
+            self._clear()
+        if size == self.size:
+            self.stamp = stamp
+            return
+
+        with open(self.log_path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = self.size
+            if self.fields is None:
+                end = mm.find(b"\n", 0, size)
+                if end < 0:
+                    return
+                self.fields = _split(mm[0:end])
+                pos = end + 1
+
+            date_col, _, _ = self._columns()
+            # The run that ends exactly where the previous refresh stopped
+            # may continue into the new bytes.
+            last = None
+            if self.tail in self.runs and self.runs[self.tail][-1][1] == pos:
+                last = (self.tail, self.runs[self.tail][-1])
+
+            while pos < size:
+                end = mm.find(b"\n", pos, size)
+                if end < 0:
+                    break
+                values = _split(mm[pos:end])
+                day = values[date_col].strip() if date_col < len(values) else ""
+
+                if last is not None and last[0] == day and last[1][1] == pos:
+                    last[1][1] = end + 1
+                elif _valid_day(day):
+                    if day not in self.runs:
+                        self.runs[day] = []
+                        bisect.insort(self.dates, day)
+                    run = [pos, end + 1]
+                    self.runs[day].append(run)
+                    last = (day, run)
+                else:
+                    last = None
+                pos = end + 1
+
+        self.size = pos
+        self.tail = last[0] if last else None
+        self.stamp = stamp
+        self.check = tail_crc(self.log_path, pos)
+        self.save()
+
+    def _columns(self):
+        fields = [f.strip() for f in self.fields]
+
+        def find(name, default):
+            return fields.index(name) if name in fields else default
+
+        return find("date", 0), find("category", 1), find("pomodoros", 2)
+
+    def iter_range(self, start, end):
+        """
+        Yield {"date", "category", "pomodoros"} rows with start <= date <= end
+        (dates or ISO strings), ordered by date and then by file position.
+        """
+        self.refresh()
+        start = start.isoformat() if isinstance(start, date) else start
+        end = end.isoformat() if isinstance(end, date) else end
+
+        lo = bisect.bisect_left(self.dates, start)
+        hi = bisect.bisect_right(self.dates, end)
+        if lo >= hi:
+            return
+
+        date_col, category_col, count_col = self._columns()
+
+        with open(self.log_path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for day in self.dates[lo:hi]:
+                for run_start, run_end in self.runs[day]:
+                    for line in mm[run_start:run_end].splitlines():
+                        values = _split(line)
+                        try:
+                            count = int(values[count_col])
+                        except (IndexError, ValueError):
+                            continue
+                        category = values[category_col] if category_col < len(values) else ""
+                        yield {
+                            "date": day,
+                            "category": (category.strip() or "other").lower(),
+                            "pomodoros": count,
+                        }
+
+
+def _split(raw):
+    text = raw.decode("utf-8").rstrip("\r")
+    if '"' in text:
+        return next(csv.reader([text]))
+    return text.split(",")
+
+
+def _valid_day(day):
+    try:
+        date.fromisoformat(day)
+        return True
+    except ValueError:
+        return False
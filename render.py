@@ -0,0 +1,128 @@
+"""
+Headless chart rendering: the weekly dashboard pages and the timetables are
+written to PNG/SVG files through the Agg/SVG canvases, without pyplot
+windows or input(). Independent figures render in a process pool, and a
+per-directory manifest of content hashes lets unchanged charts be reused
+instead of redrawn.
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+
+MANIFEST = ".render-cache.json"
+# Bump when the drawing code changes so cached files are redrawn.
+RENDER_VERSION = 2
+
+
+def _figure(kind, payload):
+    from matplotlib.figure import Figure
+    import visualization
+
+    if kind == "dashboard":
+        fig = Figure(figsize=(12, 5), layout="constrained")
+        axes = fig.subplots(1, 2)
+        visualization.draw_dashboard_page(fig, axes, visualization.dashboard_data(payload["summary"]), payload["page"])
+    elif kind == "daily":
+        fig = Figure(figsize=(14, 4))
+        visualization.draw_schedule(fig.subplots(), payload)
+        fig.tight_layout()
+    elif kind == "weekly":
+        fig = Figure(figsize=(14, 7))
+        visualization.draw_weekly_schedule(fig.subplots(), payload)
+        fig.tight_layout()
+    else:
+        raise ValueError(f"Unknown chart kind '{kind}'.")
+    return fig
+
+
+def _render_one(job):
+    path, kind, payload = job
+    fig = _figure(kind, payload)
+    fig.savefig(path + ".tmp", format=os.path.splitext(path)[1].lstrip(".") or "png")
+    os.replace(path + ".tmp", path)
+    return path
+
+
+def cache_key(kind, payload, path):
+    blob = json.dumps([RENDER_VERSION, kind, payload, os.path.splitext(path)[1]], sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _load_manifest(directory):
+    try:
+        with open(os.path.join(directory, MANIFEST), encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(directory, manifest):
+    path = os.path.join(directory, MANIFEST)
+    with open(path + ".tmp", "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=1, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def render_charts(jobs, workers=None):
+    """
+    Render (path, kind, payload) jobs; kind is "dashboard" (payload
+    {"summary", "page"}), "daily" (a daily schedule) or "weekly" (a weekly
+    schedule). Files whose inputs match the directory's manifest are left
+    as they are. Returns (rendered paths, reused paths).
+    """
+    manifests = {}
+    todo, reused, keys = [], [], {}
+    for path, kind, payload in jobs:
+        directory = os.path.dirname(os.path.abspath(path))
+        manifest = manifests.setdefault(directory, _load_manifest(directory))
+        key = cache_key(kind, payload, path)
+        name = os.path.basename(path)
+        if manifest.get(name) == key and os.path.exists(path):
+            reused.append(path)
+        else:
+            todo.append((path, kind, payload))
+            keys[path] = (directory, name, key)
+
+    workers = min(workers or os.cpu_count() or 1, len(todo))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rendered = list(pool.map(_render_one, todo))
+    else:
+        rendered = [_render_one(job) for job in todo]
+
+    for path in rendered:
+        directory, name, key = keys[path]
+        manifests[directory][name] = key
+    for directory in {keys[path][0] for path in rendered}:
+        _save_manifest(directory, manifests[directory])
+
+    return rendered, reused
+
+
+def report_jobs(out_dir, summary, daily_schedule, weekly_schedule, fmt="png"):
+    """Jobs for one user's report: the three dashboard pages and both timetables."""
+    jobs = [
+        (os.path.join(out_dir, f"dashboard_{page + 1}.{fmt}"), "dashboard", {"summary": summary, "page": page})
+        for page in range(3)
+    ]
+    jobs.append((os.path.join(out_dir, f"daily_schedule.{fmt}"), "daily", daily_schedule))
+    jobs.append((os.path.join(out_dir, f"weekly_schedule.{fmt}"), "weekly", weekly_schedule))
+    return jobs
+
+
+def manager_report_jobs(manager, out_dir, fmt="png", available_hours=((9, 22),), decay_per_day=0.1):
+    """report_jobs for a TaskManager's current summary and schedules."""
+    os.makedirs(out_dir, exist_ok=True)
+    hours = list(available_hours)
+    today = date.today()
+    week = {(today + timedelta(days=i)).isoformat(): hours for i in range(7)}
+    return report_jobs(
+        out_dir,
+        manager.weekly_summary(),
+        manager.generate_daily_schedule(hours),
+        manager.generate_weekly_schedule(week, decay_per_day),
+        fmt,
+    )
@@ -0,0 +1,191 @@
+import csv
+import io
+import json
+import os
+from contextlib import nullcontext
+from datetime import date
+
+from fileio import file_id, tail_crc
+
+
+class PomodoroRollup:
+    """
+    Sidecar of per-(date, category) pomodoro totals for count_pomodoro.csv.
+
+    Totals are kept one JSON file per month in a directory beside the
+    small state file (path), which records how many bytes of the log have
+    been folded in. New rows only rewrite the months they fall in, and a
+    month is read only when one of its days is asked for, so neither
+    logging nor start-up gets slower as the history grows.
+
+    When the log has grown since (rows appended by another process or by
+    hand) only the new tail is read. The state also keeps the log's inode,
+    size and mtime and a CRC of the bytes just before the offset: if the
+    log was replaced, shrank, was rewritten in place or no longer ends the
+    way it did, the rollup is rebuilt from scratch. Every month file notes
+    the offset it was written for, so months saved by a refresh that died
+    before saving the state are caught and rebuilt as well. Refreshes run
+    under lock (the storage's file lock) when one is given.
+    """
+
+    def __init__(self, log_path, path, lock=None):
+        self.log_path = log_path
+        self.path = path
+        self.month_dir = os.path.splitext(path)[0] + ".d"
+        self.lock = lock if lock is not None else nullcontext()
+        self.state = None
+        self.months = {}
+        self._load_state()
+        self.refresh()
+
+    def _load_state(self):
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                data = json.load(file)
+            state = {
+                "offset": int(data["offset"]),
+                "fieldnames": data["fieldnames"],
+                "log": data["log"],
+                "check": data["check"],
+            }
+            if state["offset"] and not os.path.isdir(self.month_dir):
+                raise ValueError("month files missing")
+        except (OSError, ValueError, KeyError, TypeError):
+            state = {"offset": 0, "fieldnames": None, "log": None, "check": None}
+        # Cached months belong to the state they were read under.
+        if state != self.state:
+            self.months = {}
+        self.state = state
+
+    def _save_state(self, offset, fieldnames, stamp):
+        self.state = {
+            "offset": offset,
+            "fieldnames": fieldnames,
+            "log": stamp,
+            "check": tail_crc(self.log_path, offset) if stamp else None,
+        }
+        _write_json(self.path, self.state)
+
+    def _month_path(self, month):
+        return os.path.join(self.month_dir, month + ".json")
+
+    def _month(self, month):
+        """{"offset", "days"} for a YYYY-MM month, or None if its file is unreadable."""
+        totals = self.months.get(month)
+        if totals is None:
+            try:
+                with open(self._month_path(month), encoding="utf-8") as file:
+                    data = json.load(file)
+                totals = {"offset": int(data["offset"]), "days": data["days"]}
+            except FileNotFoundError:
+                totals = {"offset": 0, "days": {}}
+            except (OSError, ValueError, KeyError, TypeError):
+                return None
+            self.months[month] = totals
+        return totals
+
+    def refresh(self):
+        """Fold any unseen part of the log into the totals."""
+        with self.lock:
+            stamp = file_id(self.log_path)
+            if stamp == self.state["log"]:
+                return
+            # Another process may have folded the new rows in already.
+            self._load_state()
+            if stamp == self.state["log"]:
+                return
+
+            seen, offset = self.state["log"], self.state["offset"]
+            stale = (
+                stamp is None
+                or seen is None
+                or stamp[0] != seen[0]
+                or stamp[1] <= offset
+                or tail_crc(self.log_path, offset) != self.state["check"]
+            )
+            if stale or not self._fold(offset, stamp):
+                self._rebuild(stamp)
+
+    def _scan(self, start, size, fieldnames):
+        """({month: {day: {category: n}}}, end offset, fieldnames) for whole rows in start..size."""
+        with open(self.log_path, "rb") as file:
+            file.seek(start)
+            chunk = file.read(size - start)
+
+        end = chunk.rfind(b"\n") + 1
+        changes = {}
+        if end == 0:
+            return changes, start, fieldnames
+
+        text = io.StringIO(chunk[:end].decode("utf-8"), newline="")
+        reader = csv.DictReader(text, fieldnames=fieldnames)
+        for row in reader:
+            day = (row.get("date") or "").strip()
+            try:
+                date.fromisoformat(day)
+                count = int(row.get("pomodoros", 0))
+            except (TypeError, ValueError):
+                continue
+            category = (row.get("category") or "other").strip().lower()
+            self.add(changes.setdefault(day[:7], {}), day, category, count)
+        return changes, start + end, reader.fieldnames
+
+    def _fold(self, offset, stamp):
+        """Add the rows after offset; False if a month is ahead of the state."""
+        changes, end, fieldnames = self._scan(offset, stamp[1], self.state["fieldnames"])
+        months = {month: self._month(month) for month in changes}
+        if any(totals is None or totals["offset"] > offset for totals in months.values()):
+            return False
+
+        for month, days in changes.items():
+            totals = months[month]
+            for day, by_category in days.items():
+                for category, count in by_category.items():
+                    self.add(totals["days"], day, category, count)
+            totals["offset"] = end
+            _write_json(self._month_path(month), totals)
+        self._save_state(end, fieldnames, stamp)
+        return True
+
+    def _rebuild(self, stamp):
+        if stamp:
+            changes, end, fieldnames = self._scan(0, stamp[1], None)
+        else:
+            changes, end, fieldnames = {}, 0, None
+
+        os.makedirs(self.month_dir, exist_ok=True)
+        for name in os.listdir(self.month_dir):
+            if name.endswith(".json") and name[:-5] not in changes:
+                os.remove(os.path.join(self.month_dir, name))
+        self.months = {}
+        for month, days in changes.items():
+            self.months[month] = {"offset": end, "days": days}
+            _write_json(self._month_path(month), self.months[month])
+        self._save_state(end, fieldnames, stamp)
+
+    def add(self, days, day, category, count=1):
+        by_category = days.setdefault(day, {})
+        by_category[category] = by_category.get(category, 0) + count
+
+    def day_total(self, day):
+        return sum(self.day_categories(day).values())
+
+    def day_categories(self, day):
+        totals = self._month(day[:7])
+        if totals is None:
+            with self.lock:
+                self._rebuild(file_id(self.log_path))
+            totals = self._month(day[:7])
+        return totals["days"].get(day, {})
+
+    def cached_days(self):
+        """Days held in memory (for size estimates)."""
+        return sum(len(totals["days"]) for totals in self.months.values())
+
+
+def _write_json(path, data):
+    # Unique per process: several processes may refresh the same sidecar.
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(data, file, separators=(",", ":"))
+    os.replace(tmp_path, path)
@@ -0,0 +1,407 @@
+import bisect
+import heapq
+
+from task_store import name_key
+
+SLOT_MINUTES = 30
+SLOT_HOURS = SLOT_MINUTES / 60
+
+
+def expand_slots(available_hours):
+    """Split (start, end) hour ranges into 30-minute (start, end) slots."""
+    timeline = []
+    for start, end in available_hours:
+        hour = float(start)
+        while hour + SLOT_HOURS <= float(end):
+            timeline.append((hour, hour + SLOT_HOURS))
+            hour += SLOT_HOURS
+    return timeline
+
+
+def priority_label(score):
+    """
+    Convert numeric priority_score into High / Medium / Low
+    """
+    if score >= 7:
+        return "High"
+    elif score >= 4:
+        return "Medium"
+    else:
+        return "Low"
+
+
+def schedule_days(tasks, days, graph, decay_per_day=0.0, release_dependents=True):
+    """
+    Greedy multi-day planner. Yields (day_key, entries) for each
+    (day_key, slots) in days.
+
+    tasks are the candidates (not completed, priority_score already set);
+    their order breaks priority ties. Pending work sits in a heap keyed by
+    priority and each pop books a run of consecutive slots, so remaining
+    pomodoros carry over to later days instead of being booked again. When
+    release_dependents is set, a task whose prerequisites are all fully
+    booked becomes schedulable from the next free slot. The day's score is
+    priority_score * (1 - decay_per_day * day_index), floored at 0; the
+    scaling is uniform, so it only changes the labels until it reaches 0,
+    after which ties fall back to task order.
+
+    Runs in O((tasks + slots) log tasks).
+    """
+    by_key = {}
+    order = {}
+    remaining = {}
+    waiting = {}
+    heap = []
+
+    for seq, task in enumerate(tasks):
+        left = task.estimated_pomodoros - task.completed_pomodoros
+        if left <= 0:
+            continue
+        key = name_key(task.name)
+        by_key[key] = task
+        order[key] = seq
+        remaining[key] = left
+        unmet = graph.unmet_count(task.name)
+        if unmet == 0:
+            heap.append((-task.priority_score, seq, key))
+        else:
+            waiting[key] = unmet
+    heapq.heapify(heap)
+
+    flat = False
+
+    def push(key):
+        score = 0 if flat else -by_key[key].priority_score
+        heapq.heappush(heap, (score, order[key], key))
+
+    for idx, (day_key, slots) in enumerate(days):
+        factor = 1 - decay_per_day * idx
+        if factor <= 0 and not flat:
+            flat = True
+            heap = [(0, seq, key) for _, seq, key in heap]
+            heapq.heapify(heap)
+
+        entries = []
+        slot_index = 0
+
+        while slot_index < len(slots) and heap:
+            _, _, key = heapq.heappop(heap)
+            task = by_key[key]
+            level = priority_label(max(0, task.priority_score * factor))
+            category = task.category.lower()
+
+            take = min(remaining[key], len(slots) - slot_index)
+            for start, end in slots[slot_index:slot_index + take]:
+                entries.append({
+                    "task": task.name,
+                    "start": start,
+                    "end": end,
+                    "priority": level,
+                    "category": category
+                })
+            slot_index += take
+            remaining[key] -= take
+
+            if remaining[key] > 0:
+                push(key)
+            elif release_dependents:
+                for dependent in graph.dependents(task.name):
+                    dep_key = name_key(dependent.name)
+                    if dep_key in waiting:
+                        waiting[dep_key] -= 1
+                        if waiting[dep_key] == 0:
+                            del waiting[dep_key]
+                            push(dep_key)
+
+        yield day_key, entries
+
+
+class SchedulePlan:
+    """
+    A schedule_days() result that can be patched after a change instead of
+    regenerated. The plan remembers, for every day, the planner state at
+    the start of that day (the few tasks already partly booked or released
+    and how far through the ready list it had got), which tasks each day
+    booked first, finished and released. A change only re-runs the planner
+    from the first day it can affect; earlier days are kept as they are.
+    The result is always identical to running schedule_days() again on the
+    changed tasks and slots.
+
+    Task scores must not change while the plan is in use, which holds for a
+    given date (see TaskManager.reschedule). The change methods return the
+    keys of the days that were recomputed ([] when nothing changed), or
+    None when the change alters which tasks are ready at the start (a
+    completed or deleted prerequisite) and the plan must be rebuilt.
+    """
+
+    def __init__(self, tasks, days, graph, decay_per_day=0.0, release_dependents=True):
+        self.graph = graph
+        self.decay_per_day = decay_per_day
+        self.release_dependents = release_dependents
+        self.reset(tasks, days)
+
+    def reset(self, tasks, days=None):
+        """Plan from scratch for tasks over days (by default the current days and slots)."""
+        if days is not None:
+            self.day_keys = [day_key for day_key, _ in days]
+            self.slots = [list(slots) for _, slots in days]
+        self.tasks = {}
+        self.seq = {}
+        self.score = {}
+        self.by_score = []
+        self.by_seq = []
+        self.waiting = {}
+
+        for seq, task in enumerate(tasks):
+            if task.estimated_pomodoros - task.completed_pomodoros <= 0:
+                continue
+            key = name_key(task.name)
+            self.tasks[key] = task
+            self.seq[key] = seq
+            self.score[key] = task.priority_score
+            unmet = self.graph.unmet_count(task.name)
+            if unmet == 0:
+                self.by_score.append((-task.priority_score, seq, key))
+                self.by_seq.append(key)
+            else:
+                self.waiting[key] = unmet
+        self.by_score.sort()
+        self.next_seq = len(tasks)
+
+        count = len(self.day_keys)
+        self.entries = [[] for _ in range(count)]
+        # Per day: tuples popped, whether every slot was booked, the state
+        # at the start of the day and the undo log of the day.
+        self.popped = [[] for _ in range(count)]
+        self.full = [False] * count
+        self.snapshots = [None] * count
+        self.first_seen = [[] for _ in range(count)]
+        self.finished_on = [[] for _ in range(count)]
+        self.released_on = [[] for _ in range(count)]
+        self.first_pop = {}
+        self.finished = {}
+        self.released = {}
+        self._run_from(0)
+
+    def schedule(self):
+        """[(day_key, entries)] for every day, as schedule_days() yields them."""
+        return list(zip(self.day_keys, self.entries))
+
+    # --- changes ---
+
+    def pomodoro_logged(self, task):
+        """task has one more completed pomodoro than when it was planned."""
+        key = name_key(task.name)
+        done = task.estimated_pomodoros - task.completed_pomodoros <= 0
+        if key not in self.tasks:
+            # An unplanned (e.g. overdue) prerequisite finishing unblocks its dependents.
+            return None if done and self._has_dependents(task.name) else []
+        if done:
+            if self._has_dependents(task.name):
+                return None
+            del self.tasks[key]
+            self.waiting.pop(key, None)
+        return self._run_from(self._first_use(key))
+
+    def task_added(self, task):
+        """A new task (priority_score set, already in the graph) was added."""
+        key = name_key(task.name)
+        if key in self.seq:
+            # A name planned before: its old ready-list entries are stale.
+            return None
+        if task.estimated_pomodoros - task.completed_pomodoros <= 0:
+            return []
+        seq = self.next_seq
+        self.next_seq += 1
+        self.tasks[key] = task
+        self.seq[key] = seq
+        self.score[key] = task.priority_score
+
+        unmet = self.graph.unmet_count(task.name)
+        if unmet:
+            return self._run_from(self._add_waiting(key, task, unmet))
+
+        item = (-task.priority_score, seq, key)
+        pos = bisect.bisect(self.by_score, item)
+        self.by_score.insert(pos, item)
+        self.by_seq.append(key)
+        # Days start past pos only by skipping deleted tasks; point them at
+        # the new task instead (later days are recomputed anyway).
+        for idx, snapshot in enumerate(self.snapshots):
+            if snapshot[1] > pos:
+                self.snapshots[idx] = (snapshot[0], pos) + snapshot[2:]
+
+        flat_item = (0, seq, key)
+        for idx, popped in enumerate(self.popped):
+            mine = flat_item if self._is_flat(idx) else item
+            if not self.full[idx] or any(mine < other for other in popped):
+                return self._run_from(idx)
+        return []
+
+    def task_deleted(self, name):
+        """name was removed from the tasks (and from the graph)."""
+        key = name_key(name)
+        if key not in self.tasks:
+            # A completed prerequisite going away blocks its dependents again.
+            return None if self._has_dependents(name) else []
+        del self.tasks[key]
+        self.waiting.pop(key, None)
+        return self._run_from(self._first_use(key))
+
+    def set_slots(self, day_key, slots):
+        """day_key's free slots are now slots (e.g. after time was blocked out)."""
+        if day_key not in self.day_keys:
+            return []
+        idx = self.day_keys.index(day_key)
+        old = self.slots[idx]
+        slots = list(slots)
+        if slots == old:
+            return []
+        self.slots[idx] = slots
+        # Same bookings, and the day did not run out of slots: later days
+        # start from the same state.
+        booked = len(self.entries[idx])
+        if booked < len(old) and slots[:booked] == old[:booked]:
+            return []
+        return self._run_from(idx)
+
+    # --- planner ---
+
+    def _has_dependents(self, name):
+        return any(name_key(dependent.name) in self.tasks for dependent in self.graph.dependents(name))
+
+    def _first_use(self, key):
+        """First day whose start state or bookings involve key, or None."""
+        days = [day for day in (self.first_pop.get(key), self.released.get(key)) if day is not None]
+        return min(days) if days else None
+
+    def _is_flat(self, idx):
+        return 1 - self.decay_per_day * idx <= 0
+
+    def _add_waiting(self, key, task, unmet):
+        """
+        Register a new task waiting on unmet prerequisites, counting the
+        ones this plan already fully booked as released. Returns the day it
+        becomes schedulable, or None when that never happens.
+        """
+        if not self.release_dependents:
+            self.waiting[key] = unmet
+            return None
+        release_day = None
+        for dep_key in {name_key(dep) for dep in task.dependencies} - {key}:
+            day = self.finished.get(dep_key)
+            if day is not None:
+                unmet -= 1
+                self.released_on[day].append(key)
+                release_day = day if release_day is None else max(release_day, day)
+        self.waiting[key] = unmet
+        # Replay from the release day so the task gets pushed there.
+        return release_day if unmet == 0 else None
+
+    def _run_from(self, start):
+        """Recompute days start.. ; returns their keys."""
+        if start is None:
+            return []
+
+        for idx in range(start, len(self.day_keys)):
+            for key in self.first_seen[idx]:
+                self.first_pop.pop(key, None)
+            for key in self.finished_on[idx]:
+                self.finished.pop(key, None)
+            for key in self.released_on[idx]:
+                if key in self.waiting:
+                    self.waiting[key] += 1
+                if self.released.get(key) == idx:
+                    del self.released[key]
+            self.first_seen[idx], self.finished_on[idx], self.released_on[idx] = [], [], []
+
+        if start == 0:
+            heap, remaining, ptr, seq_ptr, flat = [], {}, 0, 0, False
+        else:
+            live, ptr, seq_ptr, flat = self.snapshots[start]
+            heap = [item for item, _ in live]
+            remaining = {item[2]: left for item, left in live}
+
+        for idx in range(start, len(self.day_keys)):
+            self.snapshots[idx] = ([(item, remaining[item[2]]) for item in heap], ptr, seq_ptr, flat)
+
+            factor = 1 - self.decay_per_day * idx
+            if factor <= 0 and not flat:
+                flat = True
+                heap = [(0, seq, key) for _, seq, key in heap]
+                heapq.heapify(heap)
+
+            slots = self.slots[idx]
+            entries = []
+            popped = []
+            slot_index = 0
+
+            while slot_index < len(slots):
+                # The next task is the better of the heap top (tasks already
+                # booked or released) and the first ready task not yet booked.
+                if flat:
+                    while seq_ptr < len(self.by_seq) and (self.by_seq[seq_ptr] not in self.tasks or self.by_seq[seq_ptr] in self.first_pop):
+                        seq_ptr += 1
+                    head = (0, self.seq[self.by_seq[seq_ptr]], self.by_seq[seq_ptr]) if seq_ptr < len(self.by_seq) else None
+                else:
+                    while ptr < len(self.by_score) and self.by_score[ptr][2] not in self.tasks:
+                        ptr += 1
+                    head = self.by_score[ptr] if ptr < len(self.by_score) else None
+
+                if heap and (head is None or heap[0] < head):
+                    item = heapq.heappop(heap)
+                elif head is not None:
+                    item = head
+                    if flat:
+                        seq_ptr += 1
+                    else:
+                        ptr += 1
+                else:
+                    break
+
+                key = item[2]
+                popped.append(item)
+                task = self.tasks[key]
+                if key not in self.first_pop:
+                    self.first_pop[key] = idx
+                    self.first_seen[idx].append(key)
+                left = remaining.pop(key, None)
+                if left is None:
+                    left = task.estimated_pomodoros - task.completed_pomodoros
+
+                level = priority_label(max(0, self.score[key] * factor))
+                category = task.category.lower()
+                take = min(left, len(slots) - slot_index)
+                for start_hour, end_hour in slots[slot_index:slot_index + take]:
+                    entries.append({
+                        "task": task.name,
+                        "start": start_hour,
+                        "end": end_hour,
+                        "priority": level,
+                        "category": category
+                    })
+                slot_index += take
+                left -= take
+
+                if left > 0:
+                    remaining[key] = left
+                    heapq.heappush(heap, (0 if flat else -self.score[key], self.seq[key], key))
+                else:
+                    self.finished[key] = idx
+                    self.finished_on[idx].append(key)
+                    if self.release_dependents:
+                        for dependent in self.graph.dependents(task.name):
+                            dep_key = name_key(dependent.name)
+                            if self.waiting.get(dep_key, 0) > 0 and dep_key in self.tasks:
+                                self.waiting[dep_key] -= 1
+                                self.released_on[idx].append(dep_key)
+                                if self.waiting[dep_key] == 0:
+                                    self.released[dep_key] = idx
+                                    remaining[dep_key] = dependent.estimated_pomodoros - dependent.completed_pomodoros
+                                    heapq.heappush(heap, (0 if flat else -self.score[dep_key], self.seq[dep_key], dep_key))
+
+            self.entries[idx] = entries
+            self.popped[idx] = popped
+            self.full[idx] = slot_index == len(slots)
+
+        return self.day_keys[start:]
@@ -0,0 +1,340 @@
+"""
+Local JSON API over HTTP (stdlib asyncio only), for web front ends and
+other services:
+
+    python server.py --port 8765 [--data-root DIR] [--backend sqlite]
+
+    GET    /tasks                  ?category= &status= &pending=1 &due_within=DAYS
+    POST   /tasks                  {"name", "category", "estimate", "due", "depends"}
+    GET    /tasks/<name>
+    DELETE /tasks/<name>
+    POST   /tasks/<name>/pomodoros {"count": 1}  (1 to 100)
+    GET    /summary
+    GET    /schedule/daily         ?unavailable=13-15
+    GET    /schedule/weekly        ?unavailable=13-15 &decay=0.1
+    GET    /schedule/days          ?days=120 &unavailable=13-15 &decay=0.1
+    GET    /health
+
+Responses use the CLI's JSON shapes ({"ok": ..., "message": ...} for
+writes). /schedule/days streams one {"date", "schedule"} JSON line per day
+(chunked) as each day is planned. One worker thread owns the TaskManager:
+every request runs there in arrival order, so reads and writes are
+serialized without blocking the event loop while a schedule is computed.
+Listens on 127.0.0.1 only.
+"""
+
+import argparse
+import asyncio
+import json
+import signal
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import instrumentation
+from availability import parse_availability
+from cli import CATEGORIES, _log_count, _result
+from task import TaskManager, split_dependencies
+
+MAX_BODY = 1024 * 1024
+MAX_DAYS = 366
+# Pomodoros one request may log, so no single request holds the worker for long.
+MAX_COUNT = 100
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class JsonLines:
+    """Handler result sent as chunked JSON lines, one per item of items."""
+
+    def __init__(self, items):
+        self.items = items
+
+
+class ApiServer:
+    """Routes requests to a TaskManager that only the worker thread touches."""
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="taskmanager")
+        self.requests = 0
+        # "*" matches one path segment, passed to the handler.
+        self.routes = [
+            (("tasks",), {"GET": self.list_tasks, "POST": self.add_task}),
+            (("tasks", "*"), {"GET": self.get_task, "DELETE": self.delete_task}),
+            (("tasks", "*", "pomodoros"), {"POST": self.log_pomodoro}),
+            (("summary",), {"GET": self.summary}),
+            (("schedule", "daily"), {"GET": self.daily_schedule}),
+            (("schedule", "weekly"), {"GET": self.weekly_schedule}),
+            (("schedule", "days"), {"GET": self.stream_schedule}),
+            (("health",), {"GET": self.health}),
+        ]
+
+    # --- handlers (run on the worker thread) ---
+
+    def list_tasks(self, query, body):
+        if "due_within" in query:
+            tasks = self.manager.tasks_due_within(_int(query["due_within"], "due_within"))
+        else:
+            filters = {k: query[k] for k in ("category", "status") if query.get(k)}
+            if query.get("pending") in ("1", "true", "yes"):
+                filters["not_status"] = "completed"
+            tasks = self.manager.query_tasks(**filters) if filters else self.manager.get_all_tasks()
+        return {"tasks": [task.to_dict() for task in tasks]}, 200
+
+    def add_task(self, query, body):
+        category = body.get("category", "other")
+        if category not in CATEGORIES:
+            raise HttpError(400, f"category must be one of {', '.join(CATEGORIES)}.")
+        success, message = self.manager.add_task(
+            str(body.get("name") or "").strip(),
+            category,
+            body.get("estimate"),
+            body.get("due"),
+            dependencies=split_dependencies(body.get("depends")),
+        )
+        return _status(_result(success, message), 201)
+
+    def get_task(self, query, body, name):
+        task = self.manager.get_task_by_name(name)
+        if not task:
+            raise HttpError(404, f"Task '{name}' not found.")
+        return {"task": task.to_dict()}, 200
+
+    def delete_task(self, query, body, name):
+        if not self.manager.get_task_by_name(name):
+            raise HttpError(404, f"Task '{name}' not found.")
+        return _status(_result(*self.manager.delete_task(name)))
+
+    def log_pomodoro(self, query, body, name):
+        if not self.manager.get_task_by_name(name):
+            raise HttpError(404, f"Task '{name}' not found.")
+        count = _int(body.get("count", 1), "count")
+        if not 1 <= count <= MAX_COUNT:
+            raise HttpError(400, f"count must be 1 to {MAX_COUNT}.")
+        return _status(_log_count(self.manager, name, count))
+
+    def summary(self, query, body):
+        summary = self.manager.weekly_summary()
+        summary["today"] = self.manager.get_todays_pomodoro_count()
+        return summary, 200
+
+    def daily_schedule(self, query, body):
+        hours = parse_availability(query.get("unavailable", ""))
+        return {"date": date.today().isoformat(), "schedule": self.manager.generate_daily_schedule(hours)}, 200
+
+    def weekly_schedule(self, query, body):
+        hours = parse_availability(query.get("unavailable", ""))
+        decay = _float(query.get("decay", 0.1), "decay")
+        today = date.today()
+        week = {(today + timedelta(days=i)).isoformat(): hours for i in range(7)}
+        return {"schedule": self.manager.generate_weekly_schedule(week, decay_per_day=decay)}, 200
+
+    def stream_schedule(self, query, body):
+        hours = parse_availability(query.get("unavailable", ""))
+        days = _int(query.get("days", 7), "days")
+        if not 1 <= days <= MAX_DAYS:
+            raise HttpError(400, f"days must be 1 to {MAX_DAYS}.")
+        decay = _float(query.get("decay", 0.1), "decay")
+        schedule = self.manager.iter_schedule(hours, days, decay_per_day=decay)
+        return JsonLines({"date": day_key, "schedule": entries} for day_key, entries in schedule), 200
+
+    def health(self, query, body):
+        return {"ok": True, "tasks": len(self.manager.store), "requests": self.requests}, 200
+
+    def route(self, method, path):
+        """(handler, path arguments) for a request, or raises HttpError."""
+        parts = [unquote(p) for p in path.strip("/").split("/")] if path.strip("/") else []
+        for pattern, methods in self.routes:
+            if len(pattern) == len(parts) and all(p in ("*", part) for p, part in zip(pattern, parts)):
+                if method not in methods:
+                    raise HttpError(405, f"{method} not allowed on {path}")
+                return methods[method], [part for p, part in zip(pattern, parts) if p == "*"]
+        raise HttpError(404, f"No such endpoint: {path}")
+
+    def _call(self, handler, args, query, body):
+        # Pick up changes made by the CLI or menu since the last request.
+        self.manager.refresh()
+        return handler(query, body, *args)
+
+    # --- HTTP (event loop) ---
+
+    async def dispatch(self, method, target, body_bytes):
+        url = urlsplit(target)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            handler, args = self.route(method, url.path)
+            try:
+                body = json.loads(body_bytes) if body_bytes else {}
+            except ValueError:
+                raise HttpError(400, "Body must be JSON.")
+            if not isinstance(body, dict):
+                raise HttpError(400, "Body must be a JSON object.")
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, self._call, handler, args, query, body)
+        except HttpError as exc:
+            return {"ok": False, "message": str(exc)}, exc.status
+        except Exception as exc:
+            return {"ok": False, "message": f"{type(exc).__name__}: {exc}"}, 500
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await _respond(writer, {"ok": False, "message": "Malformed request line."}, 400, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await _respond(writer, {"ok": False, "message": "Malformed Content-Length."}, 400, False)
+                    break
+                if length > MAX_BODY:
+                    await _respond(writer, {"ok": False, "message": "Body too large."}, 413, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                self.requests += 1
+                payload, status = await self.dispatch(method.upper(), target, body)
+                if isinstance(payload, JsonLines):
+                    if not await self.stream(writer, payload.items, keep_alive):
+                        break
+                else:
+                    await _respond(writer, payload, status, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def stream(self, writer, items, keep_alive):
+        """
+        Send items as they are produced, each on the worker thread, so
+        other requests are served in between. Returns False if producing
+        an item failed (the response is cut off without its final chunk).
+        """
+        loop = asyncio.get_running_loop()
+        writer.write((
+            "HTTP/1.1 200 OK\r\n"
+            "Content-Type: application/x-ndjson\r\n"
+            "Transfer-Encoding: chunked\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        ).encode("latin-1"))
+        done = object()
+        while True:
+            try:
+                item = await loop.run_in_executor(self.executor, next, items, done)
+            except Exception:
+                return False
+            if item is done:
+                break
+            line = (json.dumps(item) + "\n").encode("utf-8")
+            writer.write(b"%x\r\n%s\r\n" % (len(line), line))
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+        return True
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.manager.flush()
+        self.manager.close()
+
+
+def _status(result, success_status=200):
+    payload, exit_code = result
+    return payload, success_status if exit_code == 0 else 400
+
+
+def _int(value, name):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise HttpError(400, f"{name} must be a whole number.")
+
+
+def _float(value, name):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise HttpError(400, f"{name} must be a number.")
+
+
+async def _respond(writer, payload, status, keep_alive):
+    body = json.dumps(payload).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    writer.write(head.encode("latin-1") + body)
+    await writer.drain()
+
+
+async def serve(api, host="127.0.0.1", port=8765, ready=None):
+    """Run until cancelled or SIGINT/SIGTERM. ready(port) is called once listening."""
+    server = await asyncio.start_server(api.handle, host, port)
+    port = server.sockets[0].getsockname()[1]
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for name in ("SIGINT", "SIGTERM"):
+        try:
+            loop.add_signal_handler(getattr(signal, name), stop.set)
+        except (AttributeError, NotImplementedError, RuntimeError):
+            pass  # Windows: Ctrl+C still raises KeyboardInterrupt
+
+    if ready:
+        ready(port)
+    async with server:
+        await stop.wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pomodoro Task Manager JSON API (localhost)")
+    parser.add_argument("--port", type=int, default=8765, help="0 picks a free port")
+    parser.add_argument("--backend", choices=["csv", "sqlite", "binary"])
+    parser.add_argument("--data-root")
+    args = parser.parse_args(argv)
+
+    instrumentation.enable_from_env()
+    api = ApiServer(TaskManager(backend=args.backend, data_root=args.data_root))
+
+    def ready(port):
+        print(f"Listening on http://127.0.0.1:{port}", file=sys.stderr, flush=True)
+
+    try:
+        asyncio.run(serve(api, port=args.port, ready=ready))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        api.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,454 @@
+import csv
+import os
+import sqlite3
+import sys
+from datetime import date, timedelta
+
+from binlog import BinaryPomodoroLog
+from fileio import FileLock, GroupCommit, file_id, fsync_dir, repair_torn_tail
+from journal import TaskJournal
+from pomodoro_log import PomodoroLogReader
+from rollup import PomodoroRollup
+from task_store import name_key
+
+TASK_FIELDS = [
+    "task_name", "category", "estimated_pomodoros", "completed_pomodoros",
+    "status", "start_date", "due_date", "end_date", "dependencies",
+]
+POMODORO_FIELDS = ["date", "category", "pomodoros"]
+
+
+class CsvStorage:
+    """
+    Default backend: tasks.csv checkpoint + tasks.journal, and the
+    count_pomodoro.csv log with its daily rollup.
+
+    Storages deal in task rows (Task.to_dict() format) so they do not need
+    to know about Task itself.
+
+    Writers hold self.lock (an advisory file lock, so several processes
+    can share the files) while they append, then call commit() after
+    releasing it: journal and log appends are fsynced by a GroupCommit,
+    which lets threads of this process share an fsync. changed_externally() tells whether
+    another process has written tasks since this one last loaded or wrote.
+    """
+
+    def __init__(self, task_file, pomodoro_file, journal_file, rollup_file, log_index_file):
+        self.task_file = task_file
+        self.pomodoro_file = pomodoro_file
+        self.lock = FileLock(task_file + ".lock")
+        self.journal = TaskJournal(journal_file, sync=False)
+        self.durable = GroupCommit([journal_file, pomodoro_file])
+        self.rollup = PomodoroRollup(pomodoro_file, rollup_file, self.lock)
+        self.log_reader = PomodoroLogReader(pomodoro_file, log_index_file)
+        self._seen = None
+
+    def _stamp(self):
+        return file_id(self.task_file), file_id(self.journal.path)
+
+    def _mark_seen(self):
+        self._seen = self._stamp()
+
+    def changed_externally(self):
+        return self._seen != self._stamp()
+
+    def commit(self):
+        """Wait until this process's appends are on disk (shared fsync)."""
+        self.durable.commit()
+
+    def load_tasks(self):
+        rows = {}
+        if os.path.exists(self.task_file):
+            with open(self.task_file, newline="") as file:
+                for row in csv.DictReader(file):
+                    rows.setdefault(name_key(row["task_name"]), row)
+
+        for record in self.journal.replay():
+            self._apply_journal_record(rows, record)
+
+        self._mark_seen()
+        return list(rows.values())
+
+    @staticmethod
+    def _apply_journal_record(rows, record):
+        op = record.get("op")
+        key = name_key(record.get("name", ""))
+        row = rows.get(key)
+
+        if op == "add":
+            rows.pop(key, None)
+            rows[key] = record["task"]
+        elif op == "delete":
+            rows.pop(key, None)
+        elif op == "pomodoro" and row:
+            row["completed_pomodoros"] = record["completed_pomodoros"]
+        elif op == "status" and row:
+            row["status"] = record["status"]
+            row["end_date"] = record.get("end_date", row.get("end_date", ""))
+
+    def add_task(self, row):
+        self.add_tasks([row])
+
+    def add_tasks(self, rows):
+        self.journal.append_many([{"op": "add", "name": row["task_name"], "task": row} for row in rows])
+        self._written()
+
+    def delete_task(self, name):
+        self.journal.append("delete", name=name)
+        self._written()
+
+    def _written(self):
+        self._mark_seen()
+        self.durable.written()
+
+    def log_pomodoro(self, row, status_changed, day, category):
+        self.log_pomodoros([(row, status_changed)], [(day, category, 1)])
+
+    def log_pomodoros(self, task_updates, log_entries):
+        """
+        task_updates: (row, status_changed) for every task whose count moved.
+        log_entries: (day, category, pomodoros) rows for count_pomodoro.csv.
+        The whole batch costs one journal write and one log append.
+        """
+        records = []
+        for row, status_changed in task_updates:
+            records.append({"op": "pomodoro", "name": row["task_name"], "completed_pomodoros": row["completed_pomodoros"]})
+            if status_changed:
+                records.append({"op": "status", "name": row["task_name"], "status": row["status"], "end_date": row["end_date"]})
+        self.journal.append_many(records)
+
+        if log_entries:
+            self._append_log(log_entries)
+        self._written()
+
+    def _append_log(self, log_entries):
+        file_exists = os.path.exists(self.pomodoro_file)
+        repair_torn_tail(self.pomodoro_file, keep_partial=True)
+
+        with open(self.pomodoro_file, "a", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=POMODORO_FIELDS)
+            if not file_exists:
+                writer.writeheader()
+
+            for day, category, count in log_entries:
+                writer.writerow({"date": day, "category": category, "pomodoros": count})
+
+        self.rollup.refresh()
+
+    def needs_checkpoint(self):
+        return self.journal.needs_compaction()
+
+    def has_pending_writes(self):
+        return self.journal.entries > 0
+
+    def checkpoint(self, rows):
+        """
+        Write every task to the CSV and clear the journal.
+
+        The CSV is written to a temp file and swapped in with os.replace, so
+        a crash mid-save leaves either the old or the new file, never a
+        truncated one.
+        """
+        tmp_path = self.task_file + ".tmp"
+        with open(tmp_path, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=TASK_FIELDS)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(row)
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(tmp_path, self.task_file)
+        fsync_dir(self.task_file)
+        self.journal.reset()
+        self._mark_seen()
+
+    def day_totals(self, start, end):
+        """{iso_day: {category: pomodoros}} for start..end inclusive."""
+        self.rollup.refresh()
+        totals = {}
+        day = start
+        while day <= end:
+            key = day.isoformat()
+            by_category = self.rollup.day_categories(key)
+            if by_category:
+                totals[key] = dict(by_category)
+            day += timedelta(days=1)
+        return totals
+
+    def iter_log_range(self, start, end):
+        return self.log_reader.iter_range(start, end)
+
+    def iter_log_rows(self):
+        if not os.path.exists(self.pomodoro_file):
+            return
+        with open(self.pomodoro_file, newline="") as file:
+            yield from csv.DictReader(file)
+
+    def close(self):
+        pass
+
+
+class BinaryLogStorage(CsvStorage):
+    """
+    CSV task storage (checkpoint + journal) with the pomodoro log kept in
+    the fixed-width binary format of binlog.py instead of count_pomodoro.csv.
+    Summaries aggregate directly over the mapped records.
+    """
+
+    def __init__(self, task_file, journal_file, binlog_file):
+        self.task_file = task_file
+        self.lock = FileLock(task_file + ".lock")
+        self.journal = TaskJournal(journal_file, sync=False)
+        self.durable = GroupCommit([journal_file, binlog_file])
+        self.binlog = BinaryPomodoroLog(binlog_file)
+        self._seen = None
+
+    def _append_log(self, log_entries):
+        self.binlog.append_many(log_entries)
+
+    def day_totals(self, start, end):
+        return self.binlog.day_totals(start, end)
+
+    def iter_log_range(self, start, end):
+        return self.binlog.iter_range(start, end)
+
+    def iter_log_rows(self):
+        return self.binlog.iter_rows()
+
+    def close(self):
+        self.binlog.close()
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL UNIQUE,
+    category TEXT NOT NULL,
+    estimated_pomodoros INTEGER NOT NULL,
+    completed_pomodoros INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    start_date TEXT,
+    due_date TEXT,
+    end_date TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_category ON tasks(category);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
+CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks(due_date);
+
+CREATE TABLE IF NOT EXISTS task_dependencies (
+    task_id INTEGER NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    depends_on TEXT NOT NULL,
+    PRIMARY KEY (task_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_task_dependencies_target ON task_dependencies(depends_on);
+
+CREATE TABLE IF NOT EXISTS pomodoro_log (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    category TEXT NOT NULL,
+    pomodoros INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pomodoro_log_date ON pomodoro_log(date, category);
+"""
+
+
+class SqliteStorage:
+    """
+    Optional backend keeping tasks, dependencies and the pomodoro log in one
+    SQLite database. Every mutation is its own transaction; summaries are
+    GROUP BY queries over the indexed log. SQLite makes each commit durable
+    itself; the file lock only keeps TaskManager's read-validate-write
+    sequences from interleaving across processes.
+    """
+
+    def __init__(self, db_file):
+        self.db_file = db_file
+        self.lock = FileLock(db_file + ".lock")
+        # Shared by the threads of a TaskManager; writes are serialized by lock.
+        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+        self._seen = None
+
+    def _data_version(self):
+        # Changes whenever another connection commits to the database.
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def changed_externally(self):
+        return self._seen != self._data_version()
+
+    def commit(self):
+        pass
+
+    def load_tasks(self):
+        deps = {}
+        for task_id, depends_on in self.conn.execute(
+            "SELECT task_id, depends_on FROM task_dependencies ORDER BY task_id, position"
+        ):
+            deps.setdefault(task_id, []).append(depends_on)
+
+        rows = []
+        for r in self.conn.execute(
+            "SELECT id, name, category, estimated_pomodoros, completed_pomodoros, "
+            "status, start_date, due_date, end_date FROM tasks ORDER BY id"
+        ):
+            rows.append({
+                "task_name": r[1],
+                "category": r[2],
+                "estimated_pomodoros": r[3],
+                "completed_pomodoros": r[4],
+                "status": r[5],
+                "start_date": r[6],
+                "due_date": r[7],
+                "end_date": r[8] or "",
+                "dependencies": ",".join(deps.get(r[0], [])),
+            })
+        self._seen = self._data_version()
+        return rows
+
+    def add_task(self, row):
+        self.add_tasks([row])
+
+    def add_tasks(self, rows):
+        with self.conn:
+            for row in rows:
+                self._insert_task(row)
+
+    def _insert_task(self, row):
+        self.conn.execute("DELETE FROM tasks WHERE name_key = ?", (name_key(row["task_name"]),))
+        cur = self.conn.execute(
+            "INSERT INTO tasks (name, name_key, category, estimated_pomodoros, "
+            "completed_pomodoros, status, start_date, due_date, end_date) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                row["task_name"], name_key(row["task_name"]), row["category"],
+                int(row["estimated_pomodoros"]), int(row["completed_pomodoros"]),
+                row["status"], row["start_date"], row["due_date"], row.get("end_date", ""),
+            ),
+        )
+        deps = [d.strip() for d in (row.get("dependencies") or "").split(",") if d.strip()]
+        self.conn.executemany(
+            "INSERT INTO task_dependencies (task_id, position, depends_on) VALUES (?, ?, ?)",
+            [(cur.lastrowid, i, d) for i, d in enumerate(deps)],
+        )
+
+    def delete_task(self, name):
+        with self.conn:
+            self.conn.execute("DELETE FROM tasks WHERE name_key = ?", (name_key(name),))
+
+    def log_pomodoro(self, row, status_changed, day, category):
+        self.log_pomodoros([(row, status_changed)], [(day, category, 1)])
+
+    def log_pomodoros(self, task_updates, log_entries):
+        """Apply task updates and append log rows in a single transaction."""
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE tasks SET completed_pomodoros = ?, status = ?, end_date = ? WHERE name_key = ?",
+                [
+                    (row["completed_pomodoros"], row["status"], row["end_date"], name_key(row["task_name"]))
+                    for row, _ in task_updates
+                ],
+            )
+            self.conn.executemany(
+                "INSERT INTO pomodoro_log (date, category, pomodoros) VALUES (?, ?, ?)",
+                log_entries,
+            )
+
+    def needs_checkpoint(self):
+        return False
+
+    def has_pending_writes(self):
+        return False
+
+    def checkpoint(self, rows):
+        """Replace the task tables with rows in one transaction."""
+        with self.conn:
+            self.conn.execute("DELETE FROM tasks")
+            for row in rows:
+                self._insert_task(row)
+
+    def day_totals(self, start, end):
+        totals = {}
+        for day, category, count in self.conn.execute(
+            "SELECT date, category, SUM(pomodoros) FROM pomodoro_log "
+            "WHERE date BETWEEN ? AND ? GROUP BY date, category",
+            (start.isoformat(), end.isoformat()),
+        ):
+            totals.setdefault(day, {})[category] = count
+        return totals
+
+    def iter_log_range(self, start, end):
+        for day, category, count in self.conn.execute(
+            "SELECT date, category, pomodoros FROM pomodoro_log "
+            "WHERE date BETWEEN ? AND ? ORDER BY date, id",
+            (start.isoformat(), end.isoformat()),
+        ):
+            yield {"date": day, "category": category, "pomodoros": count}
+
+    def iter_log_rows(self):
+        for day, category, count in self.conn.execute(
+            "SELECT date, category, pomodoros FROM pomodoro_log ORDER BY id"
+        ):
+            yield {"date": day, "category": category, "pomodoros": count}
+
+    def close(self):
+        self.conn.close()
+
+
+def migrate_csv_to_sqlite(csv_storage, sqlite_storage):
+    """
+    One-shot copy of tasks (checkpoint + journal) and the pomodoro log from
+    the CSV files into an empty SQLite database. Log rows without a valid
+    ISO date or whole-number count are skipped, as csv_to_binary does (a
+    date like "2026-10-15T10:00" would otherwise match date ranges as
+    text). Returns (tasks, log_rows, skipped).
+    """
+    conn = sqlite_storage.conn
+    if conn.execute("SELECT EXISTS (SELECT 1 FROM tasks) OR EXISTS (SELECT 1 FROM pomodoro_log)").fetchone()[0]:
+        raise ValueError(f"{sqlite_storage.db_file} already contains data.")
+
+    rows = csv_storage.load_tasks()
+    log_rows, skipped = [], 0
+    for row in csv_storage.iter_log_rows():
+        try:
+            log_rows.append((
+                date.fromisoformat((row.get("date") or "").strip()).isoformat(),
+                (row.get("category") or "other").strip().lower(),
+                int(row.get("pomodoros", 0)),
+            ))
+        except (TypeError, ValueError):
+            skipped += 1
+
+    with conn:
+        for row in rows:
+            sqlite_storage._insert_task(row)
+        conn.executemany(
+            "INSERT INTO pomodoro_log (date, category, pomodoros) VALUES (?, ?, ?)",
+            log_rows,
+        )
+    return len(rows), len(log_rows), skipped
+
+
+if __name__ == "__main__":
+    from task import TaskManager
+
+    if sys.argv[1:] != ["migrate"]:
+        print("Usage: python storage.py migrate")
+        sys.exit(1)
+
+    csv_storage = TaskManager.make_storage("csv")
+    sqlite_storage = TaskManager.make_storage("sqlite", migrate=False)
+    try:
+        tasks, logs, skipped = migrate_csv_to_sqlite(csv_storage, sqlite_storage)
+        print(f"Migrated {tasks} tasks and {logs} pomodoro log rows to {sqlite_storage.db_file}.")
+        if skipped:
+            print(f"Skipped {skipped} log rows without a valid date or count.")
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+    finally:
+        sqlite_storage.close()
@@ -0,0 +1,162 @@
+"""
+Concurrent-writer stress test: several processes (each with several
+threads) share one data root, add tasks and log pomodoros at the same
+time, and the result is checked for lost or torn updates.
+
+    python stress_test.py --processes 4 --threads 4 --logs 200
+    python stress_test.py --backend sqlite --keep /tmp/stress
+    python stress_test.py --processes 1 --threads 8 --fsync-delay 10
+
+fsyncs are shared only between threads of one process. On a fast disk
+each fsync finishes before the next write arrives, so fsync_batches is
+close to writes. --fsync-delay adds the given milliseconds to every
+fsync, as on a slow disk: with one process and 8 threads the writers
+queued behind a running fsync then share the next one (about 110 fsyncs
+for 408 writes at 10 ms). Across processes each process syncs its own
+writes, so batching there stays small. Exits 1 if any check fails.
+"""
+
+import argparse
+import json
+import multiprocessing
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+from fileio import GroupCommit
+from task import TaskManager
+
+SHARED_TASKS = 8
+
+
+def slow_fsyncs(delay):
+    """Make every GroupCommit fsync take delay seconds longer (simulated slow disk)."""
+    fsync_all = GroupCommit._fsync_all
+
+    def slow(self):
+        time.sleep(delay)
+        fsync_all(self)
+
+    GroupCommit._fsync_all = slow
+
+
+def worker(number, data_root, backend, threads, logs, results, fsync_delay=0.0):
+    if fsync_delay:
+        slow_fsyncs(fsync_delay)
+    manager = TaskManager(backend=backend, data_root=data_root)
+    failures = []
+    due = (date.today() + timedelta(days=30)).isoformat()
+
+    def run(thread):
+        rng = random.Random(number * 1000 + thread)
+        name = f"Worker {number}.{thread}"
+        success, message = manager.add_task(name, "other", logs + 1, due)
+        if not success:
+            failures.append(message)
+        for i in range(logs):
+            # Mostly shared tasks, so writers contend on the same rows.
+            target = name if i % 4 == 0 else f"Shared {rng.randrange(SHARED_TASKS)}"
+            success, message = manager.log_pomodoro(target)
+            if not success:
+                failures.append(f"{target}: {message}")
+
+    pool = [threading.Thread(target=run, args=(t,)) for t in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+
+    durable = getattr(manager.storage, "durable", None)
+    manager.close()
+    results.put({
+        "worker": number,
+        "failures": failures,
+        "commits": threads * (logs + 1),
+        "fsyncs": durable.fsyncs if durable is not None else None,
+    })
+
+
+def check(data_root, backend, processes, threads, logs):
+    """Reload from disk and compare against what the workers did."""
+    manager = TaskManager(backend=backend, data_root=data_root)
+    errors = []
+    writers = processes * threads
+
+    tasks = {task.name: task for task in manager.get_all_tasks()}
+    for number in range(processes):
+        for thread in range(threads):
+            if f"Worker {number}.{thread}" not in tasks:
+                errors.append(f"task 'Worker {number}.{thread}' was lost")
+
+    expected = writers * logs
+    completed = sum(task.completed_pomodoros for task in tasks.values())
+    if completed != expected:
+        errors.append(f"tasks record {completed} pomodoros, expected {expected}")
+
+    logged = manager.get_todays_pomodoro_count()
+    if logged != expected:
+        errors.append(f"log has {logged} pomodoros today, expected {expected}")
+
+    manager.close()
+    return errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent writer stress test")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=4, help="threads per process, sharing one TaskManager")
+    parser.add_argument("--logs", type=int, default=100, help="log_pomodoro calls per thread")
+    parser.add_argument("--backend", default="csv", choices=["csv", "sqlite", "binary"])
+    parser.add_argument("--fsync-delay", type=float, default=0, metavar="MS", help="add MS milliseconds to every fsync (simulated slow disk)")
+    parser.add_argument("--keep", help="use (and keep) this data directory instead of a temporary one")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_root = args.keep or tmp
+        setup = TaskManager(backend=args.backend, data_root=data_root)
+        due = (date.today() + timedelta(days=30)).isoformat()
+        # Large estimates: shared tasks must never complete mid-run.
+        setup.add_tasks(
+            {"task_name": f"Shared {i}", "category": "study", "estimated_pomodoros": 10 ** 9, "due_date": due}
+            for i in range(SHARED_TASKS)
+        )
+        setup.close()
+
+        results = multiprocessing.Queue()
+        procs = [
+            multiprocessing.Process(target=worker, args=(n, data_root, args.backend, args.threads, args.logs, results, args.fsync_delay / 1000))
+            for n in range(args.processes)
+        ]
+        start = time.perf_counter()
+        for proc in procs:
+            proc.start()
+        reports = [results.get() for _ in procs]
+        for proc in procs:
+            proc.join()
+        elapsed = time.perf_counter() - start
+
+        errors = [f"worker {r['worker']}: {message}" for r in reports for message in r["failures"]]
+        errors += [f"worker exited with {proc.exitcode}" for proc in procs if proc.exitcode]
+        errors += check(data_root, args.backend, args.processes, args.threads, args.logs)
+
+    commits = sum(r["commits"] for r in reports)
+    fsyncs = [r["fsyncs"] for r in reports if r["fsyncs"] is not None]
+    print(json.dumps({
+        "backend": args.backend,
+        "processes": args.processes,
+        "threads": args.threads,
+        "fsync_delay_ms": args.fsync_delay,
+        "writes": commits,
+        "seconds": round(elapsed, 3),
+        "writes_per_s": round(commits / elapsed, 1),
+        "fsync_batches": sum(fsyncs) if fsyncs else None,
+        "errors": errors,
+    }, indent=2))
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
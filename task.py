@@ -1,23 +1,120 @@
-import csv
-from datetime import date, datetime, timedelta
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import date, timedelta
+from functools import lru_cache, wraps
 import os
+import sys
+
+from availability import AvailabilityCalendar
+from binlog import csv_to_binary
+from dependency_graph import DependencyGraph
+from optimizer import optimize_schedule
+from scheduler import SLOT_MINUTES, SchedulePlan, priority_label, schedule_days
+from scoring import score_columns, score_task
+from storage import BinaryLogStorage, CsvStorage, SqliteStorage, migrate_csv_to_sqlite
+from task_store import TaskStore
+
+
+@lru_cache(maxsize=4096)
+def parse_ordinal(value):
+    """ISO date string -> date ordinal, or None when blank or invalid."""
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value).toordinal()
+    except (TypeError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=4096)
+def format_ordinal(ordinal):
+    return date.fromordinal(ordinal).isoformat() if ordinal else ""
+
+
+def split_dependencies(value):
+    """Dependency names from a comma-separated string or a list."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    return [str(d).strip() for d in value if str(d).strip()]
+
+
+def whole_number(value):
+    """
+    value as an int if it is a whole number (3, 3.0 or "3"); raises
+    ValueError for fractions ("2.5", 2.7), booleans and anything else.
+    """
+    if isinstance(value, bool):
+        raise ValueError(value)
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError(value)
+        return int(value)
+    if isinstance(value, (int, str)):
+        return int(value)
+    raise ValueError(value)
+
 
 class Task:
+    """
+    Dates are held as ordinals (parsed once, when the task is created or
+    loaded); the *_date properties give the ISO strings used by the CSV
+    format. Category and status strings are interned since only a handful
+    of distinct values exist.
+
+    A date that is not a valid ISO date (e.g. hand-edited into tasks.csv)
+    has no ordinal, so it counts as blank, but its text is kept in
+    raw_dates and written back unchanged when the task is saved.
+    """
+
+    __slots__ = (
+        "name", "category", "estimated_pomodoros", "completed_pomodoros", "status",
+        "start_ordinal", "due_ordinal", "end_ordinal", "dependencies", "priority_score",
+        "raw_dates",
+    )
+
     def __init__(self, name, category, estimated_pomodoros, due_date, completed_pomodoros=0, status="not started", start_date=None, end_date="", dependencies=None):
         self.name = name
-        self.category = category
+        self.category = sys.intern(category)
         self.estimated_pomodoros = int(estimated_pomodoros)
         self.completed_pomodoros = int(completed_pomodoros)
-        self.due_date = due_date
-        self.status = status
-        self.start_date = start_date if start_date else date.today().isoformat()
-        self.end_date = end_date
-        self.dependencies = dependencies or []
-        self.priority_score = 0 
+        self.status = sys.intern(status)
+        self.dependencies = tuple(dependencies or ())
+        self.priority_score = 0
+        self.raw_dates = None
+        self.due_ordinal = self._parse_date("due_date", due_date)
+        self.start_ordinal = self._parse_date("start_date", start_date) if start_date else date.today().toordinal()
+        self.end_ordinal = self._parse_date("end_date", end_date)
+
+    def _parse_date(self, field, value):
+        ordinal = parse_ordinal(value)
+        if ordinal is None and value:
+            if self.raw_dates is None:
+                self.raw_dates = {}
+            self.raw_dates[field] = value
+        return ordinal
+
+    def _format_date(self, field, ordinal):
+        if ordinal is None and self.raw_dates:
+            return self.raw_dates.get(field, "")
+        return format_ordinal(ordinal)
+
+    @property
+    def due_date(self):
+        return self._format_date("due_date", self.due_ordinal)
+
+    @property
+    def start_date(self):
+        return self._format_date("start_date", self.start_ordinal)
+
+    @property
+    def end_date(self):
+        return self._format_date("end_date", self.end_ordinal)
 
     def mark_completed(self):
         self.status = "completed"
-        self.end_date = date.today().isoformat()
+        self.end_ordinal = date.today().toordinal()
 
     def add_pomodoro(self):
         self.completed_pomodoros += 1
@@ -43,8 +140,7 @@ class Task:
 
     @classmethod
     def from_dict(cls, data):
-        deps = data.get("dependencies") or ""
-        dependencies = [d.strip() for d in deps.split(",") if d.strip()]
+        dependencies = split_dependencies(data.get("dependencies"))
 
         return cls(
             name=data["task_name"],
@@ -56,292 +152,583 @@ class Task:
             start_date=data.get("start_date"),
             end_date=data.get("end_date", ""),
             dependencies=dependencies
-        
         )
 
 
+def _writes(method):
+    """Run a TaskManager mutator inside self._writing()."""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._writing():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _calendar(availability, day_key):
+    """
+    availability as an AvailabilityCalendar: one already, {day_key: hours},
+    or an hours list for day_key alone (every day when day_key is None).
+    """
+    if isinstance(availability, AvailabilityCalendar):
+        return availability
+    if isinstance(availability, dict):
+        return AvailabilityCalendar.from_days(availability)
+    if day_key is None:
+        return AvailabilityCalendar.every_day(availability)
+    return AvailabilityCalendar.from_days({day_key: availability})
+
+
 class TaskManager:
     TASK_FILE = "tasks.csv"
     POMODORO_FILE = "count_pomodoro.csv"
+    JOURNAL_FILE = "tasks.journal"
+    ROLLUP_FILE = "count_pomodoro.rollup.json"
+    LOG_INDEX_FILE = "count_pomodoro.idx.json"
+    DB_FILE = "pomodoro.db"
+    BINLOG_FILE = "count_pomodoro.bin"
+    BACKEND = "csv"
+    SCHEDULE_CACHE_SIZE = 32
+
+    def __init__(self, backend=None, data_root=None):
+        """
+        data_root is the directory holding this user's files (created if
+        missing); by default the file names are relative to the current
+        directory.
+        """
+        self.backend = backend or os.environ.get("POMODORO_BACKEND") or self.BACKEND
+        self.data_root = data_root
+        if data_root:
+            os.makedirs(data_root, exist_ok=True)
+        self.store = TaskStore()
+        self.graph = DependencyGraph()
+        # Bumped on every change to the tasks; schedules are cached per version.
+        self.version = 0
+        self._schedules = OrderedDict()
+        self.schedule_cache_hits = 0
+        self.schedule_cache_misses = 0
+        self.storage = self.make_storage(self.backend, data_root=data_root)
+        with self.storage.lock:
+            self._load_tasks()
 
-    def __init__(self):
-        self.tasks = []
-        self._load_tasks()
+    @classmethod
+    def make_storage(cls, backend, migrate=True, data_root=None):
+        """
+        "csv" (default), "sqlite", or "binary" (CSV tasks, binary pomodoro
+        log). A new SQLite database or binary log is seeded once from the
+        existing CSV files.
+        """
+        def path(name):
+            return os.path.join(data_root, name) if data_root else name
+
+        task_file, pomodoro_file = path(cls.TASK_FILE), path(cls.POMODORO_FILE)
+
+        if backend == "csv":
+            return CsvStorage(task_file, pomodoro_file, path(cls.JOURNAL_FILE), path(cls.ROLLUP_FILE), path(cls.LOG_INDEX_FILE))
+
+        if backend == "sqlite":
+            db_file = path(cls.DB_FILE)
+            is_new = not os.path.exists(db_file)
+            storage = SqliteStorage(db_file)
+            if is_new and migrate and (os.path.exists(task_file) or os.path.exists(pomodoro_file)):
+                migrate_csv_to_sqlite(cls.make_storage("csv", data_root=data_root), storage)
+            return storage
+
+        if backend == "binary":
+            binlog_file = path(cls.BINLOG_FILE)
+            if migrate and not os.path.exists(binlog_file) and os.path.exists(pomodoro_file):
+                csv_to_binary(pomodoro_file, binlog_file)
+            return BinaryLogStorage(task_file, path(cls.JOURNAL_FILE), binlog_file)
+
+        raise ValueError(f"Unknown storage backend '{backend}'.")
+
+    @property
+    def tasks(self):
+        return self.store.all()
 
     def _load_tasks(self):
-        if not os.path.exists(self.TASK_FILE):
-            return
-        
-        with open(self.TASK_FILE, newline="") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                self.tasks.append(Task.from_dict(row))
+        tasks = (Task.from_dict(row) for row in self.storage.load_tasks())
+        for task in self.store.add_many(tasks):
+            self.graph.add(task)
 
+        if self.storage.needs_checkpoint():
+            self.save_tasks()
+
+    @contextmanager
+    def _writing(self):
+        """
+        Hold the storage lock around a read-validate-write sequence, on
+        tasks reloaded first if another process has written since; once the
+        lock is released, wait for the writes to be made durable (fsyncs are
+        shared with concurrent writers).
+        """
+        with self.storage.lock:
+            self._sync()
+            yield
+        self.storage.commit()
+
+    def _sync(self):
+        if self.storage.changed_externally():
+            self.store = TaskStore()
+            self.graph = DependencyGraph()
+            self._load_tasks()
+            self._changed()
+
+    def _changed(self):
+        self.version += 1
+        # Entries for older versions can never be hit again.
+        self._schedules.clear()
+
+    def refresh(self):
+        """Pick up tasks written by other processes (e.g. the CLI) since the last load."""
+        with self.storage.lock:
+            self._sync()
+
+    def _after_write(self):
+        self._changed()
+        if self.storage.needs_checkpoint():
+            self.save_tasks()
+
+    @_writes
     def save_tasks(self):
-        if not self.tasks:
-            return
+        """Checkpoint every task to the storage backend."""
+        self.storage.checkpoint(task.to_dict() for task in self.store)
 
-        with open(self.TASK_FILE, "w", newline="") as file:
-            fieldnames = self.tasks[0].to_dict().keys()
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
-            for task in self.tasks:
-                writer.writerow(task.to_dict())
+    @_writes
+    def flush(self):
+        """Fold pending journal entries into the task checkpoint, if there are any."""
+        if self.storage.has_pending_writes():
+            self.save_tasks()
+
+    def close(self):
+        self.storage.close()
+
+    def _validate_new_task(self, name, estimated, due_date, dependencies):
+        """Rules shared by add_task and add_tasks; returns an error message or None."""
+        if not name:
+            return "Task name cannot be empty."
+
+        try:
+            if whole_number(estimated) < 1:
+                return "Estimated pomodoros must be 1 or more."
+        except ValueError:
+            return "Estimated pomodoros must be a whole number."
 
-    def add_task(self, name, category, estimated, due_date, dependencies=None):
         try:
             due = date.fromisoformat(due_date)
             today = date.today()
 
             if due < today:
-                return False, "Due date must be today or later."
-        except ValueError:
-            return False, "Invalid date format. Use YYYY-MM-DD."
+                return "Due date must be today or later."
+        except (TypeError, ValueError):
+            return "Invalid date format. Use YYYY-MM-DD."
 
         if self.get_task_by_name(name):
-            return False, f"Task '{name}' already exists!"
+            return f"Task '{name}' already exists!"
 
-        new_task = Task(name, category, estimated, due_date, dependencies=dependencies or [])
-        self.tasks.append(new_task)
-        self.save_tasks()
+        return self.graph.validate(name, dependencies)
+
+    def _insert_task(self, name, category, estimated, due_date, dependencies):
+        new_task = Task(name, category, whole_number(estimated), due_date, dependencies=dependencies)
+        self.store.add(new_task)
+        self.graph.add(new_task)
+        return new_task
+
+    @_writes
+    def add_task(self, name, category, estimated, due_date, dependencies=None):
+        error = self._validate_new_task(name, estimated, due_date, dependencies or [])
+        if error:
+            return False, error
+
+        new_task = self._insert_task(name, category, estimated, due_date, dependencies or [])
+        self.storage.add_task(new_task.to_dict())
+        self._after_write()
 
         return True, "Task added successfully."
 
-    
+    @_writes
+    def add_tasks(self, rows):
+        """
+        Bulk add_task. rows is any iterable of dicts (e.g. streamed from
+        bulk_import.read_rows) with task_name, category, estimated_pomodoros,
+        due_date and optional dependencies (comma-separated or a list).
+
+        Each row is checked with the add_task rules, in order, so a row may
+        depend on an earlier row of the same batch. Accepted rows are
+        committed in one storage write. Returns (added, errors) where errors
+        is a list of (row_number, message).
+        """
+        added = []
+        errors = []
+
+        for number, row in enumerate(rows, 1):
+            if not isinstance(row, dict):
+                errors.append((number, "Malformed row."))
+                continue
+
+            name = str(row.get("task_name") or row.get("name") or "").strip()
+            category = str(row.get("category") or "other").strip()
+            estimated = row.get("estimated_pomodoros", row.get("estimated"))
+            due_date = str(row.get("due_date") or "").strip()
+            dependencies = split_dependencies(row.get("dependencies"))
+
+            error = self._validate_new_task(name, estimated, due_date, dependencies)
+            if error:
+                errors.append((number, error))
+                continue
+
+            added.append(self._insert_task(name, category, estimated, due_date, dependencies))
+
+        if added:
+            self.storage.add_tasks([task.to_dict() for task in added])
+            self._after_write()
+
+        return len(added), errors
+
+    @_writes
     def delete_task(self, task_name):
         task = self.get_task_by_name(task_name)
 
         if not task:
             return False, f"Task '{task_name}' not found."
 
-        self.tasks.remove(task)
+        self.store.remove(task.name)
+        self.graph.remove(task.name)
+        self.storage.delete_task(task.name)
+        self._after_write()
 
-        if not self.tasks:
-            with open(self.TASK_FILE, "w", newline="") as file:
-                writer = csv.DictWriter(
-                    file,
-                    fieldnames=task.to_dict().keys()
-                )
-                writer.writeheader()
+        if not self.store:
             return True, f"Task '{task_name}' deleted. No tasks remaining."
 
-        self.save_tasks()
         return True, f"Task '{task_name}' deleted successfully."
 
     def get_task_by_name(self, name):
-        for task in self.tasks:
-            if task.name.lower() == name.lower():
-                return task
-        return None
+        return self.store.get(name)
 
     def get_all_tasks(self):
         return self.tasks
 
+    def query_tasks(self, **filters):
+        """
+        Indexed task query, e.g. query_tasks(not_status="completed", due_to=...).
+        See TaskStore.query for the supported filters.
+        """
+        return self.store.query(**filters)
+
+    def tasks_due_within(self, days):
+        """Not-completed tasks due between today and today + days."""
+        return self.store.due_within(days)
+
     def get_todays_pomodoro_count(self):
-        today = date.today().isoformat()
-        if not os.path.exists(self.POMODORO_FILE):
-            return 0
-
-        total = 0
-        with open(self.POMODORO_FILE, "r", newline="") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                if (row.get("date") or "").strip() == today:
-                    try:
-                        total += int(row.get("pomodoros", 0))
-                    except ValueError:
-                        pass
-        return total
+        today = date.today()
+        return sum(self.storage.day_totals(today, today).get(today.isoformat(), {}).values())
 
+    def pomodoro_history(self, start, end):
+        """
+        Stream pomodoro log rows dated start..end (inclusive) as
+        {"date", "category", "pomodoros"} dicts, oldest first.
+        """
+        return self.storage.iter_log_range(start, end)
 
+    @_writes
     def log_pomodoro(self, task_name):
         task = self.get_task_by_name(task_name)
         if not task:
             return False, "Task not found."
 
+        old_status = task.status
         task.add_pomodoro()
-        self.save_tasks()
-
-        file_exists = os.path.exists(self.POMODORO_FILE)
-
-        with open(self.POMODORO_FILE, "a", newline="") as file:
-            writer = csv.DictWriter(file, fieldnames=["date", "category", "pomodoros"])
-            if not file_exists:
-                writer.writeheader()
-
-            writer.writerow({
-                "date": date.today().isoformat(),
-                "category": task.category.lower(),
-                "pomodoros": 1
-            })
+        self.store.update_status(task, old_status)
+        if task.is_completed() and old_status != "completed":
+            self.graph.mark_completed(task.name)
+
+        self.storage.log_pomodoro(
+            task.to_dict(),
+            task.status != old_status,
+            date.today().isoformat(),
+            task.category.lower(),
+        )
+        self._after_write()
 
         return True, "Pomodoro recorded successfully."
 
-
-    def priority_level(self, task):
+    @_writes
+    def log_pomodoros(self, rows):
         """
-        Convert numeric priority_score into High / Medium / Low
+        Bulk log_pomodoro, e.g. for backfilling history. Each row is a dict
+        with an optional date (default today, never in the future) and
+        pomodoros count (default 1), plus either a task_name, whose progress
+        is updated as in log_pomodoro, or just a category for history that
+        belongs to no current task.
+
+        All accepted rows are committed with one storage write. Returns
+        (logged, errors) where errors is a list of (row_number, message).
         """
-        if task.priority_score >= 7:
-            return "High"
-        elif task.priority_score >= 4:
-            return "Medium"
-        else:
-            return "Low"
+        today = date.today()
+        touched = {}
+        entries = []
+        errors = []
 
+        for number, row in enumerate(rows, 1):
+            if not isinstance(row, dict):
+                errors.append((number, "Malformed row."))
+                continue
 
-    def calculate_priorities(self, weights=None):
-        weights = weights or {"urgency": 0.4, "importance": 0.4, "effort": 0.2}
-        today = date.today()
+            name = str(row.get("task_name") or row.get("task") or "").strip()
+            day = str(row.get("date") or "").strip() or today.isoformat()
 
-        for task in self.tasks:
+            try:
+                if date.fromisoformat(day) > today:
+                    errors.append((number, "Date cannot be in the future."))
+                    continue
+            except ValueError:
+                errors.append((number, "Invalid date format. Use YYYY-MM-DD."))
+                continue
+
+            # Only a missing or blank count defaults to 1; 0 is rejected.
+            count = row.get("pomodoros")
+            try:
+                count = 1 if count is None or str(count).strip() == "" else whole_number(count)
+            except ValueError:
+                count = 0
+            if count < 1:
+                errors.append((number, "Pomodoros must be a whole number (1 or more)."))
+                continue
 
-            if task.due_date:
-                days_until_due = (datetime.fromisoformat(task   .due_date).date() - today).days
-                urgency_score = max(0, 10 - days_until_due)
+            if name:
+                task = self.get_task_by_name(name)
+                if not task:
+                    errors.append((number, f"Task '{name}' not found."))
+                    continue
+                touched.setdefault(id(task), (task, task.status))
+                for _ in range(count):
+                    task.add_pomodoro()
+                category = task.category.lower()
             else:
-                urgency_score = 0
+                category = str(row.get("category") or "").strip().lower()
+                if not category:
+                    errors.append((number, "Row needs a task_name or a category."))
+                    continue
+
+            entries.append((day, category, count))
+
+        updates = []
+        for task, old_status in touched.values():
+            self.store.update_status(task, old_status)
+            if task.is_completed() and old_status != "completed":
+                self.graph.mark_completed(task.name)
+            updates.append((task.to_dict(), task.status != old_status))
 
-            importance_mapping = {"exam": 10, "assignment": 8, "reading": 4, "other": 2}
-            importance_score = importance_mapping.get(task.category.lower(), 5)
+        if entries:
+            self.storage.log_pomodoros(updates, entries)
+            self._after_write()
 
-            effort_score = task.estimated_pomodoros
+        return len(entries), errors
 
-            task.priority_score = (
-                weights["urgency"] * urgency_score +
-                weights["importance"] * importance_score +
-                weights["effort"] * effort_score
-            )
+
+    def priority_level(self, task):
+        """
+        Convert numeric priority_score into High / Medium / Low
+        """
+        return priority_label(task.priority_score)
+
+
+    def calculate_priorities(self, weights=None):
+        columns = self.store.columns
+        for task, score in zip(columns.tasks, score_columns(columns, weights)):
+            task.priority_score = score
 
     def can_schedule(self, task):
         """Return True if all dependencies are completed."""
-        for dep_name in task.dependencies:
-            dep_task = self.get_task_by_name(dep_name)
-            if dep_task is None or not dep_task.is_completed():
-                return False
-        return True
+        return self.graph.unmet_count(task.name) == 0
+
+    def dependency_cycles(self):
+        """Groups of task names stuck in a dependency loop (e.g. from a hand-edited CSV)."""
+        return self.graph.cycles()
     
+    def _cached_schedule(self, key, compute):
+        """
+        compute() memoized under key + (version, today) in a small LRU.
+        Cached schedules are shared between callers; treat them as read-only.
+        """
+        key = key + (self.version, date.today().toordinal())
+        schedule = self._schedules.get(key)
+        if schedule is not None:
+            self._schedules.move_to_end(key)
+            self.schedule_cache_hits += 1
+            return schedule
+
+        self.schedule_cache_misses += 1
+        schedule = self._schedules[key] = compute()
+        if len(self._schedules) > self.SCHEDULE_CACHE_SIZE:
+            self._schedules.popitem(last=False)
+        return schedule
+
+    def clear_schedule_cache(self):
+        self._schedules.clear()
+
     def generate_daily_schedule(self, available_hours):
         """
         Non-overlapping daily schedule.
         Each pomodoro block = 0.5 hours (30 mins) in schedule view.
+        available_hours is a list of (start, end) hours or an
+        AvailabilityCalendar. Repeated calls with no task changes in between
+        return the cached result.
         """
-        self.calculate_priorities()
-
-        schedule = []
-        tasks = sorted(self.tasks, key=lambda t: t.priority_score, reverse=True)
-
-        timeline = []
-        for start, end in available_hours:
-            hour = float(start)
-            while hour + 0.5 <= float(end):
-                timeline.append((hour, hour + 0.5))
-                hour += 0.5
-
-        slot_index = 0 
+        today = date.today()
+        calendar = _calendar(available_hours, today.isoformat())
+        key = ("daily", calendar.key(today, 1))
+        return self._cached_schedule(key, lambda: self._daily_schedule(calendar))
 
-        for task in tasks:
-            if task.is_completed():
-                continue
-            if not self.can_schedule(task):
-                continue
+    def _daily_schedule(self, calendar):
+        pending, days, _ = self._daily_inputs(calendar)
+        for _, schedule in schedule_days(pending, days, self.graph, release_dependents=False):
+            return schedule
 
-            remaining = task.estimated_pomodoros - task.completed_pomodoros
-            if remaining <= 0:
-                continue
+    def generate_weekly_schedule(self, days_available, decay_per_day=0.1, horizon_days=7):
+        """
+        horizon_days-day schedule starting today (a week by default).
+        Remaining pomodoros carry over from day to day, and a task becomes
+        schedulable from the next free slot (later the same day, if any are
+        left) once its prerequisites are fully booked.
+
+        days_available is {day_key: hours}, an AvailabilityCalendar or an
+        hours list for every day. Cached like the daily schedule; for long
+        horizons iter_schedule streams the days instead.
+        """
+        calendar = _calendar(days_available, None)
+        key = ("weekly", calendar.key(date.today(), horizon_days), float(decay_per_day))
+        return self._cached_schedule(key, lambda: dict(self.iter_schedule(calendar, horizon_days, decay_per_day)))
 
-            while remaining > 0 and slot_index < len(timeline):
-                start, end = timeline[slot_index]
-                schedule.append({
-                    "task": task.name,
-                    "start": start,
-                    "end": end,
-                    "priority": self.priority_level(task),
-                    "category": task.category.lower()
-                })
-                slot_index += 1
-                remaining -= 1
-
-            if slot_index >= len(timeline):
-                break
+    def iter_schedule(self, days_available, horizon_days=7, decay_per_day=0.1):
+        """
+        generate_weekly_schedule as a generator of (day_key, entries), each
+        day yielded as soon as it is planned, for streaming semester-long
+        plans to a file or client. Memory does not grow with horizon_days
+        and time grows linearly with it. Task changes made while iterating
+        are not seen; results are not cached.
+        """
+        calendar = _calendar(days_available, None)
+        pending = self._schedule_candidates(True)
+        days = calendar.days(date.today(), horizon_days, SLOT_MINUTES)
+        return schedule_days(pending, days, self.graph, decay_per_day)
 
-        return schedule
+    def optimize_weekly_schedule(self, days_available, decay_per_day=0.1, time_budget=0.5, horizon_days=7):
+        """
+        Like generate_weekly_schedule, but searches (for up to time_budget
+        seconds) for a plan with less weighted lateness against due dates;
+        see optimizer.py. Returns (schedule, stats) where stats compares the
+        result with the greedy plan.
+        """
+        pending, days, _ = self._weekly_inputs(days_available, horizon_days)
+        greedy = self.generate_weekly_schedule(days_available, decay_per_day, horizon_days)
+        return optimize_schedule(pending, days, self.graph, date.today().toordinal(), decay_per_day, time_budget, greedy)
 
-    def generate_weekly_schedule(self, days_available, decay_per_day=0.1):
-        weekly_schedule = {}
+    def optimize_daily_schedule(self, available_hours, time_budget=0.2, horizon_days=7):
+        """
+        Today's part of an optimized plan over horizon_days days with the
+        same available hours each day, so deadlines after today count too.
+        Returns (schedule, stats).
+        """
         today = date.today()
-        end_day = today + timedelta(days=6)
-
+        if not isinstance(available_hours, AvailabilityCalendar):
+            available_hours = AvailabilityCalendar.every_day(available_hours)
+        days = list(available_hours.days(today, horizon_days, SLOT_MINUTES))
+        pending = self._schedule_candidates(True)
+        plan, stats = optimize_schedule(pending, days, self.graph, today.toordinal(), 0.0, time_budget)
+        return plan[today.isoformat()], stats
+
+    def _schedule_candidates(self, exclude_overdue):
         self.calculate_priorities()
-        base_scores = {t.name: t.priority_score for t in self.tasks}
-
-        window_days = {}
-        for i in range(7):
-            d = today + timedelta(days=i)
-            key = d.isoformat()
-            window_days[key] = days_available.get(key, []) 
-
-
-        for idx, day_str in enumerate(sorted(window_days.keys())):
-            current_day = date.fromisoformat(day_str)
-
-            if current_day < today or current_day > end_day:
-                weekly_schedule[day_str] = []
-                continue
-
-            for t in self.tasks:
-                t.priority_score = max(0, base_scores.get(t.name, 0) * (1 - decay_per_day * idx))
-
-            timeline = []
-            for start, end in window_days[day_str]:
-                hour = float(start)
-                while hour + 0.5 <= float(end):
-                    timeline.append((hour, hour + 0.5))
-                    hour += 0.5
-
-            slot_index = 0
-            day_schedule = []
-            tasks = sorted(self.tasks, key=lambda t: t.priority_score, reverse=True)
-
-            for task in tasks:
-                try:
-                    due = date.fromisoformat(task.due_date)
-                    if due < today:
-                        continue
-                except Exception:
-                    pass
-
-                if task.is_completed():
-                    continue
-                if not self.can_schedule(task):
-                    continue
-
-                remaining = task.estimated_pomodoros - task.completed_pomodoros
-                if remaining <= 0:
-                    continue
-
-                while remaining > 0 and slot_index < len(timeline):
-                    start, end = timeline[slot_index]
-                    day_schedule.append({
-                        "task": task.name,
-                        "start": start,
-                        "end": end,
-                        "priority": self.priority_level(task),
-                        "category": task.category.lower()
-                    })
-                    slot_index += 1
-                    remaining -= 1
+        pending = self.store.query(not_status="completed")
+        if not exclude_overdue:
+            return pending
+        today_ordinal = date.today().toordinal()
+        return [task for task in pending if task.due_ordinal is None or task.due_ordinal >= today_ordinal]
 
-                if slot_index >= len(timeline):
-                    break
-
-            weekly_schedule[day_str] = day_schedule
+    def _daily_inputs(self, available_hours):
+        today = date.today()
+        calendar = _calendar(available_hours, today.isoformat())
+        return self._schedule_candidates(False), list(calendar.days(today, 1, SLOT_MINUTES)), calendar
 
-        for t in self.tasks:
-            t.priority_score = base_scores.get(t.name, t.priority_score)
+    def _weekly_inputs(self, days_available, horizon_days=7):
+        calendar = _calendar(days_available, None)
+        return self._schedule_candidates(True), list(calendar.days(date.today(), horizon_days, SLOT_MINUTES)), calendar
 
-        return weekly_schedule
+    def plan_daily_schedule(self, available_hours):
+        """
+        generate_daily_schedule as a SchedulePlan that reschedule() can
+        patch; plan.schedule()[0][1] is the day's schedule.
+        """
+        # An hours list applies to every day, so the plan can move to a later date.
+        pending, days, calendar = self._daily_inputs(_calendar(available_hours, None))
+        plan = SchedulePlan(pending, days, self.graph, release_dependents=False)
+        return self._new_plan(plan, False, calendar)
+
+    def plan_weekly_schedule(self, days_available, decay_per_day=0.1, horizon_days=7):
+        """generate_weekly_schedule as a SchedulePlan; dict(plan.schedule()) is the schedule."""
+        pending, days, calendar = self._weekly_inputs(days_available, horizon_days)
+        return self._new_plan(SchedulePlan(pending, days, self.graph, decay_per_day), True, calendar)
+
+    def _new_plan(self, plan, exclude_overdue, calendar):
+        # Scores (and overdue tasks) depend on the date the plan was made.
+        plan.made_on = date.today()
+        plan.exclude_overdue = exclude_overdue
+        # The plan's own copy: "unavailable" events book time out of it.
+        plan.calendar = calendar.copy()
+        return plan
+
+    def reschedule(self, plan, event):
+        """
+        Update plan after a change, re-planning only from the first day the
+        change can affect, and return the keys of the recomputed days. event
+        is one of:
+
+            ("pomodoro", task_name)               after log_pomodoro
+            ("add", task_name)                    after add_task
+            ("delete", task_name)                 after delete_task
+            ("unavailable", day_key, start, end)  hours no longer free
+
+        The plan then equals a freshly generated one. Changes that alter
+        which tasks are ready from the start (a task with dependents being
+        completed or deleted) are re-planned in full, as is a plan made on
+        an earlier date, whose days are moved to start today. Days outside
+        the plan's horizon are ignored.
+        """
+        kind = event[0]
+        changed = None
+        if plan.made_on == date.today():
+            if kind == "pomodoro":
+                task = self.get_task_by_name(event[1])
+                changed = plan.pomodoro_logged(task) if task else []
+            elif kind == "add":
+                task = self.get_task_by_name(event[1])
+                if task is None or (plan.exclude_overdue and task.due_ordinal is not None and task.due_ordinal < date.today().toordinal()):
+                    changed = []
+                else:
+                    task.priority_score = score_task(task)
+                    changed = plan.task_added(task)
+            elif kind == "delete":
+                changed = plan.task_deleted(event[1])
+            elif kind == "unavailable":
+                changed = self._block_out(plan, *event[1:])
+            else:
+                raise ValueError(f"Unknown schedule event '{kind}'.")
 
+        if changed is None:
+            today = date.today()
+            days = None
+            if plan.made_on != today:
+                if kind == "unavailable":
+                    plan.calendar.subtract(*event[1:])
+                days = list(plan.calendar.days(today, len(plan.day_keys), SLOT_MINUTES))
+            plan.reset(self._schedule_candidates(plan.exclude_overdue), days)
+            plan.made_on = today
+            changed = list(plan.day_keys)
+        return changed
+
+    def _block_out(self, plan, day_key, start, end):
+        plan.calendar.subtract(day_key, start, end)
+        return plan.set_slots(day_key, plan.calendar.slots(day_key, SLOT_MINUTES))
 
     def weekly_summary(self):
         end_date = date.today()
@@ -357,37 +744,12 @@ class TaskManager:
             "other": 0
         }
 
-        try:
-            with open("count_pomodoro.csv", "r", newline="") as f:
-                reader = csv.DictReader(f)
-
-                for row in reader:
-                    try:
-                        log_date = date.fromisoformat(row["date"])
-                    except Exception:
-                        continue
-
-                    if log_date > end_date:
-                        continue
-
-                    if log_date < start_date:
-                        continue
-
-                    category = row.get("category", "other").strip().lower()
-
-                    try:
-                        pomodoros = int(row.get("pomodoros", 0))
-                    except ValueError:
-                        pomodoros = 0
-
-                    if category not in by_category:
-                        category = "other"
-
-                    per_day[log_date.isoformat()] += pomodoros
-                    by_category[category] += pomodoros
-
-        except FileNotFoundError:
-            pass
+        for day_str, categories in self.storage.day_totals(start_date, end_date).items():
+            for category, pomodoros in categories.items():
+                if category not in by_category:
+                    category = "other"
+                per_day[day_str] += pomodoros
+                by_category[category] += pomodoros
 
         total = sum(per_day.values())
 
@@ -0,0 +1,167 @@
+import bisect
+from datetime import date, timedelta
+
+from scoring import TaskColumns
+
+
+def name_key(name):
+    return name.casefold()
+
+
+class TaskStore:
+    """
+    In-memory task collection used by TaskManager.
+
+    Tasks are kept in insertion order in a case-folded name map, with
+    secondary indexes by category, status and due date so that lookups and
+    filtered queries do not have to walk every task.
+    """
+
+    def __init__(self):
+        self._by_name = {}
+        self._by_category = {}
+        self._by_status = {}
+        self._by_due = []
+        self.columns = TaskColumns()
+
+    def __len__(self):
+        return len(self._by_name)
+
+    def __iter__(self):
+        return iter(self._by_name.values())
+
+    def __contains__(self, name):
+        return name_key(name) in self._by_name
+
+    def all(self):
+        return list(self._by_name.values())
+
+    def get(self, name):
+        return self._by_name.get(name_key(name))
+
+    def add(self, task):
+        key = name_key(task.name)
+        if key in self._by_name:
+            raise KeyError(f"Task '{task.name}' already exists!")
+
+        self._index(key, task)
+        bisect.insort(self._by_due, (task.due_ordinal or 0, key))
+
+    def add_many(self, tasks):
+        """
+        Bulk add for loading: tasks whose name is already present are
+        skipped (the first one wins) and the due index is sorted once at
+        the end instead of insorted per task. Returns the tasks added.
+        """
+        added = []
+        for task in tasks:
+            key = name_key(task.name)
+            if key in self._by_name:
+                continue
+            self._index(key, task)
+            self._by_due.append((task.due_ordinal or 0, key))
+            added.append(task)
+        self._by_due.sort()
+        return added
+
+    def _index(self, key, task):
+        self._by_name[key] = task
+        self._by_category.setdefault(task.category.lower(), {})[key] = None
+        self._by_status.setdefault(task.status, {})[key] = None
+        self.columns.append(key, task)
+
+    def remove(self, name):
+        key = name_key(name)
+        task = self._by_name.pop(key, None)
+        if task is None:
+            return None
+
+        self._discard(self._by_category, task.category.lower(), key)
+        self._discard(self._by_status, task.status, key)
+
+        entry = (task.due_ordinal or 0, key)
+        i = bisect.bisect_left(self._by_due, entry)
+        if i < len(self._by_due) and self._by_due[i] == entry:
+            del self._by_due[i]
+        self.columns.remove(key)
+        return task
+
+    def update_status(self, task, old_status):
+        """Move a task between status buckets after its status changed."""
+        if task.status == old_status:
+            return
+        key = name_key(task.name)
+        self._discard(self._by_status, old_status, key)
+        self._by_status.setdefault(task.status, {})[key] = None
+
+    def statuses(self):
+        return list(self._by_status.keys())
+
+    def query(self, category=None, status=None, not_status=None, due_from=None, due_to=None):
+        """
+        Return tasks matching every given filter.
+
+        category / status match exactly (category is case-insensitive),
+        not_status excludes one status, due_from / due_to bound the due date
+        (inclusive, date, ISO string or ordinal). Results follow due-date order when a
+        due bound is given, otherwise insertion order.
+        """
+        if due_from is not None or due_to is not None:
+            lo = _ordinal(due_from) if due_from is not None else 0
+            keys = self._due_range(lo, _ordinal(due_to) if due_to is not None else None)
+        elif category is not None:
+            keys = self._by_category.get(category.lower(), {})
+        elif status is not None:
+            keys = self._by_status.get(status, {})
+        elif not_status is not None:
+            excluded = self._by_status.get(not_status, {})
+            keys = (k for k in self._by_name if k not in excluded)
+        else:
+            keys = self._by_name
+
+        results = []
+        for key in keys:
+            task = self._by_name[key]
+            if category is not None and task.category.lower() != category.lower():
+                continue
+            if status is not None and task.status != status:
+                continue
+            if not_status is not None and task.status == not_status:
+                continue
+            results.append(task)
+        return results
+
+    def due_within(self, days, today=None, not_status="completed"):
+        """Tasks due between today and today + days, skipping not_status."""
+        today = today or date.today()
+        return self.query(
+            not_status=not_status,
+            due_from=today,
+            due_to=today + timedelta(days=days),
+        )
+
+    def _due_range(self, lo, hi):
+        start = bisect.bisect_left(self._by_due, (lo, ""))
+        for i in range(start, len(self._by_due)):
+            due, key = self._by_due[i]
+            if hi is not None and due > hi:
+                break
+            if due:
+                yield key
+
+    @staticmethod
+    def _discard(index, bucket, key):
+        members = index.get(bucket)
+        if members is None:
+            return
+        members.pop(key, None)
+        if not members:
+            del index[bucket]
+
+
+def _ordinal(value):
+    if isinstance(value, int):
+        return value
+    if isinstance(value, date):
+        return value.toordinal()
+    return date.fromisoformat(value).toordinal()
@@ -1,38 +1,174 @@
+import asyncio
+import threading
 import time
 
+
+def format_seconds(seconds):
+    minutes, secs = divmod(int(round(seconds)), 60)
+    return f"{minutes:02d}:{secs:02d}"
+
+
 class PomodoroTimer:
+    """
+    Pomodoro/break countdown driven by a time.monotonic() deadline.
+
+    countdown() is a coroutine that sleeps until the deadline (or until
+    pause/resume/reset changes it) instead of ticking once per second, so it
+    does not drift and does not wake up when nothing is shown. The blocking
+    CLI uses start()/complete(), which run sessions on a background event
+    loop thread and return immediately; async callers can await
+    countdown() on their own loop.
+    """
+
     WORK_TIME = 25 * 60
-    BREAK_TIME = 25 * 60
+    BREAK_TIME = 5 * 60
 
-    def __init__(self):
+    def __init__(self, show_countdown=False):
         self.running = False
+        self.paused = False
         self.remaining_time = 0
+        self.label = None
+        self.show_countdown = show_countdown
+        self._deadline = None
+        self._changed = None
+        self._cancelled = False
+        self._loop = None
+        self._thread = None
+        self._future = None
 
-    def countdown(self, seconds):
-        while seconds > 0 and self.running:
-            minutes, secs = divmod(seconds, 60)
-            print(f"{minutes:02d}:{secs:02d}", end="\r")
-            time.sleep(1)
-            seconds -= 1
-
-    def start(self):
+    async def countdown(self, seconds, label="Pomodoro"):
+        """Return True when the countdown runs out, False if reset() stopped it."""
+        self._changed = asyncio.Event()
+        self._cancelled = False
+        self.label = label
+        self.remaining_time = seconds
+        self._deadline = time.monotonic() + seconds
         self.running = True
+        self.paused = False
+
+        try:
+            while not self._cancelled:
+                timeout = None
+                if self.running:
+                    left = self._deadline - time.monotonic()
+                    if left <= 0:
+                        self.remaining_time = 0
+                        return True
+                    timeout = left
+                    if self.show_countdown:
+                        print(format_seconds(left), end="\r")
+                        timeout = min(left, (left % 1) or 1.0)
+
+                self._changed.clear()
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+            return False
+        finally:
+            self.running = False
+            self.paused = False
+            self.label = None
+
+    def _notify(self):
+        if self._changed is not None:
+            self._changed.set()
+
+    def _pause(self):
+        if self.running:
+            self.remaining_time = max(0, self._deadline - time.monotonic())
+            self.running = False
+            self.paused = True
+            self._notify()
+
+    def _resume(self):
+        if self.paused:
+            self._deadline = time.monotonic() + self.remaining_time
+            self.running = True
+            self.paused = False
+            self._notify()
+
+    def _reset(self):
+        self._cancelled = True
+        self.remaining_time = 0
+        self._notify()
+
+    def _call(self, fn):
+        # State lives on the timer's loop; hop onto it when called from the CLI thread.
+        if self._loop is not None and threading.current_thread() is not self._thread:
+            self._loop.call_soon_threadsafe(fn)
+        else:
+            fn()
+
+    def remaining(self):
+        if self.running:
+            return max(0.0, self._deadline - time.monotonic())
+        return self.remaining_time
+
+    def is_active(self):
+        return self._future is not None and not self._future.done()
+
+    def _ensure_loop(self):
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._loop.run_forever, name="pomodoro-timer", daemon=True)
+            self._thread.start()
+
+    def _run(self, coro):
+        self._ensure_loop()
+        self._future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        return self._future
+
+    def start(self, on_complete=None):
+        """
+        Start a work session in the background. Returns a
+        concurrent.futures.Future resolving to True when the session ends
+        (False if reset). on_complete runs on the timer thread.
+        """
+        if self.is_active():
+            print("A session is already running.")
+            return self._future
+
         print("Pomodoro started (25 minutes)")
-        self.countdown(self.WORK_TIME)
+        return self._run(self._session(self.WORK_TIME, "Pomodoro", "\nPomodoro completed", on_complete))
+
+    def complete(self):
+        """Start the break in the background."""
+        if self.is_active():
+            print("A session is already running.")
+            return self._future
+
+        print("Break time (5 minutes)")
+        return self._run(self._session(self.BREAK_TIME, "Break", "\nBreak done, Go for the next Pomodoro?"))
+
+    async def _session(self, seconds, label, done_message, on_complete=None):
+        finished = await self.countdown(seconds, label)
+        if finished:
+            print(done_message)
+            if on_complete:
+                on_complete()
+        return finished
+
+    def wait(self, timeout=None):
+        """Block until the current session ends; returns its result."""
+        if self._future is None:
+            return False
+        return self._future.result(timeout)
 
     def pause(self):
-        self.running = False
+        self._call(self._pause)
         print("Pomodoro paused")
 
+    def resume(self):
+        self._call(self._resume)
+        print("Pomodoro resumed")
+
     def reset(self):
-        self.running = False
-        self.remaining_time = 0
+        self._call(self._reset)
         print("Pomodoro reset")
 
-    def complete(self):
-        print("Pomodoro completed")
-        print("Break time (5 minutes)")
-        self.countdown(self.BREAK_TIME)
-        print("Break done, Go for the next Pomodoro?")
-
-    
\ No newline at end of file
+    def status(self):
+        if not self.is_active():
+            return "No session running."
+        state = "paused" if self.paused else "running"
+        return f"{self.label or 'Session'} {state}: {format_seconds(self.remaining())} left"
@@ -1,5 +1,21 @@
+import contextlib
+import csv
+import io
+import json
 import os
+import random
+import shutil
+import tempfile
 from datetime import date, timedelta
+import scoring
+import stress_test
+import task as task_module
+from availability import AvailabilityCalendar
+from binlog import HEADER_SIZE, RECORD, BinaryPomodoroLog, binary_to_csv, csv_to_binary
+from bulk_import import read_rows
+from pomodoro_log import PomodoroLogReader
+from scoring import load_numpy
+from storage import migrate_csv_to_sqlite
 from task import TaskManager
 
 
@@ -11,6 +27,13 @@ def test_backend():
         os.remove("tasks.csv")
     if os.path.exists("count_pomodoro.csv"):
         os.remove("count_pomodoro.csv")
+    if os.path.exists("tasks.journal"):
+        os.remove("tasks.journal")
+    if os.path.exists("count_pomodoro.rollup.json"):
+        os.remove("count_pomodoro.rollup.json")
+    shutil.rmtree("count_pomodoro.rollup.d", ignore_errors=True)
+    if os.path.exists("count_pomodoro.idx.json"):
+        os.remove("count_pomodoro.idx.json")
 
     manager = TaskManager()
 
@@ -82,6 +105,15 @@ def test_backend():
     assert isinstance(weekly_schedule, dict)
     print("✓ Weekly schedule generated")
 
+    # Incremental Rescheduling
+
+    plan = new_manager.plan_weekly_schedule(weekly_availability)
+    new_manager.log_pomodoro("Research Reading")
+    new_manager.reschedule(plan, ("pomodoro", "Research Reading"))
+    new_manager.clear_schedule_cache()
+    assert dict(plan.schedule()) == new_manager.generate_weekly_schedule(weekly_availability)
+    print("✓ Incremental reschedule matches full regeneration")
+
     # Delete Task
 
     success, _ = new_manager.delete_task("Random Task")
@@ -90,6 +122,574 @@ def test_backend():
 
     print("\nALL EXTENDED BACKEND TESTS PASSED!")
 
+def _cut(intervals, start, end):
+    """intervals with start..end removed."""
+    kept = []
+    for a, b in intervals:
+        if b <= start or a >= end:
+            kept.append((a, b))
+            continue
+        if a < start:
+            kept.append((a, start))
+        if b > end:
+            kept.append((end, b))
+    return kept
+
+
+def _random_reschedules(seed, task_count=30, steps=60):
+    """
+    Apply random pomodoro / add / delete / unavailable events to a daily
+    and a weekly SchedulePlan, now and then a day later, and check after
+    each one that they match a full regeneration on the changed tasks and
+    hours.
+    """
+    rng = random.Random(seed)
+    decay = rng.choice([0.0, 0.1, 0.3, 0.5])
+    categories = ["study", "exam", "assignment", "reading", "other"]
+    today = date.today()
+
+    with tempfile.TemporaryDirectory() as data_root:
+        manager = TaskManager(data_root=data_root)
+        names = []
+
+        def add():
+            name = f"T{len(names)}-{rng.randrange(10 ** 6)}"
+            dependencies = rng.sample(names, min(len(names), rng.choice([0, 0, 0, 1, 2])))
+            due = (today + timedelta(days=rng.randint(0, 15))).isoformat()
+            success, _ = manager.add_task(name, rng.choice(categories), rng.randint(1, 8), due, dependencies=dependencies)
+            if success:
+                names.append(name)
+            return success, name
+
+        for _ in range(task_count):
+            add()
+
+        hours = [(9, 12), (13, 17)]
+        # Hours blocked out of the daily plan, per day: they stay blocked
+        # when the plan moves to that day.
+        daily_hours = {}
+        week = {(today + timedelta(days=i)).isoformat(): [(9, rng.choice([11, 13, 15]))] for i in range(7)}
+        daily = manager.plan_daily_schedule(hours)
+        weekly = manager.plan_weekly_schedule(week, decay)
+        shift = 0
+
+        def check(event):
+            day_hours = daily_hours.get((today + timedelta(days=shift)).isoformat(), hours)
+            assert daily.schedule()[0][1] == manager.generate_daily_schedule(day_hours), (seed, event, "daily")
+            assert dict(weekly.schedule()) == manager.generate_weekly_schedule(week, decay), (seed, event, "weekly")
+
+        try:
+            check("initial")
+            for _ in range(steps):
+                if shift < 3 and rng.random() < 0.05:
+                    # Midnight passes; the next event sees the new date.
+                    shift += 1
+                    _shift_today(shift)
+                roll = rng.random()
+                live = [task.name for task in manager.get_all_tasks()]
+                if roll < 0.5 and live:
+                    name = rng.choice(live)
+                    manager.log_pomodoro(name)
+                    event = ("pomodoro", name)
+                elif roll < 0.7:
+                    success, name = add()
+                    if not success:
+                        continue
+                    event = ("add", name)
+                elif roll < 0.85 and live:
+                    name = rng.choice(live)
+                    manager.delete_task(name)
+                    event = ("delete", name)
+                else:
+                    day = rng.choice(sorted(week))
+                    start = rng.choice([9, 9.5, 10, 13, 14])
+                    end = start + rng.choice([0.5, 1, 2])
+                    event = ("unavailable", day, start, end)
+                    week[day] = _cut(week[day], start, end)
+                    daily_hours[day] = _cut(daily_hours.get(day, hours), start, end)
+
+                # Days outside a plan's horizon leave it unchanged.
+                manager.reschedule(daily, event)
+                manager.reschedule(weekly, event)
+                check(event)
+        finally:
+            _shift_today(0)
+            manager.close()
+
+
+def _shift_today(days):
+    """Make task.py and scoring.py see date.today() as days from now (0 restores it)."""
+    class ShiftedDate(date):
+        @classmethod
+        def today(cls):
+            return date.today() + timedelta(days=days)
+
+    for module in (task_module, scoring):
+        module.date = ShiftedDate if days else date
+
+
+def test_incremental_reschedule(seeds=40):
+    print("\nTesting incremental rescheduling against full regeneration...")
+    for seed in range(seeds):
+        _random_reschedules(seed)
+    print(f"✓ {seeds} random task sets x 60 events: plans match full regeneration")
+
+
+def _task_rows(manager):
+    return {task.name: task.to_dict() for task in manager.get_all_tasks()}
+
+
+def _reloaded(data_root, backend=None):
+    """Task rows as a fresh TaskManager loads them from data_root."""
+    manager = TaskManager(backend=backend, data_root=data_root)
+    rows = _task_rows(manager)
+    manager.close()
+    return rows
+
+
+def test_journal_replay():
+    print("\nTesting the task journal...")
+    due = (date.today() + timedelta(days=5)).isoformat()
+    with tempfile.TemporaryDirectory() as data_root:
+        journal = os.path.join(data_root, TaskManager.JOURNAL_FILE)
+        task_file = os.path.join(data_root, TaskManager.TASK_FILE)
+
+        manager = TaskManager(data_root=data_root)
+        manager.add_task("Essay", "assignment", 3, due)
+        manager.add_task("Quiz", "exam", 1, due)
+        manager.add_task("Notes", "reading", 2, due, dependencies=["Quiz"])
+        manager.log_pomodoro("Essay")
+        manager.log_pomodoro("Quiz")
+        manager.delete_task("Notes")
+        expected = _task_rows(manager)
+        manager.close()
+        assert expected["Quiz"]["status"] == "completed" and "Notes" not in expected
+        assert not os.path.exists(task_file), "changes go to the journal, not tasks.csv"
+        assert _reloaded(data_root) == expected, "journal replay"
+
+        # A crash mid-append leaves a torn last line: it is ignored, cut
+        # off, and later appends start on a clean line.
+        with open(journal, "a", encoding="utf-8") as file:
+            file.write('{"op":"delete","name":"Ess')
+        assert _reloaded(data_root) == expected, "torn last line"
+        with open(journal, "rb") as file:
+            assert file.read().endswith(b"}\n")
+        manager = TaskManager(data_root=data_root)
+        manager.log_pomodoro("Essay")
+        expected = _task_rows(manager)
+        manager.close()
+        assert _reloaded(data_root) == expected
+
+        # A crash after the checkpoint replaced tasks.csv but before the
+        # journal was cleared: replaying it again over the checkpoint is
+        # harmless. A half-written temp file from a crash mid-save is ignored.
+        with open(journal, "rb") as file:
+            entries = file.read()
+        manager = TaskManager(data_root=data_root)
+        manager.save_tasks()
+        manager.close()
+        assert os.path.exists(task_file) and not os.path.exists(journal)
+        with open(journal, "wb") as file:
+            file.write(entries)
+        with open(task_file + ".tmp", "w") as file:
+            file.write("task_name,category\nEss")
+        assert _reloaded(data_root) == expected, "journal replayed over its own checkpoint"
+    print("✓ Journal replay, torn last line and checkpoint crash recover every task")
+
+
+def test_rollup_refresh():
+    print("\nTesting the pomodoro rollup...")
+    today = date.today()
+    old = today - timedelta(days=40)
+    due = (today + timedelta(days=5)).isoformat()
+    with tempfile.TemporaryDirectory() as data_root:
+        log_path = os.path.join(data_root, TaskManager.POMODORO_FILE)
+        state_path = os.path.join(data_root, TaskManager.ROLLUP_FILE)
+
+        def totals(day):
+            manager = TaskManager(data_root=data_root)
+            by_category = manager.storage.day_totals(day, day).get(day.isoformat(), {})
+            manager.close()
+            return by_category
+
+        manager = TaskManager(data_root=data_root)
+        manager.add_task("Essay", "assignment", 5, due)
+        manager.log_pomodoro("Essay")
+        manager.log_pomodoro("Essay")
+        assert manager.get_todays_pomodoro_count() == 2
+
+        # Rows appended by hand (or another process), one in an older month.
+        with open(log_path, "a", newline="") as file:
+            file.write(f"{today},study,3\n{old},exam,4\n")
+        assert manager.get_todays_pomodoro_count() == 5, "same instance sees the appended tail"
+        manager.close()
+        assert totals(today) == {"assignment": 2, "study": 3} and totals(old) == {"exam": 4}
+
+        # Rewritten in place with the same length: rebuilt, not folded.
+        with open(log_path, "r+b") as file:
+            data = file.read().replace(f"{today},study,3".encode(), f"{today},study,7".encode())
+            file.seek(0)
+            file.write(data)
+        assert totals(today) == {"assignment": 2, "study": 7}
+
+        # Replaced by a different file.
+        with open(log_path + ".new", "w", newline="") as file:
+            file.write(f"date,category,pomodoros\n{old},reading,1\n")
+        os.replace(log_path + ".new", log_path)
+        assert totals(today) == {} and totals(old) == {"reading": 1}
+
+        # A refresh that saved its month files but died before saving the
+        # state: the month is ahead of the state, so it is rebuilt rather
+        # than counted twice.
+        with open(state_path, "rb") as file:
+            state = file.read()
+        with open(log_path, "a", newline="") as file:
+            file.write(f"{old},reading,2\n")
+        assert totals(old) == {"reading": 3}
+        with open(state_path, "wb") as file:
+            file.write(state)
+        assert totals(old) == {"reading": 3}, "month ahead of the state"
+    print("✓ Rollup folds appended rows and rebuilds after a rewrite, replacement or crash")
+
+
+def test_dependency_graph():
+    print("\nTesting the dependency graph...")
+    due = (date.today() + timedelta(days=5)).isoformat()
+    with tempfile.TemporaryDirectory() as data_root:
+        manager = TaskManager(data_root=data_root)
+        graph = manager.graph
+
+        def ready():
+            return [task.name for task in graph.ready_tasks()]
+
+        assert manager.add_task("A", "study", 1, due)[0]
+        assert manager.add_task("B", "study", 2, due, dependencies=["A"])[0]
+        assert manager.add_task("C", "study", 2, due, dependencies=["B"])[0]
+        assert ready() == ["A"] and graph.unmet_count("B") == graph.unmet_count("C") == 1
+        assert manager.add_task("D", "study", 1, due, dependencies=["D"]) == (False, "Task 'D' cannot depend on itself.")
+        assert manager.add_task("D", "study", 1, due, dependencies=["Z"]) == (False, "Dependency 'Z' does not exist.")
+
+        # A deleted prerequisite stays unmet; adding it back on top of its
+        # own dependents would close a loop.
+        manager.delete_task("A")
+        assert ready() == [] and graph.unmet_count("B") == 1
+        assert manager.add_task("A", "study", 1, due, dependencies=["C"]) == (False, "Dependency cycle: A -> C -> B -> A")
+        assert manager.add_task("A", "study", 1, due)[0]
+        assert manager.add_task("D", "study", 1, due)[0]
+        assert ready() == ["A", "D"]
+
+        # Completing A releases B (appended to the ready set); C waits on B.
+        manager.log_pomodoro("A")
+        assert ready() == ["D", "B"] and graph.unmet_count("B") == 0 and graph.unmet_count("C") == 1
+        scheduled = {entry["task"] for entry in manager.generate_daily_schedule([(9, 17)])}
+        assert scheduled == {"B", "D"}, scheduled
+        manager.close()
+
+    # A loop hand-edited into tasks.csv is reported and never ready.
+    with tempfile.TemporaryDirectory() as data_root:
+        with open(os.path.join(data_root, "tasks.csv"), "w", newline="") as file:
+            file.write(
+                "task_name,category,estimated_pomodoros,completed_pomodoros,status,start_date,due_date,end_date,dependencies\n"
+                f"X,study,1,0,not started,,{due},,Y\nY,study,1,0,not started,,{due},,X\nZ,study,1,0,not started,,{due},,\n"
+            )
+        manager = TaskManager(data_root=data_root)
+        assert [sorted(group) for group in manager.dependency_cycles()] == [["X", "Y"]]
+        assert [task.name for task in manager.graph.ready_tasks()] == ["Z"]
+        manager.close()
+    print("✓ Bad and cyclic dependencies rejected; ready set follows completions")
+
+
+def test_bulk_import():
+    print("\nTesting bulk import...")
+    today = date.today()
+    due = (today + timedelta(days=5)).isoformat()
+    with tempfile.TemporaryDirectory() as data_root:
+        path = os.path.join(data_root, "tasks.jsonl")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(
+                f'{{"task_name": "Essay", "category": "assignment", "estimated_pomodoros": 3, "due_date": "{due}"}}\n'
+                "not json\n"
+                f'{{"task_name": "Draft", "estimated_pomodoros": "2", "due_date": "{due}", "dependencies": "Essay"}}\n'
+                f'{{"task_name": "", "estimated_pomodoros": 1, "due_date": "{due}"}}\n'
+                f'{{"task_name": "Half", "estimated_pomodoros": 2.5, "due_date": "{due}"}}\n'
+                f'{{"task_name": "Zero", "estimated_pomodoros": 0, "due_date": "{due}"}}\n'
+                '{"task_name": "Late", "estimated_pomodoros": 1, "due_date": "2000-01-01"}\n'
+                f'{{"task_name": "essay", "estimated_pomodoros": 1, "due_date": "{due}"}}\n'
+                f'{{"task_name": "Orphan", "estimated_pomodoros": 1, "due_date": "{due}", "dependencies": ["Nope"]}}\n'
+            )
+        manager = TaskManager(data_root=data_root)
+        added, errors = manager.add_tasks(read_rows(path))
+        assert added == 2, added
+        assert errors == [
+            (2, "Malformed row."),
+            (4, "Task name cannot be empty."),
+            (5, "Estimated pomodoros must be a whole number."),
+            (6, "Estimated pomodoros must be 1 or more."),
+            (7, "Due date must be today or later."),
+            (8, "Task 'essay' already exists!"),
+            (9, "Dependency 'Nope' does not exist."),
+        ], errors
+        assert manager.graph.unmet_count("Draft") == 1
+
+        logged, errors = manager.log_pomodoros([
+            {"task_name": "Essay", "pomodoros": 2},
+            {"task_name": "Essay", "pomodoros": 0},
+            {"task_name": "Essay", "pomodoros": "1.5"},
+            {"task_name": "Essay", "pomodoros": True},
+            {"task_name": "Essay", "date": (today + timedelta(days=1)).isoformat()},
+            {"task_name": "Essay", "date": "yesterday"},
+            {"task_name": "Nope"},
+            {"pomodoros": 1},
+            {"category": "reading", "date": (today - timedelta(days=1)).isoformat(), "pomodoros": 4},
+            {"task_name": "Essay", "pomodoros": " "},
+        ])
+        assert logged == 3, logged
+        count_error = "Pomodoros must be a whole number (1 or more)."
+        assert errors == [
+            (2, count_error),
+            (3, count_error),
+            (4, count_error),
+            (5, "Date cannot be in the future."),
+            (6, "Invalid date format. Use YYYY-MM-DD."),
+            (7, "Task 'Nope' not found."),
+            (8, "Row needs a task_name or a category."),
+        ], errors
+        essay = manager.get_task_by_name("Essay")
+        assert essay.completed_pomodoros == 3 and essay.is_completed()
+        assert manager.graph.unmet_count("Draft") == 0
+        assert manager.weekly_summary()["total"] == 7
+        manager.close()
+        assert _reloaded(data_root)["Essay"]["completed_pomodoros"] == 3
+    print("✓ Bulk rows are checked one by one and the good ones committed together")
+
+
+def test_log_reader():
+    print("\nTesting the indexed pomodoro log reader...")
+    days = [(date(2026, 1, 1) + timedelta(days=i)).isoformat() for i in range(10)]
+    with tempfile.TemporaryDirectory() as data_root:
+        log_path = os.path.join(data_root, "log.csv")
+        index_path = os.path.join(data_root, "log.idx.json")
+
+        def append(rows):
+            with open(log_path, "a", newline="") as file:
+                file.write("".join(f"{day},{category},{count}\n" for day, category, count in rows))
+
+        def expected(start, end):
+            with open(log_path, newline="") as file:
+                rows = [row for row in csv.DictReader(file) if start <= row["date"] <= end]
+            rows.sort(key=lambda row: row["date"])  # stable: file order within a day
+            return [(row["date"], row["category"], int(row["pomodoros"])) for row in rows]
+
+        def check(start, end, reader=None):
+            reader = reader or PomodoroLogReader(log_path, index_path)
+            got = [(row["date"], row["category"], row["pomodoros"]) for row in reader.iter_range(start, end)]
+            assert got == expected(start, end), (start, end, got)
+
+        with open(log_path, "w", newline="") as file:
+            file.write("date,category,pomodoros\n")
+        append((day, "study", i + 1) for i, day in enumerate(days[:6]))
+        reader = PomodoroLogReader(log_path, index_path)
+        check(days[1], days[3], reader)
+        check(days[7], days[9], reader)
+
+        # Appends continue the last day's run; a backfill starts a new run.
+        append([(days[5], "exam", 2), (days[6], "study", 1), (days[2], "reading", 4)])
+        check(days[0], days[9], reader)
+        check(days[2], days[2], reader)
+        assert len(reader.runs[days[5]]) == 1 and len(reader.runs[days[2]]) == 2
+        check(days[0], days[9])  # a fresh reader loads the saved index
+
+        # Rewritten in place (same size) and replaced by a shorter file.
+        with open(log_path, "r+b") as file:
+            data = file.read().replace(f"{days[3]},study,4".encode(), f"{days[8]},study,4".encode())
+            file.seek(0)
+            file.write(data)
+        check(days[0], days[9], reader)
+        with open(log_path, "w", newline="") as file:
+            file.write(f"date,category,pomodoros\n{days[4]},other,1\n")
+        check(days[0], days[9], reader)
+        assert reader.dates == [days[4]]
+    print("✓ Range reads match a full scan after appends, backfills, rewrites and replacement")
+
+
+def test_binary_log():
+    print("\nTesting the binary pomodoro log...")
+    rng = random.Random(7)
+    start = date(2024, 1, 1)
+    rows = [
+        ((start + timedelta(days=rng.randrange(900))).isoformat(), rng.choice(["study", "exam", "reading"]), rng.randint(1, 6))
+        for _ in range(500)
+    ]
+    with tempfile.TemporaryDirectory() as data_root:
+        csv_path = os.path.join(data_root, "log.csv")
+        bin_path = os.path.join(data_root, "log.bin")
+        with open(csv_path, "w", newline="") as file:
+            file.write("date,category,pomodoros\n")
+            file.write("".join(f"{day},{category},{count}\n" for day, category, count in rows))
+            file.write("not-a-date,study,1\n2024-02-01,study,x\n")
+
+        assert csv_to_binary(csv_path, bin_path) == (500, 2)
+        assert binary_to_csv(bin_path, csv_path + ".out") == 500
+        with open(csv_path + ".out", newline="") as file:
+            assert [(r["date"], r["category"], int(r["pomodoros"])) for r in csv.DictReader(file)] == rows
+
+        log = BinaryPomodoroLog(bin_path)
+        lo, hi = start + timedelta(days=100), start + timedelta(days=200)
+        expected = {}
+        for day, category, count in rows:
+            if lo.isoformat() <= day <= hi.isoformat():
+                by_category = expected.setdefault(day, {})
+                by_category[category] = by_category.get(category, 0) + count
+        assert log.day_totals(lo, hi) == expected
+        if load_numpy() is not None:
+            assert int(log.records()["count"].sum()) == sum(count for _, _, count in rows)
+        log.close()
+
+        # A crash mid-append leaves a partial record: it is not read, and
+        # the next append cuts it off first.
+        with open(bin_path, "ab") as file:
+            file.write(b"\x01\x02\x03")
+        log = BinaryPomodoroLog(bin_path)
+        assert len(log) == 500 and len(list(log.iter_records())) == 500
+        log.append(start, "other", 9)
+        assert len(log) == 501 and os.path.getsize(bin_path) == HEADER_SIZE + 501 * RECORD.size
+        assert list(log.iter_rows())[-1] == {"date": start.isoformat(), "category": "other", "pomodoros": 9}
+        log.close()
+    print("✓ CSV round trip is lossless; a torn last record is ignored and cut off")
+
+
+def _stress(*args):
+    """Run stress_test quietly; returns its JSON report."""
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        failed = stress_test.main(list(args))
+    report = json.loads(out.getvalue())
+    assert not failed and not report["errors"], (args, report["errors"])
+    return report
+
+
+def test_concurrent_writers():
+    print("\nTesting concurrent writers...")
+    for backend in ("csv", "binary", "sqlite"):
+        _stress("--processes", "3", "--threads", "2", "--logs", "15", "--backend", backend)
+    # Threads of one process queued behind a slow fsync share the next one.
+    report = _stress("--processes", "1", "--threads", "8", "--logs", "10", "--fsync-delay", "10")
+    assert report["fsync_batches"] < report["writes"], report
+    print(f"✓ No lost or torn updates from 3 processes x 2 threads on every backend; "
+          f"{report['writes']} writes shared {report['fsync_batches']} fsyncs")
+
+
+def test_unparseable_dates():
+    print("\nTesting tasks with unparseable dates...")
+    with tempfile.TemporaryDirectory() as data_root:
+        with open(os.path.join(data_root, "tasks.csv"), "w", newline="") as file:
+            file.write(
+                "task_name,category,estimated_pomodoros,completed_pomodoros,status,start_date,due_date,end_date,dependencies\n"
+                "Odd,other,3,0,not started,15/10/2026,2026-13-40,,\n"
+                "Fine,study,2,0,not started,2026-01-05,2099-01-01,,\n"
+            )
+        manager = TaskManager(data_root=data_root)
+        odd = manager.get_task_by_name("Odd")
+        assert odd.due_ordinal is None and odd.start_ordinal is None
+        assert manager.log_pomodoro("Fine")[0]
+        manager.save_tasks()
+        manager.close()
+
+        reloaded = TaskManager(data_root=data_root).get_task_by_name("Odd").to_dict()
+        assert (reloaded["start_date"], reloaded["due_date"]) == ("15/10/2026", "2026-13-40"), reloaded
+    print("✓ Unparseable dates survive a checkpoint unchanged")
+
+
+def test_sqlite_migration():
+    print("\nTesting CSV to SQLite migration...")
+    with tempfile.TemporaryDirectory() as data_root:
+        with open(os.path.join(data_root, "count_pomodoro.csv"), "w", newline="") as file:
+            today = date.today()
+            file.write(f"date,category,pomodoros\n{today}T10:00,study,2\n{today},study,3\nbad,exam,1\n{today},exam,x\n")
+        csv_storage = TaskManager.make_storage("csv", data_root=data_root)
+        sqlite_storage = TaskManager.make_storage("sqlite", migrate=False, data_root=data_root)
+        assert migrate_csv_to_sqlite(csv_storage, sqlite_storage) == (0, 1, 3)
+        sqlite_storage.close()
+        csv_storage.close()
+
+        manager = TaskManager(backend="sqlite", data_root=data_root)
+        summary = manager.weekly_summary()
+        assert summary["per_day"][today.isoformat()] == 3 and summary["total"] == 3
+        manager.close()
+    print("✓ Log rows without an ISO date or whole-number count are skipped")
+
+
+def test_calendar():
+    print("\nTesting availability bitmaps...")
+    calendar = AvailabilityCalendar(15, {0: [(9, 10), (11, 12.5)]})
+    monday, tuesday = "2024-01-01", "2024-01-02"
+    assert calendar.day(monday) == calendar.mask([(11, 12.5), (9, 10)]) == 0b11111100001111 << 36
+    assert calendar.mask([(9.1, 9.9)]) == calendar.mask([(9.25, 9.75)]), "ranges round inwards"
+    assert calendar.day(tuesday) == 0 and calendar.slots(tuesday) == ()
+    assert calendar.slots(monday) == ((9, 9.5), (9.5, 10), (11, 11.5), (11.5, 12), (12, 12.5))
+
+    copy = calendar.copy()
+    copy.subtract(monday, 9.1, 9.4)  # touches 09:00-09:30
+    assert copy.slots(monday) == ((9.5, 10), (11, 11.5), (11.5, 12), (12, 12.5))
+    assert calendar.slots(monday)[0] == (9, 9.5), "copies are independent"
+    copy.subtract(monday, 11.25, 11.5)
+    assert copy.slots(monday) == ((9.5, 10), (11.5, 12), (12, 12.5))
+    assert copy.allocate(monday, 40) == (11.5, 12.25), "first fit, rounded up to whole units"
+    assert copy.allocate(monday, 60) is None
+    assert copy.slots(monday) == ((9.5, 10),)
+    assert copy.slots("2024-01-08") == calendar.slots(monday), "other Mondays keep the template"
+    copy.add(monday, 9, 9.5)
+    assert copy.slots(monday) == ((9, 9.5), (9.5, 10))
+
+    # Union and difference, day by day and for the weekly templates.
+    meetings = AvailabilityCalendar(15, {0: [(11.5, 12)]})
+    meetings.set_day(tuesday, [(14, 15)])
+    assert (calendar | meetings).day(monday) == calendar.day(monday)
+    assert (calendar | meetings).slots(tuesday) == ((14, 14.5), (14.5, 15))
+    assert (calendar - meetings).slots("2024-01-08") == ((9, 9.5), (9.5, 10), (11, 11.5), (12, 12.5))
+    assert (calendar - meetings).day(tuesday) == 0
+    try:
+        calendar | AvailabilityCalendar(5)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("calendars with different granularities combined")
+
+    # Best fit takes the smallest stretch that fits, first fit the earliest.
+    stretches = AvailabilityCalendar.from_days({monday: [(9, 12), (14, 15), (16, 17)]}, 15)
+    assert stretches.copy().allocate(monday, 30) == (9, 9.5)
+    assert stretches.allocate(monday, 30, best_fit=True) == (14, 14.5)
+    assert stretches.allocate(monday, 60, best_fit=True) == (16, 17), "earliest stretch it fits in"
+    assert stretches.allocate(monday, 45, best_fit=True) == (9, 9.75)
+    assert stretches.allocate(monday, 180, best_fit=True) is None
+    assert stretches.slots(monday) == ((9.75, 10.25), (10.25, 10.75), (10.75, 11.25), (11.25, 11.75), (14.5, 15))
+
+    for granularity in (0, 7):
+        try:
+            AvailabilityCalendar(granularity)
+        except ValueError:
+            continue
+        raise AssertionError(f"granularity {granularity} accepted")
+    try:
+        calendar.slots(monday, 20)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("slot length that is not a multiple of the granularity accepted")
+    print("✓ Masks, slots, union, subtract, first- and best-fit allocate and overrides behave")
+
+
 if __name__ == "__main__":
     test_backend()
+    test_journal_replay()
+    test_rollup_refresh()
+    test_dependency_graph()
+    test_bulk_import()
+    test_log_reader()
+    test_binary_log()
+    test_concurrent_writers()
+    test_unparseable_dates()
+    test_sqlite_migration()
+    test_calendar()
+    test_incremental_reschedule()
 
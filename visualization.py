@@ -1,104 +1,21 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
-from datetime import date, timedelta
+from matplotlib.collections import PolyCollection
 
-def get_daily_availability():
-    WORK_START, WORK_END = 9, 22
-    raw = input("Unavailable (e.g. 9-12, 15-20): ").strip()
+DASHBOARD_PAGES = 3
+TIMETABLE_HOURS = (9, 22)
 
-    unavailable = []
-    if raw:
-        for part in [p.strip() for p in raw.split(",") if p.strip()]:
-            if "-" not in part:
-                print(f" Invalid format '{part}' (use 9-12)")
-                continue
+CATEGORY_COLORS = {
+    "study": "#4C72B0",
+    "exam": "#DD8452",
+    "assignment": "#55A868",
+    "reading": "#C44E52",
+    "other": "#8172B3"
+}
 
-            try:
-                a, b = part.split("-", 1)
-                start = int(a.strip())
-                end = int(b.strip())
-
-                start = max(WORK_START, start)
-                end = min(WORK_END, end)
-
-                if start < end:
-                    unavailable.append((start, end))
-            except ValueError:
-                print(f" Invalid numbers in '{part}'")
-
-
-    unavailable.sort()
-
-    available = []
-    current = WORK_START
-    for s, e in unavailable:
-        if current < s:
-            available.append((current, s))
-        current = max(current, e)
-
-    if current < WORK_END:
-        available.append((current, WORK_END))
-
-    return available
-
-from datetime import date, timedelta
-
-def get_weekly_availability():
-    WORK_START, WORK_END = 9, 22
-    today = date.today()
-
-    print("\n📅 Weekly Availability (09:00–22:00 fixed)")
-    print("Enter unavailable hours like: 13-15, 18-19 (Enter = free all day)\n")
-
-    weekly = {}
-
-    for i in range(7):
-        day_date = today + timedelta(days=i)
-        day_key = day_date.isoformat()
-        day_name = day_date.strftime("%A")
-
-        raw = input(f"{day_name} ({day_key}) unavailable: ").strip()
-
-        unavailable = []
-        if raw:
-            for part in [x.strip() for x in raw.split(",") if x.strip()]:
-                if "-" not in part:
-                    print(f"Skipped invalid slot '{part}' (use 13-15)")
-                    continue
-                try:
-                    a, b = part.split("-", 1)
-                    start, end = int(a.strip()), int(b.strip())
-                    start = max(WORK_START, start)
-                    end = min(WORK_END, end)
-                    if start < end:
-                        unavailable.append((start, end))
-                except ValueError:
-                    print(f"Skipped invalid slot '{part}'")
-
-        unavailable.sort()
-
-        available = []
-        current = WORK_START
-        for start, end in unavailable:
-            if current < start:
-                available.append((current, start))
-            current = max(current, end)
-
-        if current < WORK_END:
-            available.append((current, WORK_END))
-
-        weekly[day_key] = available
-
-    return weekly
-
-
-def weekly_charts_paged(summary):
-    """
-    Shows 4 charts + 1 pie across 3 pages.
-    Uses TaskManager.weekly_summary() output (passed from main.py).
-    """
 
+def dashboard_data(summary):
+    """Series the dashboard pages plot, from TaskManager.weekly_summary() output."""
     per_day = summary.get("per_day", {})
     by_cat = summary.get("by_category", {})
 
@@ -122,68 +39,88 @@ def weekly_charts_paged(summary):
     else:
         trend = values
 
-    plt.ion()
-    fig, axes = plt.subplots(1, 2, figsize=(12, 5), constrained_layout=True)
+    return {
+        "days": days,
+        "values": values,
+        "cumulative": cumulative,
+        "avg": avg,
+        "trend": trend,
+        "by_category": by_cat_ordered,
+    }
 
-    pages = 3
-    page = 0
 
-    def render_page(p):
-        for ax in axes:
-            ax.clear()
+def draw_dashboard_page(fig, axes, data, p, title_hint=""):
+    """Draw dashboard page p (0-2) onto a figure with two axes."""
+    days, values = data["days"], data["values"]
+    by_cat_ordered = data["by_category"]
 
-        if p == 0:
+    for ax in axes:
+        ax.clear()
 
-            axes[0].bar(days, values)
-            axes[0].set_title("Pomodoros Per Day")
-            axes[0].set_ylabel("Pomodoros")
-            axes[0].tick_params(axis="x", rotation=45)
+    if p == 0:
 
+        axes[0].bar(days, values)
+        axes[0].set_title("Pomodoros Per Day")
+        axes[0].set_ylabel("Pomodoros")
+        axes[0].tick_params(axis="x", rotation=45)
 
-            axes[1].plot(days, cumulative)
-            axes[1].set_title("Cumulative Productivity")
-            axes[1].set_ylabel("Total Pomodoros")
-            axes[1].tick_params(axis="x", rotation=45)
 
-            fig.suptitle("Weekly Dashboard — Page 1/3 (N=Next, P=Prev, Q=Quit)")
+        axes[1].plot(days, data["cumulative"])
+        axes[1].set_title("Cumulative Productivity")
+        axes[1].set_ylabel("Total Pomodoros")
+        axes[1].tick_params(axis="x", rotation=45)
 
-        elif p == 1:
-  
-            axes[0].bar(list(by_cat_ordered.keys()), list(by_cat_ordered.values()))
-            axes[0].set_title("Pomodoros by Category (Bar)")
-            axes[0].set_ylabel("Pomodoros")
-            axes[0].tick_params(axis="x", rotation=20)
+    elif p == 1:
 
+        axes[0].bar(list(by_cat_ordered.keys()), list(by_cat_ordered.values()))
+        axes[0].set_title("Pomodoros by Category (Bar)")
+        axes[0].set_ylabel("Pomodoros")
+        axes[0].tick_params(axis="x", rotation=20)
 
-            axes[1].plot(days, values)
-            axes[1].axhline(avg)
-            axes[1].set_title("Daily Productivity vs Average")
-            axes[1].set_ylabel("Pomodoros")
-            axes[1].tick_params(axis="x", rotation=45)
 
-            fig.suptitle("Weekly Dashboard — Page 2/3 (N=Next, P=Prev, Q=Quit)")
+        axes[1].plot(days, values)
+        axes[1].axhline(data["avg"])
+        axes[1].set_title("Daily Productivity vs Average")
+        axes[1].set_ylabel("Pomodoros")
+        axes[1].tick_params(axis="x", rotation=45)
+
+    else:
 
+        axes[0].plot(days, values)
+        axes[0].plot(days, data["trend"])
+        axes[0].set_title("Weekly Trend (Simple Fit)")
+        axes[0].set_ylabel("Pomodoros")
+        axes[0].tick_params(axis="x", rotation=45)
+
+        if sum(by_cat_ordered.values()) > 0:
+            axes[1].pie(
+                list(by_cat_ordered.values()),
+                labels=list(by_cat_ordered.keys()),
+                autopct="%1.1f%%"
+            )
+            axes[1].set_title("Category Share (Pie)")
         else:
- 
-            axes[0].plot(days, values)
-            axes[0].plot(days, trend)
-            axes[0].set_title("Weekly Trend (Simple Fit)")
-            axes[0].set_ylabel("Pomodoros")
-            axes[0].tick_params(axis="x", rotation=45)
-
-            if sum(by_cat_ordered.values()) > 0:
-                axes[1].pie(
-                    list(by_cat_ordered.values()),
-                    labels=list(by_cat_ordered.keys()),
-                    autopct="%1.1f%%"
-                )
-                axes[1].set_title("Category Share (Pie)")
-            else:
-                axes[1].text(0.5, 0.5, "No category data", ha="center", va="center")
-                axes[1].set_title("Category Share (Pie)")
+            axes[1].text(0.5, 0.5, "No category data", ha="center", va="center")
+            axes[1].set_title("Category Share (Pie)")
+
+    fig.suptitle(f"Weekly Dashboard — Page {p + 1}/{DASHBOARD_PAGES}{title_hint}")
+
+
+def weekly_charts_paged(summary):
+    """
+    Shows 4 charts + 1 pie across 3 pages.
+    Uses TaskManager.weekly_summary() output (passed from main.py).
+    """
+    data = dashboard_data(summary)
 
-            fig.suptitle("Weekly Dashboard — Page 3/3 (N=Next, P=Prev, Q=Quit)")
+    plt.ion()
+    fig, axes = plt.subplots(1, 2, figsize=(12, 5), constrained_layout=True)
+
+    pages = DASHBOARD_PAGES
+    page = 0
 
+    def render_page(p):
+        draw_dashboard_page(fig, axes, data, p, " (N=Next, P=Prev, Q=Quit)")
         fig.canvas.draw()
         fig.canvas.flush_events()
 
@@ -205,129 +142,139 @@ def weekly_charts_paged(summary):
     plt.ioff()
     plt.close(fig)
 
-def plot_schedule(schedule):
-
-    if not schedule:
-        print("No schedule to plot.")
-        return
-
-    CATEGORY_COLORS = {
-        "study": "#4C72B0",
-        "exam": "#DD8452",
-        "assignment": "#55A868",
-        "reading": "#C44E52",
-        "other": "#8172B3"
-    }
-
-    fig, ax = plt.subplots(figsize=(14, 4))
-
-    for entry in schedule:
-        start = entry["start"]
-        duration = entry["end"] - entry["start"]
-        category = entry.get("category", "other")
-        color = CATEGORY_COLORS.get(category, "#999999")
-
-        ax.barh(
-            0,   
-            duration,
-            left=start,
-            height=0.6,
-            color=color,
-            edgecolor="black"
-        )
-
-        if duration > 0.5:
-            ax.text(
-                start + duration / 2,
-                0,
-                entry["task"],
-                ha="center",
-                va="center",
-                color="white",
-                fontsize=9
-            )
 
-    ax.set_xlim(9, 22)
-    ax.set_yticks([]) 
+def _style_timetable(ax, title):
+    first, last = TIMETABLE_HOURS
+    ax.set_xlim(first, last)
     ax.set_xlabel("Time")
-    ax.set_title("Daily Timetable")
+    ax.set_title(title)
 
-    ax.set_xticks(range(9, 23))
+    ax.set_xticks(range(first, last + 1))
     ax.grid(axis="x", linestyle="--", alpha=0.4)
 
-
     legend_patches = [
         mpatches.Patch(color=color, label=cat.capitalize())
         for cat, color in CATEGORY_COLORS.items()
     ]
     ax.legend(handles=legend_patches, loc="upper right")
 
-    plt.tight_layout()
-    plt.show()
 
-def plot_weekly_schedule(weekly_schedule):
+def merge_blocks(entries):
+    """
+    Merge back-to-back slot entries of the same task into
+    (task, category, start, end) blocks, in input order.
+    """
+    blocks = []
+    for entry in entries:
+        task, start, end = entry["task"], entry["start"], entry["end"]
+        if blocks and blocks[-1][0] == task and blocks[-1][3] == start:
+            blocks[-1][3] = end
+        else:
+            blocks.append([task, entry.get("category", "other"), start, end])
+    return [tuple(block) for block in blocks]
 
-    if not weekly_schedule:
-        print("No weekly schedule to plot.")
-        return
 
-    CATEGORY_COLORS = {
-        "study": "#4C72B0",
-        "exam": "#DD8452",
-        "assignment": "#55A868",
-        "reading": "#C44E52",
-        "other": "#8172B3"
-    }
+def _label_fitter(ax, row_count, fontsize):
+    """
+    fit(task, hours) -> the label that fits a block that many hours wide
+    (truncated with "…"), or None. Labels are skipped altogether once rows
+    get thinner than the font, so long horizons are not slowed down by
+    thousands of unreadable texts.
+    """
+    position = ax.get_position()
+    width_pt = position.width * ax.figure.get_figwidth() * 72
+    height_pt = position.height * ax.figure.get_figheight() * 72
+    if height_pt / max(1, row_count) * 0.6 < fontsize:
+        return lambda task, hours: None
 
-    fig, ax = plt.subplots(figsize=(14, 7))
+    first, last = TIMETABLE_HOURS
+    chars_per_hour = width_pt / (last - first) / (0.6 * fontsize)
 
-    days = sorted(weekly_schedule.keys())
-    y_positions = range(len(days))
-
-    for i, day in enumerate(days):
-        for entry in weekly_schedule[day]:
-            start = entry["start"]
-            duration = entry["end"] - entry["start"]
-            category = entry.get("category", "other")
-
-            color = CATEGORY_COLORS.get(category, "#999999")
-
-            ax.barh(
-                i,
-                duration,
-                left=start,
-                height=0.6,
-                color=color,
-                edgecolor="black"
-            )
+    def fit(task, hours):
+        room = int(hours * chars_per_hour)
+        if room >= len(task):
+            return task
+        return task[:room - 1] + "…" if room >= 4 else None
+
+    return fit
 
 
-            if duration > 0.5:
+def _draw_rows(ax, rows, fontsize):
+    """
+    rows is [(y, entries)]. Slots are merged into blocks and every block
+    of a category goes into a single PolyCollection, so drawing cost
+    follows the number of categories rather than the number of slots.
+    """
+    fit = _label_fitter(ax, len(rows), fontsize)
+    rects_by_category = {}
+    for y, entries in rows:
+        y0, y1 = y - 0.3, y + 0.3
+        for task, category, start, end in merge_blocks(entries):
+            rects_by_category.setdefault(category, []).append(
+                [(start, y0), (start, y1), (end, y1), (end, y0)]
+            )
+
+            duration = end - start
+            label = fit(task, duration)
+            if label:
                 ax.text(
                     start + duration / 2,
-                    i,
-                    entry["task"],
+                    y,
+                    label,
                     ha="center",
                     va="center",
                     color="white",
-                    fontsize=8
+                    fontsize=fontsize
                 )
 
-    ax.set_yticks(y_positions)
+    for category, rects in rects_by_category.items():
+        ax.add_collection(PolyCollection(
+            rects,
+            facecolors=CATEGORY_COLORS.get(category, "#999999"),
+            edgecolors="black"
+        ))
+
+    if rows:
+        ax.set_ylim(min(y for y, _ in rows) - 0.5, max(y for y, _ in rows) + 0.5)
+
+
+def draw_schedule(ax, schedule):
+    _draw_rows(ax, [(0, schedule)], 9)
+    ax.set_yticks([])
+    _style_timetable(ax, "Daily Timetable")
+
+
+def draw_weekly_schedule(ax, weekly_schedule):
+    days = sorted(weekly_schedule.keys())
+
+    _draw_rows(ax, [(i, weekly_schedule[day]) for i, day in enumerate(days)], 8)
+
+    ax.set_yticks(range(len(days)))
     ax.set_yticklabels(days)
-    ax.set_xlim(9, 22)
+    _style_timetable(ax, "Weekly Timetable (Optimized Schedule)")
 
-    ax.set_xlabel("Time")
-    ax.set_title("Weekly Timetable (Optimized Schedule)")
 
-    ax.set_xticks(range(9, 23))
-    ax.grid(axis="x", linestyle="--", alpha=0.4)
+def plot_schedule(schedule):
 
-    legend_patches = [
-        mpatches.Patch(color=color, label=cat.capitalize())
-        for cat, color in CATEGORY_COLORS.items()
-    ]
-    ax.legend(handles=legend_patches, loc="upper right")
+    if not schedule:
+        print("No schedule to plot.")
+        return
+
+    fig, ax = plt.subplots(figsize=(14, 4))
+    draw_schedule(ax, schedule)
+
+    plt.tight_layout()
+    plt.show()
+
+
+def plot_weekly_schedule(weekly_schedule):
+
+    if not weekly_schedule:
+        print("No weekly schedule to plot.")
+        return
+
+    fig, ax = plt.subplots(figsize=(14, 7))
+    draw_weekly_schedule(ax, weekly_schedule)
 
     plt.tight_layout()
-    plt.show()
\ No newline at end of file
+    plt.show()